@@ -0,0 +1,81 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure sorting, filtering, formatting and updating a large table.
+
+A ColumnTableModel with one million rows is sorted on one and on two
+keys, filtered, formatted a window at a time and updated. The window
+formatting is compared with the per-cell `data` calls of a TableModel
+over the same values in a two dimensional array.
+
+Usage: python bench_column_table_model.py [num_rows]
+
+"""
+import sys
+
+import numpy as np
+
+from enaml.stdlib.old.column_table_model import ColumnTableModel
+from enaml.stdlib.old.table_model import TableModel
+
+from bench_support import timer
+
+
+NUM_COLUMNS = 8
+
+WINDOW_ROWS = 60
+
+WINDOWS = 100
+
+
+def format_windows(model, rows):
+    starts = np.random.randint(0, rows - WINDOW_ROWS, WINDOWS)
+    for start in starts:
+        model.block_data(start, start + WINDOW_ROWS - 1, 0, NUM_COLUMNS - 1)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print 'rows: %d, columns: %d' % (rows, NUM_COLUMNS)
+
+    np.random.seed(0)
+    columns = []
+    for i in xrange(NUM_COLUMNS):
+        if i % 2:
+            columns.append(np.random.randint(0, 1000, rows))
+        else:
+            columns.append(np.random.random(rows))
+    model = ColumnTableModel(columns)
+    table = TableModel(np.column_stack(columns))
+
+    with timer('TableModel window (%d cells)' % (WINDOW_ROWS * NUM_COLUMNS),
+               WINDOWS):
+        format_windows(table, rows)
+    with timer('ColumnTableModel window', WINDOWS):
+        format_windows(model, rows)
+    with timer('sort one key'):
+        model.sort(0)
+    with timer('sort two keys'):
+        model.sort([1, 0], [True, False])
+    with timer('filter'):
+        model.filter(lambda c: c[2] > 0.5)
+    print 'filtered rows: %d' % model.row_count()
+    with timer('sorted window', WINDOWS):
+        format_windows(model, model.row_count())
+
+    changes = []
+    model.data_changed.connect(changes.append)
+    updated = np.random.randint(0, rows, 1000)
+    with timer('update 1000 rows'):
+        model.set_values(0, updated, 0.0)
+    print 'change notifications: %d' % len(changes)
+    del changes[:]
+    with timer('update contiguous 1000 rows'):
+        model.sort(None)
+        model.set_values(0, slice(1000, 2000), 1.0)
+    print 'change notifications: %d' % len(changes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Compare the nested `as_dict` constraint encoding with the flat one.
+
+The constraints of an abutted grid of boxes are serialized with both
+encodings, and the payload size and client side conversion time into
+casuarius constraints are reported. The nested conversion function is
+a copy of the converter which was used by the client before the flat
+encoding was introduced.
+
+Usage: python bench_constraint_conversion.py [rows] [cols]
+
+"""
+import cPickle
+import sys
+
+from enaml.layout.box_model import BoxModel
+from enaml.layout.constraint_variable import flatten_constraints
+from enaml.qt.qt_constraints_widget import LayoutBox
+from enaml.qt.qt_container import (
+    as_constraint_variables, as_linear_constraint,
+)
+
+from bench_support import timer
+
+
+def _convert_nested(info, owners):
+    """ The recursive converter for the nested `as_dict` encoding.
+
+    """
+    cn_type = info['type']
+    if cn_type == 'linear_expression':
+        terms = info['terms']
+        res = sum(_convert_nested(t, owners) for t in terms)
+        res = res + info['constant']
+    elif cn_type == 'term':
+        res = info['coeff'] * _convert_nested(info['var'], owners)
+    else:
+        owner_id = info['owner']
+        owner = owners.get(owner_id)
+        if owner is None:
+            owner = owners[owner_id] = LayoutBox('_virtual', owner_id)
+        res = owner.primitive(info['name'])
+    return res
+
+
+def convert_nested(dicts):
+    owners = {}
+    res = []
+    for info in dicts:
+        lhs = _convert_nested(info['lhs'], owners)
+        rhs = _convert_nested(info['rhs'], owners)
+        op = info['op']
+        if op == '==':
+            cn = lhs == rhs
+        elif op == '<=':
+            cn = lhs <= rhs
+        else:
+            cn = lhs >= rhs
+        res.append(cn | info['strength'] | info['weight'])
+    return res
+
+
+def convert_flat(info):
+    cn_vars = as_constraint_variables(info['variables'], {})
+    return [as_linear_constraint(item, cn_vars) for item in info['constraints']]
+
+
+def grid_constraints(rows, cols):
+    """ Create abutment and alignment constraints for a grid of boxes.
+
+    """
+    boxes = [[BoxModel('%d_%d' % (r, c)) for c in xrange(cols)]
+             for r in xrange(rows)]
+    cns = []
+    for r in xrange(rows):
+        for c in xrange(cols):
+            box = boxes[r][c]
+            if c > 0:
+                prev = boxes[r][c - 1]
+                cns.append(prev.right + 10 == box.left)
+            if r > 0:
+                above = boxes[r - 1][c]
+                cns.append(above.bottom + 10 == box.top)
+                cns.append((above.h_center == box.h_center) | 'strong')
+    return cns
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    cns = grid_constraints(rows, cols)
+    print 'constraints: %d' % len(cns)
+
+    with timer('serialize nested'):
+        nested = [cn.as_dict() for cn in cns]
+    with timer('serialize flat'):
+        flat = flatten_constraints(cns)
+
+    proto = cPickle.HIGHEST_PROTOCOL
+    print 'nested payload: %d bytes' % len(cPickle.dumps(nested, proto))
+    print 'flat payload:   %d bytes' % len(cPickle.dumps(flat, proto))
+
+    with timer('convert nested'):
+        convert_nested(nested)
+    with timer('convert flat'):
+        convert_flat(flat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure the cost of expanding the constraints of large layouts.
+
+The symbolic constraints of a large `vbox` and a large `grid` are
+expanded with `expand_constraints`, and then serialized with both
+`as_dict` and `flatten_constraints`. The cost of building a long sum
+with `+` and with a LinearSum is also reported.
+
+Usage: python bench_expand_constraints.py [count] [repeat]
+
+"""
+import sys
+
+from enaml.layout.ab_constrainable import ABConstrainable
+from enaml.layout.box_model import ContentsBoxModel
+from enaml.layout.constraint_variable import LinearSum, flatten_constraints
+from enaml.layout.layout_helpers import expand_constraints, vbox, grid
+
+from bench_support import timer
+
+
+class Box(ContentsBoxModel):
+    """ A constrainable box for the benchmark layouts.
+
+    """
+    __slots__ = ()
+
+
+ABConstrainable.register(Box)
+
+
+def bench_layout(label, component, helper, repeat):
+    with timer('%s expand' % label, repeat):
+        for i in xrange(repeat):
+            cns = list(expand_constraints(component, [helper]))
+    print '%s constraints: %d' % (label, len(cns))
+    with timer('%s as_dict' % label, repeat):
+        for i in xrange(repeat):
+            [cn.as_dict() for cn in cns]
+    with timer('%s flatten' % label, repeat):
+        for i in xrange(repeat):
+            flatten_constraints(cns)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    component = Box('component')
+    boxes = [Box('box_%d' % i) for i in xrange(count)]
+    print 'items: %d' % count
+
+    bench_layout('vbox', component, vbox(*boxes), repeat)
+
+    cols = 10
+    rows = [boxes[i:i + cols] for i in xrange(0, count, cols)]
+    bench_layout('grid', component, grid(*rows), repeat)
+
+    widths = [box.width for box in boxes]
+    with timer('sum with +'):
+        expr = widths[0]
+        for width in widths[1:]:
+            expr = expr + width
+    with timer('sum with LinearSum'):
+        builder = LinearSum()
+        for width in widths:
+            builder += width
+        builder.expression()
+
+
+if __name__ == '__main__':
+    main()
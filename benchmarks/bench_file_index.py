@@ -0,0 +1,98 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure building, updating and querying a FileIndex.
+
+A synthetic tree of one million empty files, spread over two levels of
+directories, is created in a temporary directory. The index is built
+from scratch, updated with no changes and with one changed directory,
+reopened from its file, and queried for prefixes and substrings.
+
+Usage: python bench_file_index.py [num_files]
+
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+from enaml.stdlib.old.file_index import FileIndex
+
+from bench_support import timer
+
+
+FAN_OUT = 32
+
+QUERIES = 200
+
+
+def make_tree(root, num_files):
+    random.seed(0)
+    syllables = ['ab', 'cor', 'de', 'fil', 'gen', 'ix', 'mo', 'nor', 'py',
+                 'qu', 're', 'st', 'tab', 'ul', 'ven', 'wo']
+    extensions = ['.txt', '.py', '.png', '.enaml', '.dat']
+    dirs = []
+    for i in xrange(FAN_OUT):
+        for j in xrange(FAN_OUT):
+            path = os.path.join(root, 'dir%02d' % i, 'sub%02d' % j)
+            os.makedirs(path)
+            dirs.append(path)
+    words = set()
+    for index in xrange(num_files):
+        name = ''.join(random.sample(syllables, 3)) + str(index)
+        name += random.choice(extensions)
+        words.add(name[:4])
+        path = dirs[index % len(dirs)]
+        open(os.path.join(path, name), 'w').close()
+    return dirs, sorted(words)
+
+
+def main():
+    num_files = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print 'files: %d' % num_files
+    root = tempfile.mkdtemp()
+    filename = root + '.idx'
+    try:
+        tree = os.path.join(root, 'tree')
+        with timer('create tree'):
+            dirs, words = make_tree(tree, num_files)
+
+        index = FileIndex(filename, [tree])
+        with timer('build'):
+            index.update()
+        print 'index size: %.1f MB' % (os.path.getsize(filename) / 1e6)
+        with timer('update, no change'):
+            index.update()
+        print 'directories listed: %d' % index.num_listed
+        open(os.path.join(dirs[0], 'new.txt'), 'w').close()
+        with timer('update, one directory changed'):
+            index.update()
+        print 'directories listed: %d' % index.num_listed
+        index.close()
+        with timer('reopen'):
+            index = FileIndex(filename, [tree])
+
+        queries = [random.choice(words) for i in xrange(QUERIES)]
+        with timer('prefix, 100 results', QUERIES):
+            for query in queries:
+                index.search(query)
+        with timer('prefix below a directory', QUERIES):
+            for query in queries:
+                index.search(query[:2], under=dirs[0])
+        with timer('substring, 100 results', QUERIES):
+            for query in queries:
+                index.search(query[1:], substring=True)
+        with timer('substring, no match', QUERIES):
+            for query in queries:
+                index.search(query + 'zz', substring=True)
+        index.close()
+    finally:
+        shutil.rmtree(root)
+        if os.path.exists(filename):
+            os.remove(filename)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure the cost of showing and scrolling a large flow area.
+
+A flow area is populated with a gallery of flow items, each holding a
+small container. The first layout and a scroll loop through the whole
+area are timed with and without virtualization.
+
+Usage: python bench_flow_area.py [num_items] [frames]
+
+"""
+import sys
+
+from bench_support import create_view, find_client, timer
+
+
+SOURCE = """
+from enaml.widgets.api import (
+    Window, Container, FlowArea, FlowItem, Label, Include
+)
+
+enamldef Thumb(FlowItem):
+    attr index = 0
+    preferred_size = (96, 96)
+    Container:
+        Label:
+            text = 'Item %d' % index
+
+enamldef MainView(Window):
+    attr items = 1000
+    attr virtual = False
+    initial_size = (800, 600)
+    FlowArea:
+        virtualized = virtual
+        Include:
+            objects = [Thumb(index=i) for i in range(items)]
+"""
+
+
+def run(items, frames, virtual):
+    with timer('create view'):
+        app, view, client_view = create_view(
+            SOURCE, items=items, virtual=virtual
+        )
+    window = client_view.widget()
+    with timer('first layout'):
+        window.show()
+        app.process_events()
+    area = find_client(client_view, 'QtFlowArea').widget()
+    bar = area.verticalScrollBar()
+    maximum = bar.maximum()
+    with timer('scroll', frames):
+        for i in xrange(frames):
+            bar.setValue(maximum * i / max(frames - 1, 1))
+            app.process_events()
+    view.close()
+    app.process_events()
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    print 'items: %d, frames: %d' % (items, frames)
+
+    print 'all items:'
+    run(items, frames, False)
+
+    print 'virtualized:'
+    run(items, frames, True)
+
+
+if __name__ == '__main__':
+    main()
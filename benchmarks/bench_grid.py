@@ -0,0 +1,43 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Compare the grid constraint generator with the legacy generator.
+
+The constraints of a large data entry grid are generated with both the
+GridHelper and the legacy helper from the test suite, which builds a
+pair of abutment helpers for every cell. The generation time, the
+number of constraints and the time to solve the layout are reported.
+
+Usage: python bench_grid.py [rows] [cols]
+
+"""
+import sys
+
+from enaml.layout.layout_helpers import GridHelper
+from enaml.tests.test_grid_helper import Cell, LegacyGridHelper, solve
+
+from bench_support import timer
+
+
+def main():
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    num_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rows = [
+        [Cell('cell_%d_%d' % (row, col)) for col in xrange(num_cols)]
+        for row in xrange(num_rows)
+    ]
+    cells = [cell for row in rows for cell in row]
+    print 'rows: %d, cols: %d' % (num_rows, num_cols)
+
+    for label, cls in (('legacy', LegacyGridHelper), ('grid', GridHelper)):
+        helper = cls(*rows, row_align='v_center')
+        with timer('%s generate' % label):
+            cns = helper.get_constraints(None)
+        print '%s constraints: %d' % (label, len(cns))
+        with timer('%s solve' % label):
+            solve(helper, cells, 100 * num_cols, 30 * num_rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure the event loop stalls caused by loading large images.
+
+A client resource manager is sent the replies for 100 large JPEG images,
+one reply every few milliseconds as if they were read off a socket,
+with the images decoded on the main thread and then on the decoder
+thread pool. A heartbeat timer records the gaps between its ticks: the
+longest gap and the number of gaps longer than a 60Hz frame measure
+the jank of the main thread.
+
+Usage: python bench_image_decode.py [num_images] [width] [height]
+
+"""
+import sys
+import time
+
+from enaml.qt.qt.QtCore import QBuffer, QByteArray, QIODevice, QTimer
+from enaml.qt.qt.QtGui import (
+    QApplication, QColor, QImage, QLinearGradient, QPainter,
+)
+from enaml.qt.qt_resource_manager import (
+    QtResourceDecoder, QtResourceManager, QtResourceStore,
+)
+
+
+#: The interval of the heartbeat timer, in milliseconds.
+HEARTBEAT = 5
+
+#: The interval between two replies, in milliseconds.
+REPLY_INTERVAL = 10
+
+#: The length of a 60Hz frame, in seconds.
+FRAME = 1.0 / 60
+
+
+def make_jpeg(width, height):
+    image = QImage(width, height, QImage.Format_RGB32)
+    painter = QPainter(image)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0.0, QColor(20, 40, 200))
+    gradient.setColorAt(0.5, QColor(230, 200, 40))
+    gradient.setColorAt(1.0, QColor(200, 30, 60))
+    painter.fillRect(image.rect(), gradient)
+    for index in xrange(0, width, 16):
+        painter.setPen(QColor(index % 256, 128, 255 - index % 256))
+        painter.drawLine(index, 0, width - index, height)
+    painter.end()
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.WriteOnly)
+    image.save(buf, 'JPEG', 90)
+    buf.close()
+    return str(data)
+
+
+def run(app, count, data, threshold):
+    decoder = QtResourceDecoder()
+    manager = QtResourceManager(
+        store=QtResourceStore(), decoder=decoder, decode_threshold=threshold,
+    )
+    requests = []
+    loaded = []
+    for index in xrange(count):
+        url = 'image://bench/%d.jpg' % index
+        request = lambda *args: requests.append(args[:2])
+        manager.load(url, {}, request).on_load(loaded.append)
+    resource = {
+        'class': 'Image', 'bases': ['Resource'], 'format': 'jpg',
+        'size': (-1, -1), 'data': data,
+    }
+    ticks = []
+
+    def heartbeat():
+        ticks.append(time.time())
+        if len(loaded) == count:
+            app.quit()
+
+    def reply():
+        if requests:
+            req_id, url = requests.pop(0)
+            manager.on_load(req_id, url, resource)
+        else:
+            feeder.stop()
+
+    timer = QTimer()
+    timer.timeout.connect(heartbeat)
+    timer.start(HEARTBEAT)
+    feeder = QTimer()
+    feeder.timeout.connect(reply)
+    feeder.start(REPLY_INTERVAL)
+    start = time.time()
+    app.exec_()
+    elapsed = time.time() - start
+    timer.stop()
+    feeder.stop()
+    decoder.close()
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    return elapsed, max(gaps), sum(1 for gap in gaps if gap > FRAME)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 2400
+    height = int(sys.argv[3]) if len(sys.argv) > 3 else 1800
+    app = QApplication.instance() or QApplication([])
+    data = make_jpeg(width, height)
+    print '%d images of %dx%d, %.1f KB each' % (
+        count, width, height, len(data) / 1024.0
+    )
+    for label, threshold in (('main thread', None), ('worker pool', 0)):
+        elapsed, worst, janky = run(app, count, data, threshold)
+        print '%-12s total %7.1f ms, worst stall %6.1f ms, %d janky frames' % (
+            label, elapsed * 1000, worst * 1000, janky
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure the cost of scrolling a table view over a very large model.
+
+A TableView is shown over a computed model with millions of rows. The
+view is scrolled through random positions of the model, and the time
+per scroll step and the number of items transferred from the server
+are reported.
+
+Usage: python bench_item_view.py [num_rows] [frames]
+
+"""
+import random
+import sys
+
+from bench_support import create_view, find_client, timer
+
+
+SOURCE = """
+from enaml.widgets.api import Window, TableView
+from enaml.stdlib.old.item_model import AbstractTableModel
+
+
+class ComputedModel(AbstractTableModel):
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def row_count(self, parent=None):
+        return self.rows
+
+    def column_count(self, parent=None):
+        return 8
+
+    def data(self, index):
+        return index.row * 8 + index.column
+
+
+enamldef MainView(Window):
+    attr rows = 10000000
+    initial_size = (800, 600)
+    TableView:
+        item_model = ComputedModel(rows)
+"""
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print 'rows: %d, frames: %d' % (rows, frames)
+
+    with timer('create view'):
+        app, view, client_view = create_view(SOURCE, rows=rows)
+        window = client_view.widget()
+        window.show()
+        app.process_events()
+
+    table = find_client(client_view, 'QtTableView')
+    transferred = [0]
+    handler = table.on_action_data
+    def on_action_data(content):
+        for block in content['blocks']:
+            transferred[0] += sum(len(values) for values in block['values'])
+        handler(content)
+    table.on_action_data = on_action_data
+
+    bar = table.widget().verticalScrollBar()
+    maximum = bar.maximum()
+    with timer('scroll', frames):
+        for i in xrange(frames):
+            if i % 2:
+                bar.setValue(bar.value() + bar.pageStep())
+            else:
+                bar.setValue(random.randint(0, maximum))
+            app.process_events()
+            app.process_events()
+
+    cached = len(table.widget().model()._values)
+    print 'items transferred: %d (%.1f per step)' % (
+        transferred[0], transferred[0] / float(frames)
+    )
+    print 'items cached: %d' % cached
+
+
+if __name__ == '__main__':
+    main()
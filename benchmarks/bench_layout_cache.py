@@ -0,0 +1,69 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure the startup time of a large form with a layout cache.
+
+The same view is opened three times: without a layout cache, with an
+empty (cold) cache and with the cache populated by the previous run
+(warm). The time to create and show the window is reported separately
+from the time of the deferred verification, which runs the first time
+the event loop processes events.
+
+Usage: python bench_layout_cache.py [num_rows]
+
+"""
+import shutil
+import sys
+import tempfile
+
+from enaml.layout.layout_cache import LayoutCache
+from enaml.qt.qt_container import QtContainer
+
+from bench_support import create_view, timer
+
+
+SOURCE = """
+from enaml.widgets.api import Window, Container, Form, Label, Field, Include
+
+enamldef MainView(Window):
+    attr rows = 200
+    Container:
+        Form:
+            Include:
+                objects = [
+                    comp for i in range(rows)
+                    for comp in (Label(text='Row %d' % i), Field())
+                ]
+"""
+
+
+def startup(label, rows):
+    with timer('%s show' % label):
+        app, view, client_view = create_view(SOURCE, rows=rows)
+        client_view.widget().show()
+    with timer('%s verify' % label):
+        app.process_events()
+    view.close()
+    app.process_events()
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    directory = tempfile.mkdtemp()
+    print 'rows: %d' % rows
+    try:
+        startup('no cache', rows)
+        QtContainer.layout_cache = LayoutCache(directory)
+        startup('cold cache', rows)
+        # A new cache instance reads the entries from disk, as in a
+        # new process.
+        QtContainer.layout_cache = LayoutCache(directory)
+        startup('warm cache', rows)
+    finally:
+        QtContainer.layout_cache = None
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Compare monolithic and partitioned solves of nested shared layouts.
+
+A tree of nested containers which all share their layout is created,
+alternating `vbox`, `hbox` and `grid` constraints between the levels.
+The subtrees are only coupled through their outer boxes, so with
+layout partitioning enabled every nested container is solved by a
+layout manager of its own. The view creation and a resize loop are
+timed with partitioning enabled and disabled.
+
+Usage: python bench_partition.py [depth] [fanout] [frames]
+
+"""
+import sys
+
+from enaml.qt.qt_container import QtContainer
+
+from bench_support import create_view, timer
+
+
+HEADER = """
+from enaml.widgets.api import Window, Container, Field, Label
+from enaml.layout.api import hbox, vbox, grid
+
+enamldef MainView(Window):
+"""
+
+
+def container_source(lines, indent, depth, fanout, counter):
+    """ Append the source of a nested container to the given lines.
+
+    """
+    pad = ' ' * indent
+    ident = 'c%d' % counter[0]
+    counter[0] += 1
+    lines.append(pad + 'Container:')
+    lines.append(pad + '    id: %s' % ident)
+    lines.append(pad + '    share_layout = True')
+    names = []
+    if depth == 0:
+        for i in xrange(fanout):
+            label = '%s_l%d' % (ident, i)
+            field = '%s_f%d' % (ident, i)
+            lines.append(pad + '    Label:')
+            lines.append(pad + '        id: %s' % label)
+            lines.append(pad + "        text = 'Label %d'" % i)
+            lines.append(pad + '    Field:')
+            lines.append(pad + '        id: %s' % field)
+            names.append((label, field))
+        rows = ', '.join('[%s, %s]' % pair for pair in names)
+        lines.append(pad + '    constraints = [grid(%s)]' % rows)
+        return ident
+    for i in xrange(fanout):
+        child = container_source(lines, indent + 4, depth - 1, fanout, counter)
+        names.append(child)
+    helper = 'vbox' if depth % 2 else 'hbox'
+    lines.append(pad + '    constraints = [%s(%s)]' % (helper, ', '.join(names)))
+    return ident
+
+
+def tree_source(depth, fanout):
+    """ Create the Enaml source of a nested container tree.
+
+    """
+    lines = [HEADER]
+    container_source(lines, 4, depth, fanout, [0])
+    return '\n'.join(lines) + '\n'
+
+
+def run(source, frames):
+    with timer('create view'):
+        app, view, client_view = create_view(source)
+    window = client_view.widget()
+    window.show()
+    app.process_events()
+    width = window.width()
+    height = window.height()
+    with timer('resize', frames):
+        for i in xrange(frames):
+            delta = i % 50
+            window.resize(width + delta, height + delta)
+            app.process_events()
+    view.close()
+    app.process_events()
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    fanout = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    frames = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    source = tree_source(depth, fanout)
+    print 'depth: %d, fanout: %d, frames: %d' % (depth, fanout, frames)
+
+    print 'monolithic:'
+    QtContainer.partition_layout = False
+    run(source, frames)
+
+    print 'partitioned:'
+    QtContainer.partition_layout = True
+    run(source, frames)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Compare a full layout rebuild with an incremental relayout.
+
+A relayout is triggered on a single field of a large form by toggling
+its hug policy, which is what the server sends when a widget changes
+its layout information. The full rebuild is forced by clearing the
+cached layout structure of the owner container.
+
+Usage: python bench_relayout.py [num_rows] [iterations]
+
+"""
+import sys
+
+from bench_support import create_view, find_client, timer
+
+
+SOURCE = """
+from enaml.widgets.api import Window, Container, Form, Label, Field, Include
+
+enamldef MainView(Window):
+    attr rows = 1000
+    Container:
+        Form:
+            Include:
+                objects = [
+                    comp for i in range(rows)
+                    for comp in (Label(text='Row %d' % i), Field())
+                ]
+"""
+
+
+def toggle_hug(field, count):
+    """ Send `count` relayout actions to the given client field.
+
+    """
+    for i in xrange(count):
+        hug = 'weak' if i % 2 else 'strong'
+        content = {
+            'hug': (hug, 'strong'),
+            'resist': field._resist,
+            'constraints': field._user_cns,
+        }
+        field.on_action_relayout(content)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    app, view, client_view = create_view(SOURCE, rows=rows)
+    client_view.widget().resize(800, 600)
+    form = find_client(client_view, 'QtForm')
+    field = find_client(form, 'QtField')
+    print 'rows: %d, constraints: %d' % (rows, len(form._cn_table))
+
+    with timer('incremental relayout', count):
+        toggle_hug(field, count)
+
+    original = form._update_layout
+    def full_rebuild():
+        form._layout_items = ()
+        original()
+    form._update_layout = full_rebuild
+    with timer('full rebuild relayout', count):
+        toggle_hug(field, count)
+    del form._update_layout
+
+
+if __name__ == '__main__':
+    main()
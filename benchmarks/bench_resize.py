@@ -0,0 +1,76 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure the cost of an interactive resize loop on a large form.
+
+The window is resized through a sequence of sizes, and every resize is
+processed by the owner container exactly as during a window drag.
+
+Usage: python bench_resize.py [num_rows] [frames]
+
+"""
+import sys
+
+from bench_support import create_view, find_client, timer
+
+
+SOURCE = """
+from enaml.widgets.api import Window, Container, Form, Label, Field, Include
+
+enamldef MainView(Window):
+    attr rows = 500
+    Container:
+        Form:
+            Include:
+                objects = [
+                    comp for i in range(rows)
+                    for comp in (Label(text='Row %d' % i), Field())
+                ]
+"""
+
+
+def resize_loop(app, window, frames):
+    """ Resize the given window through `frames` different sizes.
+
+    """
+    width = window.width()
+    height = window.height()
+    for i in xrange(frames):
+        delta = i % 50
+        window.resize(width + delta, height + delta)
+        app.process_events()
+
+
+def geometry_updates(container):
+    """ Count the (applied, skipped) geometry updates of a container.
+
+    The count covers the layout passes which have been run with the
+    current layout table of the container.
+
+    """
+    stats = container.layout_stats()
+    return stats['geometry_applied'], stats['geometry_skipped']
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    app, view, client_view = create_view(SOURCE, rows=rows)
+    window = client_view.widget()
+    window.show()
+    app.process_events()
+    container = find_client(client_view, 'QtForm')
+    manager = container._layout_manager
+    print 'rows: %d, frames: %d' % (rows, frames)
+
+    with timer('resize', frames):
+        resize_loop(app, window, frames)
+
+    print 'solve counts: %r' % manager.solve_counts
+    applied, skipped = geometry_updates(container)
+    print 'setGeometry calls applied: %d, skipped: %d' % (applied, skipped)
+
+
+if __name__ == '__main__':
+    main()
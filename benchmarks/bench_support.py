@@ -0,0 +1,113 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Shared support code for the Enaml benchmark scripts.
+
+The benchmarks are plain scripts which are run by hand against a full
+build environment (Qt, casuarius, traits). They are not collected by
+the test suite.
+
+"""
+from contextlib import contextmanager
+import itertools
+import time
+import types
+
+from enaml.core.parser import parse
+from enaml.core.enaml_compiler import EnamlCompiler
+from enaml.stdlib.sessions import simple_session
+from enaml.qt.qt_application import QtApplication
+
+
+class BenchApplication(QtApplication):
+    """ A QtApplication which does not enter the event loop.
+
+    """
+    def start(self):
+        """ Reimplemented to not start the event loop.
+
+        """
+        pass
+
+    def process_events(self):
+        """ Process all pending events on the Qt event loop.
+
+        """
+        self._qapp.sendPostedEvents()
+        self._qapp.processEvents()
+
+
+_session_counter = itertools.count()
+
+
+def create_view(source, **kwargs):
+    """ Compile the given Enaml source and show its 'MainView'.
+
+    Parameters
+    ----------
+    source : str
+        The Enaml source which defines an enamldef named 'MainView'.
+
+    **kwargs
+        The keyword arguments to pass to the 'MainView' constructor.
+
+    Returns
+    -------
+    result : (app, view, client_view)
+        The application, the server side root window and the client
+        side root window.
+
+    """
+    enaml_ast = parse(source)
+    module = types.ModuleType('__bench__')
+    code = EnamlCompiler.compile(enaml_ast, '__enaml_bench__')
+    exec code in module.__dict__
+    View = module.__dict__['MainView']
+
+    session_name = 'bench_%d' % _session_counter.next()
+    factory = simple_session(session_name, 'bench', View, **kwargs)
+    app = BenchApplication.instance()
+    if app is None:
+        app = BenchApplication([])
+    app.add_factories([factory])
+    session_id = app.start_session(session_name)
+    app.start()
+    view = app._sessions[session_id].windows[0]
+    client_view = app._qt_sessions[session_id]._windows[0]
+    return app, view, client_view
+
+
+def find_client(root, type_name):
+    """ Find the first client object of the given type name.
+
+    """
+    if type_name in [cls.__name__ for cls in type(root).__mro__]:
+        return root
+    for child in root.children():
+        found = find_client(child, type_name)
+        if found is not None:
+            return found
+
+
+@contextmanager
+def timer(label, count=1):
+    """ A context manager which prints the elapsed time of its body.
+
+    Parameters
+    ----------
+    label : str
+        The label to print with the timing result.
+
+    count : int, optional
+        The number of iterations executed by the body. The time per
+        iteration is printed along with the total.
+
+    """
+    t0 = time.time()
+    yield
+    elapsed = time.time() - t0
+    per = elapsed / max(count, 1)
+    print '%-40s %10.3f ms total %10.3f ms/iter' % (
+        label, elapsed * 1000.0, per * 1000.0
+    )
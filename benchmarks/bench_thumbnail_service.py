@@ -0,0 +1,90 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" Measure cold and warm thumbnail loads of a directory of photos.
+
+A directory of synthetic 1600x1200 JPEG photos is created with PIL and
+loaded through a ThumbnailService with a single worker and with the
+worker pool, each time with a cold and then a warm on-disk cache. The
+time is measured until the last batch is delivered to the model.
+
+Usage: python bench_thumbnail_service.py [num_images]
+
+"""
+import os
+from Queue import Queue
+import shutil
+import sys
+import tempfile
+
+from PIL import Image
+
+from enaml.stdlib.old.thumbnail_service import ThumbnailService
+
+from bench_support import timer
+
+
+class CountingModel(object):
+
+    def __init__(self):
+        self.count = 0
+
+    def extend(self, thumbs):
+        self.count += len(thumbs)
+
+
+def make_photos(directory, count):
+    paths = []
+    for index in xrange(count):
+        img = Image.effect_mandelbrot(
+            (1600, 1200), (-2.0 + index * 0.01, -1.0, 1.0, 1.0), 64,
+        ).convert('RGB')
+        path = os.path.join(directory, 'photo%04d.jpg' % index)
+        img.save(path, quality=90)
+        paths.append(path)
+    return paths
+
+
+def run(service, paths):
+    queue = Queue()
+    service._post = lambda callback, *args: queue.put((callback, args))
+    model = CountingModel()
+    done = []
+    service.load(model, paths, done.append)
+    while not done:
+        callback, args = queue.get()
+        callback(*args)
+    return model.count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    root = tempfile.mkdtemp()
+    try:
+        photos = os.path.join(root, 'photos')
+        os.mkdir(photos)
+        with timer('create %d photos' % count):
+            paths = make_photos(photos, count)
+        for processes in (0, None):
+            label = 'inline' if processes == 0 else 'pool'
+            cache_dir = os.path.join(root, 'cache-%s' % label)
+            service = ThumbnailService(
+                (256, 256), cache_dir=cache_dir, processes=processes,
+            )
+            run(service, paths[:1])
+            service.cache.clear()
+            with timer('%s, cold cache' % label, count):
+                loaded = run(service, paths)
+            with timer('%s, warm cache' % label, count):
+                run(service, paths)
+            print 'thumbnails: %d, cache: %.1f KB' % (
+                loaded, service.cache.num_bytes / 1024.0
+            )
+            service.close()
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
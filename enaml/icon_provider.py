@@ -64,6 +64,16 @@ class IconProvider(object):
     """
     __metaclass__ = ABCMeta
 
+    #: Whether the icons of this provider can be shared by all of the
+    #: sessions of the process. The icons of a shared provider are
+    #: cached by url, so a session is served the icons loaded for
+    #: another session by any shared provider registered under the
+    #: same name. A provider should only be shared if it returns the
+    #: same icons for a path in every session. The icons of a provider
+    #: which is not shared are only served to the sessions which use
+    #: that provider object.
+    shared = False
+
     @abstractmethod
     def request_icon(self, path, callback):
         """ Request an icon from this provider.
@@ -84,3 +94,19 @@ class IconProvider(object):
         """
         raise NotImplementedError
 
+    def request_icons(self, requests):
+        """ Request a batch of icons from this provider.
+
+        The default implementation calls `request_icon` for each of
+        the requests. A provider which can load several icons more
+        efficiently at once may reimplement this method.
+
+        Parameters
+        ----------
+        requests : list of tuple
+            The (path, callback) tuples of the requests, in priority
+            order. See `request_icon` for the meaning of the items.
+
+        """
+        for path, callback in requests:
+            self.request_icon(path, callback)
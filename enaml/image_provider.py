@@ -59,6 +59,16 @@ class ImageProvider(object):
     """
     __metaclass__ = ABCMeta
 
+    #: Whether the images of this provider can be shared by all of the
+    #: sessions of the process. The images of a shared provider are
+    #: cached by url, so a session is served the images loaded for
+    #: another session by any shared provider registered under the
+    #: same name. A provider should only be shared if it returns the
+    #: same images for a path in every session. The images of a provider
+    #: which is not shared are only served to the sessions which use
+    #: that provider object.
+    shared = False
+
     @abstractmethod
     def request_image(self, path, size, callback):
         """ Request an image from this provider.
@@ -85,3 +95,21 @@ class ImageProvider(object):
         """
         raise NotImplementedError
 
+    def request_images(self, requests):
+        """ Request a batch of images from this provider.
+
+        The default implementation calls `request_image` for each of
+        the requests. A provider which can load several images more
+        efficiently at once, with a single query to a database for
+        example, may reimplement this method.
+
+        Parameters
+        ----------
+        requests : list of tuple
+            The (path, size, callback) tuples of the requests, in
+            priority order. See `request_image` for the meaning of the
+            items.
+
+        """
+        for path, size, callback in requests:
+            self.request_image(path, size, callback)
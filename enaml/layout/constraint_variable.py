@@ -2,7 +2,6 @@
 #  Copyright (c) 2011, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-from collections import defaultdict
 import operator
 
 
@@ -109,7 +108,7 @@ class LinearSymbolic(object):
 
     def __eq__(self, other):
         if isinstance(other, (float, int, long)):
-            rhs = LinearExpression([], float(other))
+            rhs = _reduced_expression((), float(other))
         elif isinstance(other, LinearSymbolic):
             rhs = other
         else:
@@ -119,7 +118,7 @@ class LinearSymbolic(object):
 
     def __le__(self, other):
         if isinstance(other, (float, int, long)):
-            rhs = LinearExpression([], float(other))
+            rhs = _reduced_expression((), float(other))
         elif isinstance(other, LinearSymbolic):
             rhs = other
         else:
@@ -129,7 +128,7 @@ class LinearSymbolic(object):
 
     def __ge__(self, other):
         if isinstance(other, (float, int, long)):
-            rhs = LinearExpression([], float(other))
+            rhs = _reduced_expression((), float(other))
         elif isinstance(other, LinearSymbolic):
             rhs = other
         else:
@@ -175,15 +174,13 @@ class ConstraintVariable(LinearSymbolic):
         if not isinstance(self, LinearSymbolic):
             self, other = other, self
         if isinstance(other, (float, int, long)):
-            terms = [Term(self)]
-            const = float(other)
-            expr = LinearExpression(terms, const)
+            expr = _reduced_expression((Term(self),), float(other))
         elif isinstance(other, Term):
-            terms = [Term(self), other]
-            expr = LinearExpression(terms)
+            terms = _merge_term((Term(self),), other.var, other.coeff, other)
+            expr = _reduced_expression(terms, 0.0)
         elif isinstance(other, ConstraintVariable):
-            terms = [Term(self), Term(other)]
-            expr = LinearExpression(terms)
+            terms = _merge_term((Term(self),), other, 1.0)
+            expr = _reduced_expression(terms, 0.0)
         elif isinstance(other, LinearExpression):
             expr = other + self
         else:
@@ -249,16 +246,15 @@ class Term(LinearSymbolic):
     def __add__(self, other):
         if not isinstance(self, LinearSymbolic):
             self, other = other, self
+        base = () if almost_equal(self.coeff, 0.0) else (self,)
         if isinstance(other, (float, int, long)):
-            terms = [self]
-            const = float(other)
-            expr = LinearExpression(terms, const)
+            expr = _reduced_expression(base, float(other))
         elif isinstance(other, Term):
-            terms = [self, other]
-            expr = LinearExpression(terms)
+            terms = _merge_term(base, other.var, other.coeff, other)
+            expr = _reduced_expression(terms, 0.0)
         elif isinstance(other, ConstraintVariable):
-            terms = [self, Term(other)]
-            expr = LinearExpression(terms)
+            terms = _merge_term(base, other, 1.0)
+            expr = _reduced_expression(terms, 0.0)
         elif isinstance(other, LinearExpression):
             expr = other + self
         else:
@@ -294,14 +290,11 @@ class LinearExpression(LinearSymbolic):
 
     @staticmethod
     def reduce_terms(terms):
-        mapping = defaultdict(float)
+        builder = LinearSum()
+        add = builder.add_term
         for term in terms:
-            mapping[term.var] += term.coeff
-        terms = tuple(
-            Term(var, coeff) for (var, coeff) in mapping.iteritems()
-            if not almost_equal(coeff, 0.0)
-        )
-        return terms
+            add(term.var, term.coeff)
+        return builder.terms()
 
     def __init__(self, terms, constant=0.0):
         self.terms = self.reduce_terms(terms)
@@ -331,17 +324,19 @@ class LinearExpression(LinearSymbolic):
         if not isinstance(self, LinearSymbolic):
             self, other = other, self
         if isinstance(other, (float, int, long)):
-            expr = LinearExpression(self.terms, self.constant + float(other))
+            const = self.constant + float(other)
+            expr = _reduced_expression(self.terms, const)
         elif isinstance(other, Term):
-            terms = list(self.terms) + [other]
-            expr = LinearExpression(terms, self.constant)
+            terms = _merge_term(self.terms, other.var, other.coeff, other)
+            expr = _reduced_expression(terms, self.constant)
         elif isinstance(other, ConstraintVariable):
-            terms = list(self.terms) + [Term(other)]
-            expr = LinearExpression(terms, self.constant)
+            terms = _merge_term(self.terms, other, 1.0)
+            expr = _reduced_expression(terms, self.constant)
         elif isinstance(other, LinearExpression):
-            terms = list(self.terms) + list(other.terms)
-            const = self.constant + other.constant
-            expr = LinearExpression(terms, const)
+            builder = LinearSum()
+            builder += self
+            builder += other
+            expr = builder.expression()
         else:
             return NotImplemented
         return expr
@@ -350,9 +345,13 @@ class LinearExpression(LinearSymbolic):
         if not isinstance(self, LinearSymbolic):
             self, other = other, self
         if isinstance(other, (float, int, long)):
-            terms = [other * term for term in self.terms]
-            const = self.constant * other
-            res = LinearExpression(terms, const)
+            other = float(other)
+            if other == 0.0:
+                return _reduced_expression((), 0.0)
+            terms = tuple(
+                Term(term.var, other * term.coeff) for term in self.terms
+            )
+            res = _reduced_expression(terms, self.constant * other)
         elif isinstance(other, (Term, ConstraintVariable, LinearExpression)):
             self.nonlinear('[ %s ] * [ %s ]' % (self, other))
         else:
@@ -371,6 +370,157 @@ class LinearExpression(LinearSymbolic):
         return res
 
 
+class LinearSum(object):
+    """ An accumulator which builds the sum of many linear symbolic
+    objects in place.
+
+    Adding symbolic objects with `+` creates a new LinearExpression
+    for every intermediate sum, which makes a long sum quadratic in
+    the number of terms. A LinearSum collects the coefficients of the
+    added objects in a single mapping and creates the reduced result
+    expression once.
+
+    """
+    __slots__ = ('_coeffs', '_vars', 'constant')
+
+    def __init__(self):
+        self._coeffs = {}
+        self._vars = []
+        self.constant = 0.0
+
+    def __iadd__(self, other):
+        self.add(other)
+        return self
+
+    def add(self, other, coeff=1.0):
+        """ Add a scaled number or linear symbolic object to the sum.
+
+        Parameters
+        ----------
+        other : number or LinearSymbolic
+            The object to add to the sum.
+
+        coeff : float, optional
+            The factor by which to scale the object. The default is
+            1.0.
+
+        """
+        if isinstance(other, (float, int, long)):
+            self.constant += coeff * other
+        elif isinstance(other, ConstraintVariable):
+            self.add_term(other, coeff)
+        elif isinstance(other, Term):
+            self.add_term(other.var, coeff * other.coeff)
+        elif isinstance(other, LinearExpression):
+            add = self.add_term
+            for term in other.terms:
+                add(term.var, coeff * term.coeff)
+            self.constant += coeff * other.constant
+        else:
+            msg = 'Invalid type for linear sum %s' % type(other)
+            raise TypeError(msg)
+
+    def add_term(self, var, coeff):
+        """ Add a scaled constraint variable to the sum.
+
+        Parameters
+        ----------
+        var : ConstraintVariable
+            The variable to add to the sum.
+
+        coeff : float
+            The coefficient of the variable.
+
+        """
+        # Variables are keyed by identity, since the comparison
+        # operators of a variable create constraints.
+        key = id(var)
+        coeffs = self._coeffs
+        if key in coeffs:
+            coeffs[key] += coeff
+        else:
+            coeffs[key] = coeff
+            self._vars.append(var)
+
+    def terms(self):
+        """ Get the reduced terms of the sum.
+
+        Returns
+        -------
+        result : tuple
+            A tuple of Term objects, one per variable with a non-zero
+            coefficient, in the order the variables were first added.
+
+        """
+        coeffs = self._coeffs
+        res = []
+        for var in self._vars:
+            coeff = coeffs[id(var)]
+            if not almost_equal(coeff, 0.0):
+                res.append(Term(var, coeff))
+        return tuple(res)
+
+    def expression(self):
+        """ Create the LinearExpression for the sum.
+
+        Returns
+        -------
+        result : LinearExpression
+            The expression which represents the current value of the
+            sum.
+
+        """
+        return _reduced_expression(self.terms(), self.constant)
+
+
+def _reduced_expression(terms, constant):
+    """ Create a LinearExpression from a tuple of terms which are
+    already reduced, without scanning the terms again.
+
+    """
+    expr = object.__new__(LinearExpression)
+    expr.terms = terms
+    expr.constant = constant
+    return expr
+
+
+def _merge_term(terms, var, coeff, term=None):
+    """ Add a single term to a tuple of reduced terms.
+
+    Parameters
+    ----------
+    terms : tuple
+        The tuple of reduced Term objects.
+
+    var : ConstraintVariable
+        The variable of the term to add.
+
+    coeff : float
+        The coefficient of the term to add.
+
+    term : Term, optional
+        The Term instance for the variable and coefficient, which is
+        reused if the variable is not in the terms already.
+
+    Returns
+    -------
+    result : tuple
+        A new tuple of reduced Term objects.
+
+    """
+    for idx, item in enumerate(terms):
+        if item.var is var:
+            total = item.coeff + coeff
+            if almost_equal(total, 0.0):
+                return terms[:idx] + terms[idx + 1:]
+            return terms[:idx] + (Term(var, total),) + terms[idx + 1:]
+    if almost_equal(coeff, 0.0):
+        return terms
+    if term is None:
+        term = Term(var, coeff)
+    return terms + (term,)
+
+
 class LinearConstraint(object):
 
     __slots__ = ('lhs', 'rhs', 'strength', 'weight', 'op')
@@ -465,3 +615,83 @@ class EQConstraint(LinearConstraint):
         super(EQConstraint, self).__init__(lhs, rhs, strength, weight)
         self.op = b'=='
 
+
+def _linear_parts(symbolic):
+    """ Returns the ((var, coeff), ...) terms and the constant of the
+    given linear symbolic object.
+
+    """
+    if isinstance(symbolic, LinearExpression):
+        terms = tuple((term.var, term.coeff) for term in symbolic.terms)
+        return terms, symbolic.constant
+    if isinstance(symbolic, Term):
+        return ((symbolic.var, symbolic.coeff),), 0.0
+    if isinstance(symbolic, ConstraintVariable):
+        return ((symbolic, 1.0),), 0.0
+    msg = 'Unhandled linear symbolic type `%s`' % type(symbolic)
+    raise TypeError(msg)
+
+
+def flatten_constraints(constraints):
+    """ Serialize linear constraints into a flat and compact form.
+
+    Every constraint is normalized to the form `expr op 0` by moving
+    the right hand side to the left. The variables used by the
+    constraints are stored once in a shared variable table and are
+    referenced by index. This avoids the deeply nested dictionaries
+    created by `as_dict` and allows a client to convert the whole
+    set of constraints in a single linear pass.
+
+    Parameters
+    ----------
+    constraints : iterable
+        An iterable of LinearConstraint instances.
+
+    Returns
+    -------
+    result : dict
+        A dictionary with the following keys:
+
+        'variables'
+            A list of (owner, name) tuples for the variables which are
+            referenced by the constraints.
+
+        'constraints'
+            A list of (op, strength, weight, constant, pairs) tuples,
+            one per constraint. The pairs are a flat list of the form
+            [index_0, coeff_0, index_1, coeff_1, ...] where each index
+            refers to an entry in the variable table.
+
+    """
+    variables = []
+    indices = {}
+    flat = []
+    push_var = variables.append
+    push_cn = flat.append
+    parts = _linear_parts
+    for cn in constraints:
+        lhs_terms, lhs_const = parts(cn.lhs)
+        rhs_terms, rhs_const = parts(cn.rhs)
+        coeffs = {}
+        order = []
+        for terms, sign in ((lhs_terms, 1.0), (rhs_terms, -1.0)):
+            for var, coeff in terms:
+                key = (var.owner, var.name)
+                idx = indices.get(key)
+                if idx is None:
+                    idx = indices[key] = len(variables)
+                    push_var(key)
+                if idx in coeffs:
+                    coeffs[idx] += sign * coeff
+                else:
+                    coeffs[idx] = sign * coeff
+                    order.append(idx)
+        pairs = []
+        for idx in order:
+            coeff = coeffs[idx]
+            if not almost_equal(coeff, 0.0):
+                pairs.append(idx)
+                pairs.append(coeff)
+        const = lhs_const - rhs_const
+        push_cn((cn.op, cn.strength, cn.weight, const, pairs))
+    return {'variables': variables, 'constraints': flat}
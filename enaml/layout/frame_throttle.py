@@ -0,0 +1,116 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from time import time
+
+
+class FrameThrottle(object):
+    """ A class which bounds the rate of layout solves during an
+    interactive resize.
+
+    A request which arrives at least one frame budget after the end of
+    the previous solve is executed immediately. A request which arrives
+    sooner is coalesced with any other pending requests into a single
+    solve which is scheduled for the end of the current frame. This
+    guarantees that the last request of a burst is always followed by
+    an exact solve, while intermediate solves are skipped when the
+    requests arrive faster than they can be processed.
+
+    """
+    def __init__(self, budget, callback, schedule, clock=time):
+        """ Initialize a FrameThrottle.
+
+        Parameters
+        ----------
+        budget : float
+            The frame budget, in seconds.
+
+        callback : callable
+            The callable which performs the solve. It is called with
+            no arguments.
+
+        schedule : callable
+            A callable which accepts a delay in milliseconds and a
+            callback, and which executes the callback on the main
+            thread after the delay has elapsed.
+
+        clock : callable, optional
+            The callable which returns the current time in seconds.
+            The default is time.time.
+
+        """
+        self.budget = budget
+        self._callback = callback
+        self._schedule = schedule
+        self._clock = clock
+        self._last_end = 0.0
+        self._pending = False
+        self.frames = 0
+        self.coalesced = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+
+    def request(self):
+        """ Request a solve.
+
+        The solve is either performed immediately, or deferred to the
+        end of the current frame.
+
+        """
+        if self._pending:
+            self.coalesced += 1
+            return
+        elapsed = self._clock() - self._last_end
+        budget = self.budget
+        if elapsed >= budget:
+            self._run()
+        else:
+            self._pending = True
+            delay = int((budget - elapsed) * 1000.0) + 1
+            self._schedule(delay, self._on_timer)
+
+    def stats(self):
+        """ Get the solve time statistics for the throttle.
+
+        Returns
+        -------
+        result : dict
+            A dict with the number of solved 'frames', the number of
+            'coalesced' requests, and the 'total_time', 'max_time' and
+            'last_time' spent per solve, in seconds.
+
+        """
+        return {
+            'frames': self.frames,
+            'coalesced': self.coalesced,
+            'total_time': self.total_time,
+            'max_time': self.max_time,
+            'last_time': self.last_time,
+        }
+
+    def _on_timer(self):
+        """ Handle the end of a frame with a pending request.
+
+        """
+        self._pending = False
+        self._run()
+
+    def _run(self):
+        """ Run the callback and record the time it takes.
+
+        """
+        clock = self._clock
+        start = clock()
+        try:
+            self._callback()
+        finally:
+            end = clock()
+            elapsed = end - start
+            self._last_end = end
+            self.frames += 1
+            self.total_time += elapsed
+            self.last_time = elapsed
+            if elapsed > self.max_time:
+                self.max_time = elapsed
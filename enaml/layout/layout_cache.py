@@ -0,0 +1,298 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+""" A persistent cache of solved layout results.
+
+A layout cache stores the solved size bounds of a layout container,
+along with the solved geometry of its layout items for the most
+recently used container sizes. The first layout of a container which
+is opened again with the same constraint system is then a table lookup
+instead of a solve.
+
+The cache is invalidated according to the following rules:
+
+    * The key of an entry is a hash of the layout signature of the
+      container, which includes the structure of the layout table, the
+      size hints and size policies of the items and the user defined
+      constraints. Any change to the constraint system yields a new
+      key, and the stale entry is simply never read again.
+
+    * The results which are served from the cache are verified by a
+      deferred solve. If the solved results differ, the entry is
+      replaced with the solved results.
+
+    * An entry holds the geometry for a bounded number of container
+      sizes. The least recently stored size is dropped first.
+
+    * A file which cannot be read, or which was written by a different
+      version of the cache format, is treated as a miss and removed.
+
+"""
+from array import array
+from collections import OrderedDict
+import hashlib
+import os
+
+
+#: The version of the file format of the cache. It is part of every key
+#: so that a change of the format invalidates all existing entries.
+FORMAT_VERSION = 1
+
+
+#: The magic number which starts every cache file.
+MAGIC = 0x454c4331
+
+
+class LayoutCacheEntry(object):
+    """ The cached layout results for a single constraint system.
+
+    """
+    __slots__ = ('num_items', 'size_bounds', 'geometries')
+
+    def __init__(self, num_items, size_bounds):
+        """ Initialize a LayoutCacheEntry.
+
+        Parameters
+        ----------
+        num_items : int
+            The number of items in the layout table of the container.
+
+        size_bounds : tuple
+            The ((min_w, min_h), (best_w, best_h), (max_w, max_h))
+            size bounds of the container.
+
+        """
+        self.num_items = num_items
+        self.size_bounds = size_bounds
+        self.geometries = OrderedDict()
+
+    def lookup(self, size):
+        """ Get the geometry of the layout items for a container size.
+
+        Parameters
+        ----------
+        size : (int, int)
+            The (width, height) of the container.
+
+        Returns
+        -------
+        result : list or None
+            The list of (x, y, width, height) tuples for the items in
+            the layout table, or None if the size is not cached.
+
+        """
+        return self.geometries.get(size)
+
+    def record(self, size, geometries, max_sizes):
+        """ Record the geometry of the layout items for a container size.
+
+        Parameters
+        ----------
+        size : (int, int)
+            The (width, height) of the container.
+
+        geometries : list
+            The list of (x, y, width, height) tuples for the items in
+            the layout table.
+
+        max_sizes : int
+            The maximum number of container sizes to keep.
+
+        """
+        cached = self.geometries
+        cached.pop(size, None)
+        cached[size] = geometries
+        while len(cached) > max_sizes:
+            cached.popitem(last=False)
+
+    def to_array(self):
+        """ Pack the entry into a flat array of integers.
+
+        """
+        data = array('i', [MAGIC, FORMAT_VERSION, self.num_items])
+        data.append(len(self.geometries))
+        for size in self.size_bounds:
+            data.extend(size)
+        for size, geometries in self.geometries.iteritems():
+            data.extend(size)
+            for geo in geometries:
+                data.extend(geo)
+        return data
+
+    @classmethod
+    def from_array(cls, data):
+        """ Unpack an entry from a flat array of integers.
+
+        Parameters
+        ----------
+        data : array
+            The array created by a call to `to_array`.
+
+        Returns
+        -------
+        result : LayoutCacheEntry or None
+            The unpacked entry, or None if the data is not valid.
+
+        """
+        if len(data) < 10 or data[0] != MAGIC or data[1] != FORMAT_VERSION:
+            return None
+        num_items = data[2]
+        num_sizes = data[3]
+        if len(data) != 10 + num_sizes * (2 + 4 * num_items):
+            return None
+        bounds = tuple(tuple(data[idx:idx + 2]) for idx in (4, 6, 8))
+        entry = cls(num_items, bounds)
+        offset = 10
+        for _ in xrange(num_sizes):
+            size = tuple(data[offset:offset + 2])
+            offset += 2
+            geometries = []
+            for _ in xrange(num_items):
+                geometries.append(tuple(data[offset:offset + 4]))
+                offset += 4
+            entry.geometries[size] = geometries
+        return entry
+
+
+class LayoutCache(object):
+    """ A directory of persisted layout cache entries.
+
+    Every entry is stored in a file of its own, as a compact array of
+    native integers. The entries which have been loaded or stored are
+    also kept in memory, so a window which is opened several times in
+    the same process only reads its entry once.
+
+    """
+    def __init__(self, directory, max_sizes=8):
+        """ Initialize a LayoutCache.
+
+        Parameters
+        ----------
+        directory : str
+            The directory in which to store the cache files. It is
+            created if it does not exist.
+
+        max_sizes : int, optional
+            The maximum number of container sizes for which the item
+            geometry is kept per entry. The default is 8.
+
+        """
+        self.directory = directory
+        self.max_sizes = max_sizes
+        self._entries = {}
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    @staticmethod
+    def make_key(signature):
+        """ Create the cache key for a layout signature.
+
+        Parameters
+        ----------
+        signature : tuple
+            A tuple of primitive values which describes the constraint
+            system of a container. Its repr must be deterministic.
+
+        Returns
+        -------
+        result : str
+            The hex digest which identifies the signature.
+
+        """
+        return hashlib.sha1(repr((FORMAT_VERSION, signature))).hexdigest()
+
+    def load(self, key):
+        """ Load the entry for a cache key.
+
+        Parameters
+        ----------
+        key : str
+            The key created by a call to `make_key`.
+
+        Returns
+        -------
+        result : LayoutCacheEntry or None
+            The cached entry, or None if there is no valid entry.
+
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        data = array('i')
+        try:
+            with open(path, 'rb') as f:
+                data.fromstring(f.read())
+        except (IOError, OSError, ValueError):
+            data = None
+        entry = LayoutCacheEntry.from_array(data) if data else None
+        if entry is None:
+            self.discard(key)
+        else:
+            self._entries[key] = entry
+        return entry
+
+    def store(self, key, entry):
+        """ Store the entry for a cache key.
+
+        The file is written to a temporary path and renamed, so that a
+        concurrent reader never sees a partially written entry.
+
+        Parameters
+        ----------
+        key : str
+            The key created by a call to `make_key`.
+
+        entry : LayoutCacheEntry
+            The entry to store.
+
+        """
+        self._entries[key] = entry
+        path = self._path(key)
+        temp = '%s.%d.tmp' % (path, os.getpid())
+        try:
+            with open(temp, 'wb') as f:
+                entry.to_array().tofile(f)
+            if os.name == 'nt' and os.path.exists(path):
+                os.remove(path)
+            os.rename(temp, path)
+        except (IOError, OSError):
+            if os.path.exists(temp):
+                os.remove(temp)
+
+    def discard(self, key):
+        """ Remove the entry for a cache key, if it exists.
+
+        Parameters
+        ----------
+        key : str
+            The key created by a call to `make_key`.
+
+        """
+        self._entries.pop(key, None)
+        path = self._path(key)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """ Remove all of the entries of the cache.
+
+        """
+        self._entries.clear()
+        for name in os.listdir(self.directory):
+            if name.endswith('.layout'):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def _path(self, key):
+        """ Get the path of the file for a cache key.
+
+        """
+        return os.path.join(self.directory, key + '.layout')
@@ -12,7 +12,9 @@ from enaml.core.trait_types import CoercingInstance
 
 from .ab_constrainable import ABConstrainable
 from .box_model import BoxModel
-from .constraint_variable import ConstraintVariable, LinearSymbolic, STRENGTHS
+from .constraint_variable import (
+    ConstraintVariable, LinearSymbolic, STRENGTHS, EQConstraint, LEConstraint,
+)
 from .geometry import Box
 
 
@@ -587,7 +589,8 @@ class GridHelper(BoxHelper):
         super(GridHelper, self).__init__('grid')
         self.grid_rows = rows
         self.row_align = config.get('row_align', '')
-        self.col_align = config.get('col_align', '')
+        col_align = config.get('col_align', '')
+        self.col_align = config.get('column_align', col_align)
         self.row_spacing = config.get('row_spacing', DefaultSpacing.ABUTMENT)
         self.col_spacing = config.get('column_spacing', DefaultSpacing.ABUTMENT)
         self.margins = Box(config.get('margins', DefaultSpacing.BOX_MARGINS))
@@ -650,27 +653,28 @@ class GridHelper(BoxHelper):
         else:
             constraints = []
 
-        # Create the row and column constraint variables along with
-        # some default limits
-        row_vars = []
-        col_vars = []
+        # Create the row and column guide variables. The guides of a
+        # grid are shared by all of the cells which start or end on
+        # them. Only the first guide needs a lower limit, the neighbor
+        # relations imply the limit for the rest of the guides.
         cn_id = self.constraints_id
-        for idx in xrange(num_rows + 1):
-            name = 'row' + str(idx)
-            var = ConstraintVariable(name, cn_id)
-            row_vars.append(var)
-            constraints.append(var >= 0)
-        for idx in xrange(num_cols + 1):
-            name = 'col' + str(idx)
-            var = ConstraintVariable(name, cn_id)
-            col_vars.append(var)
-            constraints.append(var >= 0)
+        row_vars = [
+            ConstraintVariable('row' + str(idx), cn_id)
+            for idx in xrange(num_rows + 1)
+        ]
+        col_vars = [
+            ConstraintVariable('col' + str(idx), cn_id)
+            for idx in xrange(num_cols + 1)
+        ]
+        push = constraints.append
+        push(row_vars[0] >= 0)
+        push(col_vars[0] >= 0)
 
         # Add some neighbor relations to the row and column vars.
         for r1, r2 in zip(row_vars[:-1], row_vars[1:]):
-            constraints.append(r1 <= r2)
+            push(r1 <= r2)
         for c1, c2 in zip(col_vars[:-1], col_vars[1:]):
-            constraints.append(c1 <= c2)
+            push(c1 <= c2)
 
         # Setup the initial interior bounding box for the grid.
         margins = self.margins
@@ -685,32 +689,55 @@ class GridHelper(BoxHelper):
             AbutmentHelper('horizontal', *right_items),
         ]
 
-        # Setup the spacer list for constraining the cell items
-        row_spacer = FlexSpacer(self.row_spacing / 2.)
-        col_spacer = FlexSpacer(self.col_spacing / 2.)
-        rspace = [row_spacer] * len(row_vars)
-        rspace[0] = 0
-        rspace[-1] = 0
-        cspace = [col_spacer] * len(col_vars)
-        cspace[0] = 0
-        cspace[-1] = 0
-
-        # Setup the constraints for each constrainable grid cell.
+        # Setup the constraints for each constrainable grid cell. The
+        # constraints are emitted directly, instead of through a pair
+        # of abutment helpers per cell, since the cost of creating the
+        # helper and factory objects dominates for large grids. A cell
+        # abuts the outer guides of the grid, and is separated from an
+        # interior guide by a flex spacer of half the grid spacing. The
+        # offset expression of an interior guide is shared by all of
+        # the cells which start on that guide.
+        row_half = max(0, self.row_spacing / 2.)
+        col_half = max(0, self.col_spacing / 2.)
+        row_starts = [row_vars[0]]
+        row_starts.extend(var + row_half for var in row_vars[1:-1])
+        col_starts = [col_vars[0]]
+        col_starts.extend(var + col_half for var in col_vars[1:-1])
+        DeferredConstraints_ = DeferredConstraints
+        isinst = isinstance
         for cell in cells:
+            item = cell.item
             sr = cell.start_row
             er = cell.end_row + 1
             sc = cell.start_col
             ec = cell.end_col + 1
-            item = cell.item
-            row_item = (
-                row_vars[sr], rspace[sr], item, rspace[er], row_vars[er]
-            )
-            col_item = (
-                col_vars[sc], cspace[sc], item, cspace[ec], col_vars[ec]
-            )
-            helpers.append(AbutmentHelper('vertical', *row_item))
-            helpers.append(AbutmentHelper('horizontal', *col_item))
-            if isinstance(item, DeferredConstraints):
+            top = item.top
+            start = row_starts[sr]
+            if sr == 0:
+                push(start == top)
+            else:
+                push(LEConstraint(start, top))
+                push(EQConstraint(start, top, 'medium', 1.25))
+            if er == num_rows:
+                push(item.bottom == row_vars[er])
+            else:
+                end = item.bottom + row_half
+                push(LEConstraint(end, row_vars[er]))
+                push(EQConstraint(end, row_vars[er], 'medium', 1.25))
+            left = item.left
+            start = col_starts[sc]
+            if sc == 0:
+                push(start == left)
+            else:
+                push(LEConstraint(start, left))
+                push(EQConstraint(start, left, 'medium', 1.25))
+            if ec == num_cols:
+                push(item.right == col_vars[ec])
+            else:
+                end = item.right + col_half
+                push(LEConstraint(end, col_vars[ec]))
+                push(EQConstraint(end, col_vars[ec], 'medium', 1.25))
+            if isinst(item, DeferredConstraints_):
                 helpers.append(item)
 
         # Add the row alignment constraints if given. This will only
@@ -733,7 +760,7 @@ class GridHelper(BoxHelper):
             for cell in cells:
                 if cell.start_col == cell.end_col:
                     col_map[cell.start_col].append(cell.item)
-            for items in row_map.itervalues():
+            for items in col_map.itervalues():
                 if len(items) > 1:
                     helpers.append(AlignmentHelper(self.col_align, *items))
 
@@ -2,6 +2,8 @@
 #  Copyright (c) 2011, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
+from time import time
+
 from casuarius import Solver, medium
 
 
@@ -10,10 +12,33 @@ class LayoutManager(object):
     of constraints.
 
     """
+    #: The size which is suggested to the solver when computing the
+    #: maximum size. Arbitrary, but the max allowed by Qt.
+    MAX_SIZE = 2**24 - 1
+
     def __init__(self):
         self._solver = Solver(autosolve=False)
         self._initialized = False
         self._running = False
+        # The cache of computed min and max sizes. It is cleared when
+        # the constraints in the solver are changed.
+        self._size_cache = {}
+        #: A dict which counts the solves performed by the manager. The
+        #: keys are 'layout', 'min_size', 'max_size', 'replace' and
+        #: 'size_cache_hits'. The last key counts the min and max size
+        #: requests which were served from the cache without a solve.
+        self.solve_counts = dict.fromkeys(
+            ('layout', 'min_size', 'max_size', 'replace', 'size_cache_hits'),
+            0
+        )
+        #: A dict of the total time, in seconds, spent in the solves
+        #: counted by `solve_counts`. The time of a layout does not
+        #: include the time of its callback.
+        self.solve_times = dict.fromkeys(
+            ('layout', 'min_size', 'max_size', 'replace'), 0.0
+        )
+        #: The number of constraints which are held by the solver.
+        self.num_constraints = 0
 
     def initialize(self, constraints):
         """ Initialize the solver with the given constraints.
@@ -29,10 +54,14 @@ class LayoutManager(object):
             raise RuntimeError('Solver already initialized')
         solver = self._solver
         solver.autosolve = False
+        count = 0
         for cn in constraints:
             solver.add_constraint(cn)
+            count += 1
         solver.autosolve = True
         self._initialized = True
+        self.num_constraints = count
+        self._size_cache.clear()
 
     def replace_constraints(self, old_cns, new_cns):
         """ Replace constraints in the solver.
@@ -49,6 +78,9 @@ class LayoutManager(object):
         """
         if not self._initialized:
             raise RuntimeError('Solver not yet initialized')
+        if not old_cns and not new_cns:
+            return
+        start = time()
         solver = self._solver
         solver.autosolve = False
         for cn in old_cns:
@@ -56,6 +88,10 @@ class LayoutManager(object):
         for cn in new_cns:
             solver.add_constraint(cn)
         solver.autosolve = True
+        self._size_cache.clear()
+        self.num_constraints += len(new_cns) - len(old_cns)
+        self.solve_counts['replace'] += 1
+        self.solve_times['replace'] += time() - start
 
     def layout(self, cb, width, height, size, strength=medium, weight=1.0):
         """ Perform an iteration of the solver for the new width and
@@ -97,9 +133,12 @@ class LayoutManager(object):
             return
         try:
             self._running = True
+            start = time()
+            self.solve_counts['layout'] += 1
             w, h = size
             values = [(width, w), (height, h)]
             with self._solver.suggest_values(values, strength, weight):
+                self.solve_times['layout'] += time() - start
                 cb()
         finally:
             self._running = False
@@ -135,15 +174,25 @@ class LayoutManager(object):
         result : (float, float)
             The floating point (min_width, min_height) size of the
             container which would best satisfy the set of constraints.
+            The result is cached until the constraints are changed.
 
         """
         if not self._initialized:
             raise RuntimeError('Get min size on uninitialized solver')
+        key = ('min', id(width), id(height), id(strength), weight)
+        res = self._size_cache.get(key)
+        if res is not None:
+            self.solve_counts['size_cache_hits'] += 1
+            return res
+        start = time()
+        self.solve_counts['min_size'] += 1
         values = [(width, 0.0), (height, 0.0)]
         with self._solver.suggest_values(values, strength, weight):
             min_width = width.value
             min_height = height.value
-        return (min_width, min_height)
+        res = self._size_cache[key] = (min_width, min_height)
+        self.solve_times['min_size'] += time() - start
+        return res
 
     def get_max_size(self, width, height, strength=medium, weight=0.1):
         """ Run an iteration of the solver with the suggested size of
@@ -178,15 +227,51 @@ class LayoutManager(object):
         result : (float or -1, float or -1)
             The floating point (max_width, max_height) size of the
             container which would best satisfy the set of constraints.
+            The result is cached until the constraints are changed.
 
         """
         if not self._initialized:
             raise RuntimeError('Get max size on uninitialized solver')
-        max_val = 2**24 - 1 # Arbitrary, but the max allowed by Qt.
+        key = ('max', id(width), id(height), id(strength), weight)
+        res = self._size_cache.get(key)
+        if res is not None:
+            self.solve_counts['size_cache_hits'] += 1
+            return res
+        start = time()
+        self.solve_counts['max_size'] += 1
+        max_val = self.MAX_SIZE
         values = [(width, max_val), (height, max_val)]
         with self._solver.suggest_values(values, strength, weight):
             max_width = width.value
             max_height = height.value
+        res = self._size_cache[key] = self._max_size_result(
+            max_width, max_height
+        )
+        self.solve_times['max_size'] += time() - start
+        return res
+
+    def stats(self):
+        """ Get the instrumentation counters of the layout manager.
+
+        Returns
+        -------
+        result : dict
+            A dict with the number of 'constraints' in the solver, and
+            copies of the 'counts' and 'times' dicts of the solves.
+
+        """
+        return {
+            'constraints': self.num_constraints,
+            'counts': dict(self.solve_counts),
+            'times': dict(self.solve_times),
+        }
+
+    def _max_size_result(self, max_width, max_height):
+        """ Convert the solved maximum size into the result returned by
+        `get_max_size`, where -1 indicates an unbounded dimension.
+
+        """
+        max_val = self.MAX_SIZE
         width_diff = abs(max_val - int(round(max_width)))
         height_diff = abs(max_val - int(round(max_height)))
         if width_diff <= 1:
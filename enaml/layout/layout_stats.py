@@ -0,0 +1,199 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from collections import defaultdict, deque
+
+
+#: The keys of the solve counters and timers of a layout manager.
+SOLVE_KINDS = ('layout', 'min_size', 'max_size', 'replace')
+
+
+class LayoutStats(object):
+    """ A collector for the layout instrumentation of a client session.
+
+    The collector records the relayout requests of the session as they
+    happen. The counters of the layout managers are owned by the layout
+    containers, and are only aggregated when a snapshot is requested.
+    Recording is a handful of counter updates per relayout, so it is
+    cheap enough to be always enabled.
+
+    """
+    def __init__(self, max_events=50):
+        """ Initialize a LayoutStats.
+
+        Parameters
+        ----------
+        max_events : int, optional
+            The number of recent relayout events to keep. The default
+            is 50.
+
+        """
+        self.relayouts = 0
+        self.relayout_time = 0.0
+        self.causes = defaultdict(int)
+        self.events = deque(maxlen=max_events)
+
+    def record_relayout(self, widget, causes, elapsed):
+        """ Record a relayout request handled by a client widget.
+
+        Parameters
+        ----------
+        widget : object
+            The client widget which handled the relayout action.
+
+        causes : sequence
+            The names of the traits which caused the relayout on the
+            server widget.
+
+        elapsed : float
+            The time spent handling the relayout, in seconds.
+
+        """
+        self.relayouts += 1
+        self.relayout_time += elapsed
+        name = type(widget).__name__
+        causes = tuple(causes) or ('unknown',)
+        counts = self.causes
+        for cause in causes:
+            counts[(name, cause)] += 1
+        self.events.append((widget.object_id(), name, causes, elapsed))
+
+    def snapshot(self, containers):
+        """ Create a snapshot of the layout instrumentation.
+
+        Parameters
+        ----------
+        containers : iterable
+            The stats dicts of the containers which own a layout, as
+            returned by their `layout_stats` method.
+
+        Returns
+        -------
+        result : dict
+            A dict with the number of 'relayouts' and the total
+            'relayout_time', the 'relayout_causes' as a dict mapping
+            (widget class, trait name) to a count, the 'recent'
+            relayout events as (object id, widget class, causes,
+            elapsed) tuples, the list of 'containers' stats, and the
+            'totals' of the container stats.
+
+        """
+        containers = list(containers)
+        counts = dict.fromkeys(SOLVE_KINDS, 0)
+        times = dict.fromkeys(SOLVE_KINDS, 0.0)
+        totals = {
+            'solvers': len(containers),
+            'constraints': 0,
+            'geometry_applied': 0,
+            'geometry_skipped': 0,
+            'counts': counts,
+            'times': times,
+        }
+        for stats in containers:
+            totals['constraints'] += stats['constraints']
+            totals['geometry_applied'] += stats['geometry_applied']
+            totals['geometry_skipped'] += stats['geometry_skipped']
+            for kind in SOLVE_KINDS:
+                counts[kind] += stats['counts'].get(kind, 0)
+                times[kind] += stats['times'].get(kind, 0.0)
+        return {
+            'relayouts': self.relayouts,
+            'relayout_time': self.relayout_time,
+            'relayout_causes': dict(self.causes),
+            'recent': list(self.events),
+            'containers': containers,
+            'totals': totals,
+        }
+
+
+def format_stats(stats):
+    """ Format a snapshot of the layout instrumentation as a one line
+    summary which is suitable for logging.
+
+    Parameters
+    ----------
+    stats : dict
+        The snapshot returned by `LayoutStats.snapshot`.
+
+    Returns
+    -------
+    result : str
+        The summary of the snapshot.
+
+    """
+    totals = stats['totals']
+    counts = totals['counts']
+    times = totals['times']
+    solves = ', '.join(
+        '%s %d/%.1fms' % (kind, counts[kind], times[kind] * 1000.0)
+        for kind in SOLVE_KINDS
+    )
+    causes = sorted(
+        stats['relayout_causes'].iteritems(), key=lambda item: -item[1]
+    )
+    top = ', '.join('%s.%s %d' % (k[0], k[1], v) for k, v in causes[:5])
+    template = (
+        'layout: %d solvers, %d constraints; solves: %s; geometry: %d '
+        'applied, %d skipped; relayouts: %d/%.1fms [%s]'
+    )
+    return template % (
+        totals['solvers'], totals['constraints'], solves,
+        totals['geometry_applied'], totals['geometry_skipped'],
+        stats['relayouts'], stats['relayout_time'] * 1000.0, top,
+    )
+
+
+class LayoutStatsLogger(object):
+    """ An object which periodically logs the layout instrumentation
+    of a session.
+
+    """
+    def __init__(self, snapshot, interval, schedule, logger):
+        """ Initialize a LayoutStatsLogger.
+
+        Parameters
+        ----------
+        snapshot : callable
+            A callable which returns a snapshot of the layout stats.
+
+        interval : float
+            The logging interval, in seconds.
+
+        schedule : callable
+            A callable which accepts a delay in milliseconds and a
+            callback, and which executes the callback on the main
+            thread after the delay has elapsed.
+
+        logger : Logger
+            The logger to which the summary is written at the info
+            level.
+
+        """
+        self._snapshot = snapshot
+        self._interval = int(interval * 1000)
+        self._schedule = schedule
+        self._logger = logger
+        self._running = False
+
+    def start(self):
+        """ Start logging the layout instrumentation.
+
+        """
+        if not self._running:
+            self._running = True
+            self._schedule(self._interval, self._on_timer)
+
+    def stop(self):
+        """ Stop logging the layout instrumentation.
+
+        """
+        self._running = False
+
+    def _on_timer(self):
+        """ Log a summary and schedule the next one.
+
+        """
+        if self._running:
+            self._logger.info(format_stats(self._snapshot()))
+            self._schedule(self._interval, self._on_timer)
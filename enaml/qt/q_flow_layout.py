@@ -3,11 +3,18 @@
 #  All rights reserved.
 #------------------------------------------------------------------------------
 from abc import ABCMeta, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 
 from .qt.QtCore import Qt, QSize, QRect
 from .qt.QtGui import QLayout, QWidgetItem
 
 
+#: The maximum number of widths for which a QFlowLayout caches the
+#: result of a `heightForWidth` computation.
+HFW_CACHE_SIZE = 8
+
+
 class AbstractFlowWidget(object):
     """ An abstract base class which defines the interface for widgets
     which can be used in a QFlowLayout.
@@ -80,6 +87,44 @@ class FlowLayoutData(object):
         self.preferred_size = QSize()
 
 
+class FlowSizeEstimate(object):
+    """ The size estimate for the unmaterialized items of a QFlowLayout.
+
+    The estimate is the running average of the size hints which have
+    been measured for the materialized items of a virtualized layout.
+    A single instance is shared by all of the items of the layout, so
+    that an update of the estimate is seen by every item at once.
+
+    """
+    #: The estimated size of an unmaterialized item. This should be
+    #: considered read-only to external users.
+    size = QSize(100, 100)
+
+    def __init__(self):
+        """ Initialize a FlowSizeEstimate.
+
+        """
+        self.size = QSize(100, 100)
+        self._total_w = 0
+        self._total_h = 0
+        self._count = 0
+
+    def add(self, hint):
+        """ Add a measured size hint to the estimate.
+
+        Parameters
+        ----------
+        hint : QSize
+            The size hint measured for a materialized item.
+
+        """
+        self._total_w += hint.width()
+        self._total_h += hint.height()
+        self._count += 1
+        n = self._count
+        self.size = QSize(self._total_w / n, self._total_h / n)
+
+
 class QFlowWidgetItem(QWidgetItem):
     """ A custom QWidgetItem for use with the QFlowLayout.
 
@@ -88,6 +133,14 @@ class QFlowWidgetItem(QWidgetItem):
     #: publically accesible attribute for performance reasons.
     data = None
 
+    #: The FlowSizeEstimate to use for the item while its widget is
+    #: not materialized by a virtualized layout, or None if the widget
+    #: is materialized. While this is not None, an item which has no
+    #: cached size uses its preferred size, or else the estimate, in
+    #: place of the size of the widget. It is a publically accessible
+    #: attribute for performance reasons.
+    estimate = None
+
     def __init__(self, widget, data):
         """ Initialize a QFlowWidgetItem.
 
@@ -114,6 +167,8 @@ class QFlowWidgetItem(QWidgetItem):
 
         """
         if not self._cached_max.isValid():
+            if self.estimate is not None:
+                return self._estimatedSize()
             self._cached_max = super(QFlowWidgetItem, self).maximumSize()
         return self._cached_max
 
@@ -125,6 +180,8 @@ class QFlowWidgetItem(QWidgetItem):
 
         """
         if not self._cached_min.isValid():
+            if self.estimate is not None:
+                return self._estimatedSize()
             self._cached_min = super(QFlowWidgetItem, self).minimumSize()
         return self._cached_min
 
@@ -138,6 +195,8 @@ class QFlowWidgetItem(QWidgetItem):
 
         """
         if not self._cached_hint.isValid():
+            if self.estimate is not None:
+                return self._estimatedSize()
             hint = super(QFlowWidgetItem, self).sizeHint()
             pref = self.data.preferred_size
             smin = self.minimumSize()
@@ -181,6 +240,33 @@ class QFlowWidgetItem(QWidgetItem):
             self._cached_min = QSize()
             self.data.dirty = False
 
+    def isMeasured(self):
+        """ Get whether the size hint of the item is cached.
+
+        Returns
+        -------
+        result : bool
+            True if the size hint of the widget has been measured and
+            is still valid, False otherwise.
+
+        """
+        return self._cached_hint.isValid()
+
+    def _estimatedSize(self):
+        """ Get the size to use for an unmaterialized item.
+
+        Returns
+        -------
+        result : QSize
+            The preferred size of the item if it is valid in both
+            dimensions, or the current size estimate otherwise.
+
+        """
+        pref = self.data.preferred_size
+        if pref.isValid():
+            return pref
+        return self.estimate.size
+
 
 class _LayoutRow(object):
     """ A private class used by QFlowLayout.
@@ -222,6 +308,11 @@ class _LayoutRow(object):
     #: read-only by external users.
     stretch = 0
 
+    #: The (x, y, layout_height) with which the row was last laid out,
+    #: or None if it has not been laid out. This is updated directly by
+    #: the layout, which skips laying out a row which has not moved.
+    placed = None
+
     def __init__(self, width, options):
         """ Initialize a layout row.
 
@@ -239,6 +330,14 @@ class _LayoutRow(object):
         self._items_stretch = 0
         self._items = []
 
+    @property
+    def items(self):
+        """ A read-only property which returns the list of items in
+        the row. The list should not be modified by external users.
+
+        """
+        return self._items
+
     @property
     def diff_height(self):
         """ A read-only property which computes the difference between
@@ -323,8 +422,9 @@ class _LayoutRow(object):
 
         # Reversing the items reverses the layout direction. All of the
         # computation up to this point has be independent of direction.
+        # A copy is reversed, since a line may be laid out repeatedly.
         if opts.direction == QFlowLayout.RightToLeft:
-            items.reverse()
+            items = items[::-1]
 
         # Precompute a map of starting widths for the items. These will
         # be progressively modified as the delta space is distributed.
@@ -449,6 +549,11 @@ class _LayoutColumn(object):
     #: read-only by external users.
     stretch = 0
 
+    #: The (x, y, layout_width) with which the column was last laid out,
+    #: or None if it has not been laid out. This is updated directly by
+    #: the layout, which skips laying out a column which has not moved.
+    placed = None
+
     def __init__(self, height, options):
         """ Initialize a layout column.
 
@@ -466,6 +571,14 @@ class _LayoutColumn(object):
         self._items_stretch = 0
         self._items = []
 
+    @property
+    def items(self):
+        """ A read-only property which returns the list of items in
+        the column. The list should not be modified by external users.
+
+        """
+        return self._items
+
     @property
     def diff_width(self):
         """ A read-only property which computes the difference between
@@ -550,8 +663,9 @@ class _LayoutColumn(object):
 
         # Reversing the items reverses the layout direction. All of the
         # computation up to this point has be independent of direction.
+        # A copy is reversed, since a line may be laid out repeatedly.
         if opts.direction == QFlowLayout.BottomToTop:
-            items.reverse()
+            items = items[::-1]
 
         # Precompute a map of starting heights for the items. These will
         # be progressively modified as the delta space is distributed.
@@ -627,6 +741,20 @@ class _LayoutColumn(object):
 class QFlowLayout(QLayout):
     """ A custom QLayout which implements a flowing wraparound layout.
 
+    A flow layout can be virtualized for very large numbers of items.
+    In a virtualized layout, only the widgets of the lines of items
+    which intersect the viewport rect are shown and measured. Other
+    items are laid out with their preferred size, their last measured
+    size, or an estimate, and their widgets are kept hidden. The owner
+    of the layout is responsible for updating the viewport rect as the
+    visible area of the layout changes.
+
+    The lines of the layout are kept between layout passes. When items
+    are inserted, removed or resized, the lines are only reflowed from
+    the line of the first affected item, and only the lines which have
+    moved are laid out again. The size hints of the layout are updated
+    incrementally in the same fashion.
+
     """
     #: Lines are filled from left to right and stacked top to bottom.
     LeftToRight = 0
@@ -659,11 +787,22 @@ class QFlowLayout(QLayout):
         super(QFlowLayout, self).__init__()
         self._items = []
         self._options = _LayoutOptions()
-        self._cached_w = -1
-        self._cached_hfw = -1
-        self._cached_min = None
-        self._cached_hint = None
+        self._hfw_cache = OrderedDict()
+        self._items_hint = None
+        self._items_min = None
+        self._grown = set()
         self._wfh_size = None
+        self._virtualized = False
+        self._viewport = QRect()
+        self._estimate = FlowSizeEstimate()
+        self._lines = []
+        self._line_starts = []
+        self._line_extent = -1
+        self._dirty_index = 0
+        self._offsets = []
+        self._origin = 0
+        self._shown = set()
+        self._placing = False
 
     def addWidget(self, widget):
         """ Add a widget to the end of the flow layout.
@@ -692,7 +831,13 @@ class QFlowLayout(QLayout):
         self.addChildWidget(widget)
         item = QFlowWidgetItem(widget, widget.layoutData())
         self._items.insert(index, item)
-        widget.show()
+        if self._virtualized:
+            item.estimate = self._estimate
+            widget.hide()
+        else:
+            widget.show()
+        self._grown.add(item)
+        self._markDirty(index)
         self.invalidate()
 
     def direction(self):
@@ -716,6 +861,7 @@ class QFlowLayout(QLayout):
 
         """
         self._options.direction = direction
+        self._markDirty(0)
         self.invalidate()
 
     def alignment(self):
@@ -740,6 +886,7 @@ class QFlowLayout(QLayout):
 
         """
         self._options.alignment = alignment
+        self._markDirty(0)
         self.invalidate()
 
     def horizontalSpacing(self):
@@ -765,6 +912,7 @@ class QFlowLayout(QLayout):
 
         """
         self._options.h_spacing = spacing
+        self._markDirty(0)
         self.invalidate()
 
     def verticalSpacing(self):
@@ -790,8 +938,75 @@ class QFlowLayout(QLayout):
 
         """
         self._options.v_spacing = spacing
+        self._markDirty(0)
+        self.invalidate()
+
+    def isVirtualized(self):
+        """ Get whether the layout is virtualized.
+
+        Returns
+        -------
+        result : bool
+            True if only the items in the viewport are materialized,
+            False otherwise. The default is False.
+
+        """
+        return self._virtualized
+
+    def setVirtualized(self, virtualized):
+        """ Set whether the layout is virtualized.
+
+        Parameters
+        ----------
+        virtualized : bool
+            True if only the items which intersect the viewport rect
+            should be materialized, False if all items should be.
+
+        """
+        if virtualized == self._virtualized:
+            return
+        self._virtualized = virtualized
+        self._shown.clear()
+        estimate = self._estimate if virtualized else None
+        for item in self._items:
+            item.estimate = estimate
+            item.widget().setVisible(not virtualized)
+        self._items_hint = self._items_min = None
+        self._markDirty(0)
         self.invalidate()
 
+    def viewportRect(self):
+        """ Get the viewport rect of the layout.
+
+        Returns
+        -------
+        result : QRect
+            The visible area of the layout, in the coordinates of the
+            parent widget of the layout.
+
+        """
+        return QRect(self._viewport)
+
+    def setViewportRect(self, rect):
+        """ Set the viewport rect of the layout.
+
+        If the layout is virtualized, the items which intersect the
+        new viewport are materialized and the items which no longer
+        intersect it are hidden. This only considers the lines which
+        intersect the viewport, so it is cheap enough to be called on
+        every scroll step.
+
+        Parameters
+        ----------
+        rect : QRect
+            The visible area of the layout, in the coordinates of the
+            parent widget of the layout.
+
+        """
+        self._viewport = QRect(rect)
+        if self._virtualized and self._offsets:
+            self._placeVisible()
+
     def hasHeightForWidth(self):
         """ Whether the height of the layout depends on its width.
 
@@ -807,6 +1022,8 @@ class QFlowLayout(QLayout):
         """ Get the height of the layout for the given width.
 
         This value only applies if `hasHeightForWidth` returns True.
+        The results for the most recently used widths are cached until
+        the layout is invalidated.
 
         Parameters
         ----------
@@ -814,13 +1031,17 @@ class QFlowLayout(QLayout):
             The width for which to determine a height.
 
         """
-        if self._cached_w != width:
+        cache = self._hfw_cache
+        height = cache.pop(width, None)
+        if height is None:
             left, top, right, bottom = self.getContentsMargins()
             adj_width = width - (left + right)
             height = self._doLayout(QRect(0, 0, adj_width, 0), True)
-            self._cached_hfw = height + top + bottom
-            self._cached_w = adj_width
-        return self._cached_hfw
+            height += top + bottom
+            if len(cache) >= HFW_CACHE_SIZE:
+                cache.popitem(last=False)
+        cache[width] = height
+        return height
 
     def addItem(self, item):
         """ A required virtual method implementation.
@@ -835,14 +1056,26 @@ class QFlowLayout(QLayout):
     def invalidate(self):
         """ Invalidate the cached values of the layout.
 
+        Only the items which are marked as dirty are invalidated. The
+        lines of the layout are reflowed from the first dirty item on
+        the next layout pass.
+
         """
-        self._cached_w = -1
-        self._cached_hfw = -1
+        # Showing and hiding the widgets of a virtualized layout while
+        # placing the visible items invalidates the layout. Those changes
+        # are accounted for by the placement, so they are ignored.
+        if self._placing:
+            return
+        self._hfw_cache.clear()
         self._cached_wfh = -1
-        self._cached_min = None
-        self._cached_hint = None
-        for item in self._items:
-            item.invalidate()
+        grown = self._grown
+        for idx, item in enumerate(self._items):
+            if item.data.dirty:
+                if item not in grown:
+                    self._shrinkSizes(item)
+                    grown.add(item)
+                item.invalidate()
+                self._markDirty(idx)
         super(QFlowLayout, self).invalidate()
 
     def count(self):
@@ -870,6 +1103,13 @@ class QFlowLayout(QLayout):
         if idx < len(items):
             item = items[idx]
             del items[idx]
+            if item in self._grown:
+                self._grown.discard(item)
+            else:
+                self._shrinkSizes(item)
+            self._markDirty(idx)
+            self._shown.discard(item)
+            item.estimate = None
             item.widget().hide()
             # The creation path of the layout items bypasses the virtual
             # wrapper methods, this means that the ownership of the cpp
@@ -891,42 +1131,168 @@ class QFlowLayout(QLayout):
         for the layout.
 
         """
-        if self._cached_hint is None:
-            size = QSize(0, 0)
-            for item in self._items:
-                size = size.expandedTo(item.sizeHint())
-            left, top, right, bottom = self.getContentsMargins()
-            size.setWidth(size.width() + left + right)
-            size.setHeight(size.height() + top + bottom)
-            self._cached_hint = size
-        return self._cached_hint
+        self._updateSizes()
+        size = QSize(self._items_hint)
+        left, top, right, bottom = self.getContentsMargins()
+        size.setWidth(size.width() + left + right)
+        size.setHeight(size.height() + top + bottom)
+        return size
 
     def minimumSize(self):
         """ A reimplemented method which returns the minimum size hint
         of the layout item widget as the minimum size of the window.
 
         """
-        if self._cached_min is None:
-            size = QSize(0, 0)
-            for item in self._items:
-                size = size.expandedTo(item.minimumSize())
-            left, top, right, bottom = self.getContentsMargins()
-            size.setWidth(size.width() + left + right)
-            size.setHeight(size.height() + top + bottom)
-            self._cached_min = size
+        self._updateSizes()
+        size = QSize(self._items_min)
+        left, top, right, bottom = self.getContentsMargins()
+        size.setWidth(size.width() + left + right)
+        size.setHeight(size.height() + top + bottom)
         # XXX hack! We really need hasWidthForHeight! This doesn't quite
         # work because a QScrollArea internally caches the min size.
         d = self._options.direction
         if d == self.TopToBottom or d == self.BottomToTop:
-            m = QSize(self._cached_min)
-            if m.width() < self._cached_wfh:
-                m.setWidth(self._cached_wfh)
-            return m
-        return self._cached_min
+            if size.width() < self._cached_wfh:
+                size.setWidth(self._cached_wfh)
+        return size
 
     #--------------------------------------------------------------------------
     # Private API
     #--------------------------------------------------------------------------
+    def _markDirty(self, index):
+        """ Mark the lines of the layout as dirty from an item onward.
+
+        Parameters
+        ----------
+        index : int
+            The index of the first item whose placement in the lines
+            of the layout may have changed.
+
+        """
+        dirty = self._dirty_index
+        if dirty is None or index < dirty:
+            self._dirty_index = index
+
+    def _shrinkSizes(self, item):
+        """ Account for the size of an item which is going away.
+
+        The size of the item is about to be removed from the computed
+        size hints of the layout. If the item may be the one which
+        determines a size hint, that size hint is recomputed from all
+        of the items when it is next requested.
+
+        Parameters
+        ----------
+        item : QFlowWidgetItem
+            The item which is removed or which is about to be resized.
+
+        """
+        hint = self._items_hint
+        if hint is not None:
+            size = item.sizeHint()
+            if size.width() >= hint.width() or size.height() >= hint.height():
+                self._items_hint = None
+        min_size = self._items_min
+        if min_size is not None:
+            size = item.minimumSize()
+            w = min_size.width()
+            h = min_size.height()
+            if size.width() >= w or size.height() >= h:
+                self._items_min = None
+
+    def _updateSizes(self):
+        """ Update the computed size hints of the items of the layout.
+
+        If both size hints are known, only the sizes of the items which
+        have been added or resized since the last update are merged in.
+        Otherwise, the size hints are recomputed from all of the items.
+
+        """
+        grown = self._grown
+        hint = self._items_hint
+        min_size = self._items_min
+        if hint is None or min_size is None:
+            hint = QSize(0, 0)
+            min_size = QSize(0, 0)
+            items = self._items
+        elif grown:
+            items = grown
+        else:
+            return
+        for item in items:
+            hint = hint.expandedTo(item.sizeHint())
+            min_size = min_size.expandedTo(item.minimumSize())
+        self._items_hint = hint
+        self._items_min = min_size
+        grown.clear()
+
+    def _flowLines(self, extent, line_type, persist):
+        """ Flow the items of the layout into lines.
+
+        If the extent matches the extent of the persistent lines, they
+        are reflowed from the line which holds the first dirty item. A
+        line which ends right before that item is reflowed as well,
+        since it may now be able to hold the item. The lines before it
+        are reused as-is.
+
+        Parameters
+        ----------
+        extent : int
+            The width of the rows, or the height of the columns.
+
+        line_type : type
+            The _LayoutRow or _LayoutColumn type to use for the lines.
+
+        persist : bool
+            Whether lines for a new extent should replace the persistent
+            lines of the layout. If False, lines for a new extent are
+            created without touching the persistent lines.
+
+        Returns
+        -------
+        result : list
+            The list of lines for the given extent.
+
+        """
+        if extent == self._line_extent:
+            dirty = self._dirty_index
+            if dirty is None:
+                return self._lines
+            lines = self._lines
+            starts = self._line_starts
+            idx = bisect_right(starts, dirty) - 1
+            if idx > 0 and starts[idx] == dirty:
+                idx -= 1
+            idx = max(idx, 0)
+            start = starts[idx] if idx < len(starts) else 0
+            del lines[idx:]
+            del starts[idx:]
+        elif persist:
+            lines = self._lines = []
+            starts = self._line_starts = []
+            start = 0
+        else:
+            lines = []
+            starts = []
+            start = 0
+
+        line = None
+        opts = self._options
+        items = self._items
+        for idx in xrange(start, len(items)):
+            item = items[idx]
+            if line is None or not line.add_item(item):
+                line = line_type(extent, opts)
+                line.add_item(item)
+                lines.append(line)
+                starts.append(idx)
+
+        if lines is self._lines:
+            self._line_extent = extent
+            self._dirty_index = None
+            self._offsets = []
+        return lines
+
     def _doLayout(self, rect, test=False):
         """ Perform the layout for the given rect.
 
@@ -961,21 +1327,9 @@ class QFlowLayout(QLayout):
         The method signature is identical to the `_doLayout` method.
 
         """
-        # Walk over the items and create the layout rows.
-        rows = []
-        width = rect.width()
+        # Reflow the items into the layout rows.
         opts = self._options
-        for item in self._items:
-            if len(rows) == 0:
-                row = _LayoutRow(width, opts)
-                row.add_item(item)
-                rows.append(row)
-            else:
-                row = rows[-1]
-                if not row.add_item(item):
-                    row = _LayoutRow(width, opts)
-                    row.add_item(item)
-                    rows.append(row)
+        rows = self._flowLines(rect.width(), _LayoutRow, not test)
 
         # After collecting rows all of the rows, compute the metrics. If
         # this is a test run, only the minimum height is required.
@@ -1014,13 +1368,29 @@ class QFlowLayout(QLayout):
                     row.layout_height += remaining * row.stretch / stretch
 
         # Make a final pass to layout the rows, computing the overall
-        # final layout height along the way.
+        # final layout height along the way. A virtualized layout only
+        # records the row offsets, and lays out the visible rows.
         final_height = 0
         x = rect.x()
         curr_y = rect.y()
         v_space = opts.v_spacing
+        if self._virtualized:
+            offsets = []
+            for row in rows:
+                offsets.append(curr_y)
+                d = row.layout_height + v_space
+                final_height += d
+                curr_y += d
+            self._offsets = offsets
+            self._origin = x
+            self._placeVisible()
+            return final_height
+
         for row in rows:
-            row.layout(x, curr_y)
+            placed = (x, curr_y, row.layout_height)
+            if row.placed != placed:
+                row.layout(x, curr_y)
+                row.placed = placed
             d = row.layout_height + v_space
             final_height += d
             curr_y += d
@@ -1033,21 +1403,9 @@ class QFlowLayout(QLayout):
         The method signature is identical to the `_doLayout` method.
 
         """
-        # Walk over the items and create the layout columns.
-        cols = []
-        height = rect.height()
+        # Reflow the items into the layout columns.
         opts = self._options
-        for item in self._items:
-            if len(cols) == 0:
-                col = _LayoutColumn(height, opts)
-                col.add_item(item)
-                cols.append(col)
-            else:
-                col = cols[-1]
-                if not col.add_item(item):
-                    col = _LayoutColumn(height, opts)
-                    col.add_item(item)
-                    cols.append(col)
+        cols = self._flowLines(rect.height(), _LayoutColumn, not test)
 
         # After collecting rows all of the columns, compute the metrics.
         # If this is a test run, only the minimum width is required.
@@ -1086,19 +1444,101 @@ class QFlowLayout(QLayout):
                     col.layout_width += remaining * col.stretch / stretch
 
         # Make a final pass to layout the columns, computing the overall
-        # final layout width along the way.
+        # final layout width along the way. A virtualized layout only
+        # records the column offsets, and lays out the visible columns.
         final_width = 0
         y = rect.y()
         curr_x = rect.x()
         h_space = opts.h_spacing
+        if self._virtualized:
+            offsets = []
+            for col in cols:
+                offsets.append(curr_x)
+                d = col.layout_width + h_space
+                final_width += d
+                curr_x += d
+            self._offsets = offsets
+            self._origin = y
+            self._placeVisible()
+            return final_width
+
         for col in cols:
-            col.layout(curr_x, y)
+            placed = (curr_x, y, col.layout_width)
+            if col.placed != placed:
+                col.layout(curr_x, y)
+                col.placed = placed
             d = col.layout_width + h_space
             final_width += d
             curr_x += d
 
         return final_width
 
+    def _placeVisible(self):
+        """ Place the items of a virtualized layout in the viewport.
+
+        The lines which intersect the viewport rect, extended by half
+        of its extent on either side, are found by a binary search of
+        the line offsets. The widgets of the items in those lines are
+        materialized and laid out, and the widgets of the items which
+        were previously materialized but are no longer in range are
+        hidden. If a newly measured item differs from the size which
+        was assumed for it, the layout is invalidated so that the lines
+        are recomputed with the measured size.
+
+        """
+        lines = self._lines
+        offsets = self._offsets
+        rect = self._viewport
+        horizontal = self.hasHeightForWidth()
+        if rect.isValid() and lines:
+            if horizontal:
+                start, extent = rect.y(), rect.height()
+            else:
+                start, extent = rect.x(), rect.width()
+            overscan = extent / 2
+            first = max(0, bisect_right(offsets, start - overscan) - 1)
+            last = bisect_left(offsets, start + extent + overscan)
+        else:
+            first = last = 0
+
+        visible = set()
+        for line in lines[first:last]:
+            visible.update(line.items)
+
+        shown = self._shown
+        origin = self._origin
+        estimate = self._estimate
+        changed = False
+        self._placing = True
+        try:
+            for item in shown - visible:
+                item.estimate = estimate
+                item.widget().hide()
+            for item in visible - shown:
+                measured = item.isMeasured()
+                assumed = item.sizeHint()
+                item.estimate = None
+                item.widget().show()
+                if not measured:
+                    hint = item.sizeHint()
+                    estimate.add(hint)
+                    if hint != assumed:
+                        changed = True
+            for idx in xrange(first, last):
+                line = lines[idx]
+                if horizontal:
+                    line.layout(origin, offsets[idx])
+                else:
+                    line.layout(offsets[idx], origin)
+        finally:
+            self._placing = False
+        self._shown = visible
+
+        if changed:
+            self._items_hint = self._items_min = None
+            self._markDirty(0)
+            self.invalidate()
+
 
 class _LayoutOptions(object):
     """ A private class used by QFlowLayout to store layout options.
@@ -0,0 +1,332 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from .qt.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class QWindowedItemModel(QAbstractTableModel):
+    """ A table model which only holds a window of the data of a model
+    which lives elsewhere.
+
+    The model knows the number of rows and columns of the remote model,
+    but only caches the values of the items which have been supplied
+    through `setBlock`. When a view asks for an item which is not in
+    the cache, the model invokes its fetch callback, which is expected
+    to arrange for the missing data to be supplied later.
+
+    """
+    def __init__(self, parent=None):
+        """ Initialize a QWindowedItemModel.
+
+        Parameters
+        ----------
+        parent : QObject, optional
+            The parent object of the model.
+
+        """
+        super(QWindowedItemModel, self).__init__(parent)
+        self._row_count = 0
+        self._column_count = 0
+        self._values = {}
+        self._row_headers = {}
+        self._column_headers = {}
+        self._fetch_callback = None
+
+    #--------------------------------------------------------------------------
+    # QAbstractTableModel Interface
+    #--------------------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        """ Get the number of rows of the model.
+
+        """
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        """ Get the number of columns of the model.
+
+        """
+        if parent.isValid():
+            return 0
+        return self._column_count
+
+    def data(self, index, role=Qt.DisplayRole):
+        """ Get the data for an item of the model.
+
+        Only the display role is supported. If the value of the item
+        is not cached, the fetch callback is invoked.
+
+        """
+        if role != Qt.DisplayRole:
+            return None
+        key = (index.row(), index.column())
+        values = self._values
+        if key in values:
+            return values[key]
+        callback = self._fetch_callback
+        if callback is not None:
+            callback()
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """ Get the data for a header section of the model.
+
+        Header sections whose data is not cached show their number.
+
+        """
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal:
+                headers = self._column_headers
+            else:
+                headers = self._row_headers
+            if section in headers:
+                return headers[section]
+        sup = super(QWindowedItemModel, self)
+        return sup.headerData(section, orientation, role)
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def setFetchCallback(self, callback):
+        """ Set the callback to invoke when an uncached item is read.
+
+        Parameters
+        ----------
+        callback : callable or None
+            A callable which takes no arguments. It is invoked for every
+            read of an uncached item, so it should be cheap.
+
+        """
+        self._fetch_callback = callback
+
+    def reset(self, row_count, column_count):
+        """ Reset the model to a new size and clear the cache.
+
+        Parameters
+        ----------
+        row_count : int
+            The number of rows of the remote model.
+
+        column_count : int
+            The number of columns of the remote model.
+
+        """
+        self.beginResetModel()
+        self._row_count = row_count
+        self._column_count = column_count
+        self._values.clear()
+        self._row_headers.clear()
+        self._column_headers.clear()
+        self.endResetModel()
+
+    def insertRange(self, orientation, first, last):
+        """ Insert rows or columns into the model.
+
+        The cached items after the insertion point are shifted.
+
+        Parameters
+        ----------
+        orientation : Qt.Orientation
+            Qt.Vertical to insert rows, Qt.Horizontal for columns.
+
+        first : int
+            The index of the first new row or column.
+
+        last : int
+            The index of the last new row or column.
+
+        """
+        count = last - first + 1
+        if orientation == Qt.Vertical:
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._shift(0, first, count)
+            self._row_count += count
+            self.endInsertRows()
+        else:
+            self.beginInsertColumns(QModelIndex(), first, last)
+            self._shift(1, first, count)
+            self._column_count += count
+            self.endInsertColumns()
+
+    def removeRange(self, orientation, first, last):
+        """ Remove rows or columns from the model.
+
+        The cached items of the removed range are dropped, and the
+        cached items after it are shifted.
+
+        Parameters
+        ----------
+        orientation : Qt.Orientation
+            Qt.Vertical to remove rows, Qt.Horizontal for columns.
+
+        first : int
+            The index of the first removed row or column.
+
+        last : int
+            The index of the last removed row or column.
+
+        """
+        count = last - first + 1
+        if orientation == Qt.Vertical:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._shift(0, first, -count)
+            self._row_count -= count
+            self.endRemoveRows()
+        else:
+            self.beginRemoveColumns(QModelIndex(), first, last)
+            self._shift(1, first, -count)
+            self._column_count -= count
+            self.endRemoveColumns()
+
+    def setBlock(self, rows, columns, values, row_headers, column_headers):
+        """ Store a block of data in the cache.
+
+        Parameters
+        ----------
+        rows : (int, int)
+            The first and last rows of the block.
+
+        columns : (int, int)
+            The first and last columns of the block.
+
+        values : list
+            The list of row lists of values for the block.
+
+        row_headers : list
+            The header data of the rows of the block. This may be an
+            empty list if there is no header data.
+
+        column_headers : list
+            The header data of the columns of the block. This may be
+            an empty list if there is no header data.
+
+        """
+        first_row, last_row = rows
+        first_col, last_col = columns
+        cache = self._values
+        for row, row_values in enumerate(values, first_row):
+            for col, value in enumerate(row_values, first_col):
+                cache[(row, col)] = value
+        if row_headers:
+            self._row_headers.update(enumerate(row_headers, first_row))
+            self.headerDataChanged.emit(Qt.Vertical, first_row, last_row)
+        if column_headers:
+            self._column_headers.update(enumerate(column_headers, first_col))
+            self.headerDataChanged.emit(Qt.Horizontal, first_col, last_col)
+        top_left = self.index(first_row, first_col)
+        bottom_right = self.index(last_row, last_col)
+        self.dataChanged.emit(top_left, bottom_right)
+
+    def evict(self, window):
+        """ Drop the cached data which lies outside of a window.
+
+        Parameters
+        ----------
+        window : (int, int, int, int)
+            The (first_row, last_row, first_column, last_column) of the
+            window of data to keep.
+
+        """
+        first_row, last_row, first_col, last_col = window
+        values = self._values
+        for key in values.keys():
+            row, col = key
+            if not (first_row <= row <= last_row and
+                    first_col <= col <= last_col):
+                del values[key]
+        headers = self._row_headers
+        for row in headers.keys():
+            if not first_row <= row <= last_row:
+                del headers[row]
+        headers = self._column_headers
+        for col in headers.keys():
+            if not first_col <= col <= last_col:
+                del headers[col]
+
+    def missingRanges(self, window):
+        """ Compute the ranges of a window which are not cached.
+
+        Parameters
+        ----------
+        window : (int, int, int, int)
+            The (first_row, last_row, first_column, last_column) of the
+            window of data of interest.
+
+        Returns
+        -------
+        result : list
+            The list of (first_row, last_row, first_column, last_column)
+            ranges which cover the missing items of the window. Each
+            range spans the columns of the window, and covers a run of
+            consecutive rows which have at least one missing item.
+
+        """
+        first_row, last_row, first_col, last_col = window
+        values = self._values
+        columns = range(first_col, last_col + 1)
+        ranges = []
+        start = None
+        for row in xrange(first_row, last_row + 1):
+            missing = False
+            for col in columns:
+                if (row, col) not in values:
+                    missing = True
+                    break
+            if missing:
+                if start is None:
+                    start = row
+            elif start is not None:
+                ranges.append((start, row - 1, first_col, last_col))
+                start = None
+        if start is not None:
+            ranges.append((start, last_row, first_col, last_col))
+        return ranges
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _shift(self, axis, first, delta):
+        """ Shift the cached data along an axis.
+
+        Parameters
+        ----------
+        axis : int
+            0 to shift rows, 1 to shift columns.
+
+        first : int
+            The first row or column to shift.
+
+        delta : int
+            The number of positions to shift by. If this is negative,
+            the data of the rows or columns in [first, first - delta)
+            is dropped.
+
+        """
+        last_removed = first - delta if delta < 0 else first
+        shifted = {}
+        for key, value in self._values.iteritems():
+            pos = key[axis]
+            if pos < first:
+                shifted[key] = value
+            elif pos >= last_removed:
+                if axis == 0:
+                    shifted[(pos + delta, key[1])] = value
+                else:
+                    shifted[(key[0], pos + delta)] = value
+        self._values = shifted
+        if axis == 0:
+            headers = self._row_headers
+        else:
+            headers = self._column_headers
+        shifted = {}
+        for pos, value in headers.iteritems():
+            if pos < first:
+                shifted[pos] = value
+            elif pos >= last_removed:
+                shifted[pos + delta] = value
+        if axis == 0:
+            self._row_headers = shifted
+        else:
+            self._column_headers = shifted
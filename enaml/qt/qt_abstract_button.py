@@ -137,9 +137,11 @@ class QtAbstractButton(QtControl):
 
         """
         if icon_source:
-            loader = self._session.load_resource(icon_source)
+            owner = (self.object_id(), 'icon')
+            loader = self._session.load_resource(icon_source, owner=owner)
             loader.on_load(self._on_icon_load)
         else:
+            self._session.release_resource(self.object_id(), 'icon')
             self._on_icon_load(QIcon())
 
     def set_icon_size(self, icon_size):
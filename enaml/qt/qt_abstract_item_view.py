@@ -0,0 +1,249 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from .qt.QtCore import Qt
+from .q_deferred_caller import deferredCall
+from .q_windowed_item_model import QWindowedItemModel
+from .qt_control import QtControl
+
+
+class QtAbstractItemView(QtControl):
+    """ A base class for the Qt implementations of Enaml item views.
+
+    The client keeps a QWindowedItemModel which caches the items of the
+    visible window of the view, plus the prefetch margin. Whenever the
+    view scrolls or reads an uncached item, a fetch is scheduled for the
+    next cycle of the event loop. The fetch drops the cached items which
+    are outside of the new window, and requests the missing parts of the
+    window from the server with a single 'request_data' action.
+
+    Subclasses must implement the `create_widget` and `visible_window`
+    methods.
+
+    """
+    #: The number of rows to fetch beyond the visible rows.
+    _prefetch_rows = 0
+
+    #: The number of columns to fetch beyond the visible columns.
+    _prefetch_columns = 0
+
+    #: Whether a fetch has been scheduled but not yet executed.
+    _fetch_pending = False
+
+    #: The ranges which have been requested and not yet received.
+    _in_flight = ()
+
+    #: The window which was last reported to the server.
+    _sent_window = None
+
+    #--------------------------------------------------------------------------
+    # Setup Methods
+    #--------------------------------------------------------------------------
+    def create(self, tree):
+        """ Create and initialize the underlying widget.
+
+        """
+        super(QtAbstractItemView, self).create(tree)
+        self._in_flight = []
+        model = QWindowedItemModel(self.widget())
+        model.reset(tree['row_count'], tree['column_count'])
+        model.setFetchCallback(self.schedule_fetch)
+        self._model = model
+        self.set_prefetch_rows(tree['prefetch_rows'])
+        self.set_prefetch_columns(tree['prefetch_columns'])
+        widget = self.widget()
+        widget.setModel(model)
+        widget.horizontalScrollBar().valueChanged.connect(self.schedule_fetch)
+        widget.verticalScrollBar().valueChanged.connect(self.schedule_fetch)
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def visible_window(self):
+        """ Get the window of the model which is visible in the view.
+
+        This method must be implemented by subclasses.
+
+        Returns
+        -------
+        result : (int, int, int, int) or None
+            The (first_row, last_row, first_column, last_column) of the
+            visible items, or None if no items are visible.
+
+        """
+        raise NotImplementedError
+
+    def schedule_fetch(self, *args):
+        """ Schedule a fetch of the visible window of the model.
+
+        Multiple calls in the same cycle of the event loop are collapsed
+        into a single fetch.
+
+        """
+        if not self._fetch_pending:
+            self._fetch_pending = True
+            deferredCall(self.fetch)
+
+    def fetch(self):
+        """ Fetch the missing data of the visible window of the model.
+
+        """
+        self._fetch_pending = False
+        window = self.visible_window()
+        if window is None:
+            return
+        model = self._model
+        first_row, last_row, first_col, last_col = window
+        prows = self._prefetch_rows
+        pcols = self._prefetch_columns
+        window = (
+            max(first_row - prows, 0),
+            min(last_row + prows, model.rowCount() - 1),
+            max(first_col - pcols, 0),
+            min(last_col + pcols, model.columnCount() - 1),
+        )
+        if window[0] > window[1] or window[2] > window[3]:
+            return
+        model.evict(window)
+        in_flight = self._in_flight
+        ranges = [
+            rng for rng in model.missingRanges(window)
+            if not self._is_in_flight(rng)
+        ]
+        # The window is reported even when nothing is missing, so that
+        # the server pushes the changes which fall inside of it.
+        if ranges or window != self._sent_window:
+            in_flight.extend(ranges)
+            self._sent_window = window
+            content = {'window': window, 'ranges': ranges}
+            self.send_action('request_data', content)
+
+    #--------------------------------------------------------------------------
+    # Message Handling
+    #--------------------------------------------------------------------------
+    def on_action_data(self, content):
+        """ Handle the 'data' action from the Enaml widget.
+
+        """
+        model = self._model
+        in_flight = self._in_flight
+        for block in content['blocks']:
+            rows = tuple(block['rows'])
+            columns = tuple(block['columns'])
+            model.setBlock(
+                rows, columns, block['values'], block['row_headers'],
+                block['column_headers'],
+            )
+            rng = rows + columns
+            if rng in in_flight:
+                in_flight.remove(rng)
+
+    def on_action_reset(self, content):
+        """ Handle the 'reset' action from the Enaml widget.
+
+        """
+        del self._in_flight[:]
+        self._sent_window = None
+        self._model.reset(content['row_count'], content['column_count'])
+        self.schedule_fetch()
+
+    def on_action_rows_inserted(self, content):
+        """ Handle the 'rows_inserted' action from the Enaml widget.
+
+        """
+        self._update_range(Qt.Vertical, True, content)
+
+    def on_action_rows_removed(self, content):
+        """ Handle the 'rows_removed' action from the Enaml widget.
+
+        """
+        self._update_range(Qt.Vertical, False, content)
+
+    def on_action_columns_inserted(self, content):
+        """ Handle the 'columns_inserted' action from the Enaml widget.
+
+        """
+        self._update_range(Qt.Horizontal, True, content)
+
+    def on_action_columns_removed(self, content):
+        """ Handle the 'columns_removed' action from the Enaml widget.
+
+        """
+        self._update_range(Qt.Horizontal, False, content)
+
+    def on_action_set_prefetch_rows(self, content):
+        """ Handle the 'set_prefetch_rows' action from the Enaml widget.
+
+        """
+        self.set_prefetch_rows(content['prefetch_rows'])
+
+    def on_action_set_prefetch_columns(self, content):
+        """ Handle the 'set_prefetch_columns' action from the Enaml
+        widget.
+
+        """
+        self.set_prefetch_columns(content['prefetch_columns'])
+
+    #--------------------------------------------------------------------------
+    # Widget Update Methods
+    #--------------------------------------------------------------------------
+    def set_prefetch_rows(self, rows):
+        """ Set the number of rows to fetch beyond the visible rows.
+
+        """
+        self._prefetch_rows = rows
+
+    def set_prefetch_columns(self, columns):
+        """ Set the number of columns to fetch beyond the visible
+        columns.
+
+        """
+        self._prefetch_columns = columns
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _is_in_flight(self, rng):
+        """ Get whether a range is covered by a pending request.
+
+        """
+        first_row, last_row, first_col, last_col = rng
+        for other in self._in_flight:
+            if (other[0] <= first_row and last_row <= other[1] and
+                other[2] <= first_col and last_col <= other[3]):
+                return True
+        return False
+
+    def _update_range(self, orientation, inserted, content):
+        """ Apply a structural change of the model.
+
+        Parameters
+        ----------
+        orientation : Qt.Orientation
+            Qt.Vertical for a change of the rows, Qt.Horizontal for a
+            change of the columns.
+
+        inserted : bool
+            True if the range was inserted, False if it was removed.
+
+        content : dict
+            The content of the action, with the 'first' and 'last'
+            index of the range and the new 'row_count' and
+            'column_count' of the model.
+
+        """
+        # The positions of the pending requests are stale. Their replies
+        # are still applied, since the server computes them against the
+        # updated model.
+        del self._in_flight[:]
+        self._sent_window = None
+        model = self._model
+        if inserted:
+            model.insertRange(orientation, content['first'], content['last'])
+        else:
+            model.removeRange(orientation, content['first'], content['last'])
+        counts = (content['row_count'], content['column_count'])
+        if counts != (model.rowCount(), model.columnCount()):
+            model.reset(*counts)
+        self.schedule_fetch()
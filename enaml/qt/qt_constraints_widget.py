@@ -3,6 +3,7 @@
 #  All rights reserved.
 #------------------------------------------------------------------------------
 from contextlib import contextmanager
+from time import time
 
 from casuarius import ConstraintVariable
 
@@ -95,9 +96,9 @@ class QtConstraintsWidget(QtWidget):
     #: be called to trigger an appropriate relayout of the widget.
     _size_hint_cns = []
 
-    #: The list of constraint dictionaries defined by the user on
-    #: the server side Enaml widget.
-    _user_cns = []
+    #: The flat constraint info dict defined by the user on the
+    #: server side Enaml widget.
+    _user_cns = {}
 
     #--------------------------------------------------------------------------
     # Setup Methods
@@ -125,8 +126,11 @@ class QtConstraintsWidget(QtWidget):
         self._hug = content['hug']
         self._resist = content['resist']
         self._user_cns = content['constraints']
+        start = time()
         self.clear_size_hint_constraints()
         self.relayout()
+        causes = content.get('causes', ())
+        self._session.record_relayout(self, causes, time() - start)
 
     #--------------------------------------------------------------------------
     # Layout Handling
@@ -169,6 +173,31 @@ class QtConstraintsWidget(QtWidget):
         if isinstance(parent, QtConstraintsWidget):
             parent.replace_constraints(old_cns, new_cns)
 
+    def defer_replace_constraints(self, old_cns, new_cns):
+        """ Replace constraints in the current layout system at the end
+        of the current event loop tick.
+
+        The default behavior of this method is to proxy the call up the
+        tree of ancestors until it is either handled by a subclass which
+        has reimplemented this method (see QtContainer), or the ancestor
+        is not an instance of QtConstraintsWidget, at which point the
+        request is dropped.
+
+        Parameters
+        ----------
+        old_cns : list
+            The list of casuarius constraints to remove from the
+            current layout system.
+
+        new_cns : list
+            The list of casuarius constraints to add to the
+            current layout system.
+
+        """
+        parent = self.parent()
+        if isinstance(parent, QtConstraintsWidget):
+            parent.defer_replace_constraints(old_cns, new_cns)
+
     def clear_constraints(self, cns):
         """ Clear the given constraints from the current layout system.
 
@@ -247,7 +276,7 @@ class QtConstraintsWidget(QtWidget):
             old_cns = self._size_hint_cns
             self._size_hint_cns = []
             new_cns = self.size_hint_constraints()
-            parent.replace_constraints(old_cns, new_cns)
+            parent.defer_replace_constraints(old_cns, new_cns)
 
     def clear_size_hint_constraints(self):
         """ Clear the size hint constraints from the layout system.
@@ -287,16 +316,17 @@ class QtConstraintsWidget(QtWidget):
         return cns
 
     def user_constraints(self):
-        """ Get the list of user constraints defined for this widget.
+        """ Get the user constraints defined for this widget.
 
-        The default implementation returns the list of constraint
-        information sent by the server.
+        The default implementation returns the flat constraint info
+        sent by the server.
 
         Returns
         -------
-        result : list
-            The list of dictionaries which represent the user defined
-            linear constraints.
+        result : dict
+            A dictionary with a 'variables' table and a list of flat
+            'constraints' which represent the user defined linear
+            constraints.
 
         """
         return self._user_cns
@@ -336,21 +366,49 @@ class QtConstraintsWidget(QtWidget):
         # The previous version of this method, `update_layout_geometry`,
         # was 5x slower. This is explicitly not idiomatic Python code.
         # It exists purely for the sake of efficiency, justified with
-        # profiling.
+        # profiling. Since the call to setGeometry dominates, the last
+        # applied integer geometry is cached and the call (along with
+        # the QRect allocation) is skipped if the geometry is unchanged.
         primitive = self.layout_box.primitive
         x = primitive('left')
         y = primitive('top')
         width = primitive('width')
         height = primitive('height')
-        setgeo = self.widget_item().setGeometry
+        item = self.widget_item()
+        setgeo = item.setGeometry
+        isempty = item.isEmpty
         rect = QRect
+        last = [None]
+        applied = [0]
+        skipped = [0]
         def update_geometry(dx, dy):
             nx = x.value
             ny = y.value
-            setgeo(rect(nx - dx, ny - dy, width.value, height.value))
+            geo = (int(nx - dx), int(ny - dy), int(width.value),
+                   int(height.value))
+            if geo != last[0]:
+                setgeo(rect(*geo))
+                applied[0] += 1
+                # A QWidgetItem ignores the geometry of a hidden widget,
+                # so the geometry is only cached if it was applied.
+                if not isempty():
+                    last[0] = geo
+            else:
+                skipped[0] += 1
             return nx, ny
+        def apply_geometry(geo):
+            setgeo(rect(*geo))
+            if not isempty():
+                last[0] = geo
         # Store a reference to self on the updater, so that the layout
         # container can know the object on which the updater operates.
+        # The one element lists of applied and skipped updates and of
+        # the last applied geometry are stored as well, along with a
+        # function which applies a known geometry without a solve.
         update_geometry.item = self
+        update_geometry.applied = applied
+        update_geometry.skipped = skipped
+        update_geometry.last = last
+        update_geometry.apply = apply_geometry
         return update_geometry
 
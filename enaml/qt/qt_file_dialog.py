@@ -3,7 +3,8 @@
 #  All rights reserved.
 #------------------------------------------------------------------------------
 from .qt import qt_api
-from .qt.QtGui import QFileDialog
+from .qt.QtCore import Qt
+from .qt.QtGui import QCompleter, QFileDialog, QLineEdit, QStringListModel
 from .qt_object import QtObject
 
 
@@ -29,6 +30,13 @@ class QtFileDialog(QtObject):
     """ A Qt implementation of an Enaml FileDialog.
 
     """
+    #: The file name edit of the open non-native dialog whose text is
+    #: completed from the file index of the Enaml widget.
+    _search_edit = None
+
+    #: The completer which shows the results of the index searches.
+    _search_completer = None
+
     #--------------------------------------------------------------------------
     # Setup Methods
     #--------------------------------------------------------------------------
@@ -55,6 +63,34 @@ class QtFileDialog(QtObject):
             result = self._open_non_native(content)
         self.send_action('closed', result)
 
+    def on_action_search_results(self, content):
+        """ Handle the 'search_results' action from the Enaml widget.
+
+        The results are dropped if the dialog has been closed or the
+        text has been edited since the search was sent.
+
+        """
+        edit = self._search_edit
+        if edit is None or edit.text() != content['text']:
+            return
+        completer = self._search_completer
+        completer.model().setStringList(content['paths'])
+        completer.complete()
+
+    #--------------------------------------------------------------------------
+    # Signal Handlers
+    #--------------------------------------------------------------------------
+    def on_search_text_edited(self, text):
+        """ Handle the 'textEdited' signal of the file name edit.
+
+        A search is sent for a typed name of two or more characters
+        which is not a path.
+
+        """
+        if len(text) < 2 or '/' in text or '\\' in text:
+            return
+        self.send_action('search', {'text': text})
+
     #--------------------------------------------------------------------------
     # Private API
     #--------------------------------------------------------------------------
@@ -155,8 +191,16 @@ class QtFileDialog(QtObject):
         dlg.setNameFilters(filters)
         dlg.selectNameFilter(selected_filter)
 
+        if content.get('search'):
+            self._setup_search(dlg)
+
         result = {}
-        if dlg.exec_():
+        try:
+            accepted = dlg.exec_()
+        finally:
+            self._search_edit = None
+            self._search_completer = None
+        if accepted:
             result['result'] = 'accepted'
             result['paths'] = dlg.selectedFiles()
             result['selected_filter'] = dlg.selectedNameFilter()
@@ -165,3 +209,19 @@ class QtFileDialog(QtObject):
 
         return result
 
+    def _setup_search(self, dlg):
+        """ Complete the file name edit of a non-native dialog from the
+        searches of the file index.
+
+        """
+        edit = dlg.findChild(QLineEdit, 'fileNameEdit')
+        if edit is None:
+            return
+        completer = QCompleter(dlg)
+        completer.setModel(QStringListModel(completer))
+        completer.setCaseSensitivity(Qt.CaseInsensitive)
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        edit.setCompleter(completer)
+        edit.textEdited.connect(self.on_search_text_edited)
+        self._search_edit = edit
+        self._search_completer = completer
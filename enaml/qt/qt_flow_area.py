@@ -2,6 +2,7 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
+from .qt.QtCore import QRect
 from .qt.QtGui import QScrollArea, QFrame
 from .qt_constraints_widget import QtConstraintsWidget
 from .qt_flow_item import QtFlowItem
@@ -43,6 +44,8 @@ class QFlowArea(QScrollArea):
         self._widget.setLayout(self._layout)
         self.setWidgetResizable(True)
         self.setWidget(self._widget)
+        self.horizontalScrollBar().valueChanged.connect(self._onScrolled)
+        self.verticalScrollBar().valueChanged.connect(self._onScrolled)
 
     def layout(self):
         """ Get the layout for this flow area.
@@ -65,6 +68,38 @@ class QFlowArea(QScrollArea):
         """
         raise TypeError("Cannot set layout on a QFlowArea.")
 
+    def resizeEvent(self, event):
+        """ A reimplemented resize event handler.
+
+        This handler updates the viewport rect of the flow layout.
+
+        """
+        super(QFlowArea, self).resizeEvent(event)
+        self._updateViewportRect()
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _onScrolled(self, value):
+        """ Handle the 'valueChanged' signal of the scroll bars.
+
+        """
+        self._updateViewportRect()
+
+    def _updateViewportRect(self):
+        """ Update the viewport rect of the flow layout.
+
+        The viewport rect is the visible area of the flow widget in
+        the coordinates of the flow widget.
+
+        """
+        widget = self._widget
+        viewport = self.viewport()
+        rect = QRect(
+            -widget.x(), -widget.y(), viewport.width(), viewport.height()
+        )
+        self._layout.setViewportRect(rect)
+
 
 class QtFlowArea(QtConstraintsWidget):
     """ A Qt implementation of an Enaml FlowArea.
@@ -89,6 +124,7 @@ class QtFlowArea(QtConstraintsWidget):
         self.set_horizontal_spacing(tree['horizontal_spacing'])
         self.set_vertical_spacing(tree['vertical_spacing'])
         self.set_margins(tree['margins'])
+        self.set_virtualized(tree['virtualized'])
 
     def init_layout(self):
         """ Initialize the layout for the underlying control.
@@ -153,6 +189,12 @@ class QtFlowArea(QtConstraintsWidget):
         """
         self.set_margins(content['margins'])
 
+    def on_action_set_virtualized(self, content):
+        """ Handle the 'set_virtualized' action from the Enaml widget.
+
+        """
+        self.set_virtualized(content['virtualized'])
+
     #--------------------------------------------------------------------------
     # Widget Update Methods
     #--------------------------------------------------------------------------
@@ -187,6 +229,12 @@ class QtFlowArea(QtConstraintsWidget):
         top, right, bottom, left = margins
         self.widget().layout().setContentsMargins(left, top, right, bottom)
 
+    def set_virtualized(self, virtualized):
+        """ Set whether the underlying control is virtualized.
+
+        """
+        self.widget().layout().setVirtualized(virtualized)
+
     #--------------------------------------------------------------------------
     # Overrides
     #--------------------------------------------------------------------------
@@ -293,9 +293,11 @@ class QtImageView(QtControl):
 
         """
         if source:
-            loader = self._session.load_resource(source)
+            owner = (self.object_id(), 'image')
+            loader = self._session.load_resource(source, owner=owner)
             loader.on_load(self._on_image_load)
         else:
+            self._session.release_resource(self.object_id(), 'image')
             self._on_image_load(QImage())
 
     #--------------------------------------------------------------------------
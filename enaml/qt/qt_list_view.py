@@ -0,0 +1,47 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from .qt.QtCore import QPoint
+from .qt.QtGui import QListView
+from .qt_abstract_item_view import QtAbstractItemView
+
+
+class QtListView(QtAbstractItemView):
+    """ A Qt implementation of an Enaml ListView.
+
+    """
+    #--------------------------------------------------------------------------
+    # Setup Methods
+    #--------------------------------------------------------------------------
+    def create_widget(self, parent, tree):
+        """ Create the underlying list view widget.
+
+        """
+        widget = QListView(parent)
+        # Uniform item sizes keep the view from measuring every row of
+        # the model, which would read every item of a large model.
+        widget.setUniformItemSizes(True)
+        return widget
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def visible_window(self):
+        """ Get the window of the model which is visible in the view.
+
+        """
+        widget = self.widget()
+        count = widget.model().rowCount()
+        if count == 0:
+            return None
+        viewport = widget.viewport()
+        first = widget.indexAt(QPoint(1, 1)).row()
+        if first == -1:
+            first = 0
+        last = widget.indexAt(QPoint(1, viewport.height() - 2)).row()
+        if last == -1:
+            height = max(widget.sizeHintForRow(first), 1)
+            last = min(first + viewport.height() / height, count - 1)
+        return (first, last, 0, 0)
+
@@ -35,9 +35,14 @@ def convert_from_Image(image):
     Returns
     -------
     result : QImage
-        The QImage instance for the given Enaml image dict.
+        The QImage instance for the given Enaml image dict. If the
+        dict was passed through `decode_images`, the decoded image is
+        returned.
 
     """
+    qimage = image.get('qimage')
+    if qimage is not None:
+        return qimage
     format = image['format']
     if format == 'auto':
         format = ''
@@ -96,3 +101,67 @@ def convert_resource(resource):
             return
     return handler(resource)
 
+
+def decode_images(resource):
+    """ Decode the image data held by a resource dict.
+
+    Decoding the data into a QImage is the expensive part of converting
+    an image resource, and unlike the creation of a QPixmap or a QIcon
+    it is safe to do on a worker thread. This function can be called
+    from any thread.
+
+    Parameters
+    ----------
+    resource : dict
+        A dictionary representation of an Enaml resource.
+
+    Returns
+    -------
+    result : dict
+        A copy of the resource dict in which each image dict carries
+        its decoded 'qimage'. The result is given to `convert_resource`
+        on the main thread.
+
+    """
+    if resource.get('class') == 'Image':
+        decoded = dict(resource)
+        decoded['qimage'] = convert_from_Image(resource)
+        return decoded
+    decoded = {}
+    for key, value in resource.iteritems():
+        if isinstance(value, dict):
+            value = decode_images(value)
+        elif isinstance(value, list):
+            value = [
+                decode_images(item) if isinstance(item, dict) else item
+                for item in value
+            ]
+        decoded[key] = value
+    return decoded
+
+
+def resource_nbytes(handle):
+    """ Get the approximate memory size of a Qt resource handle.
+
+    Parameters
+    ----------
+    handle : QImage or QIcon
+        The resource handle.
+
+    Returns
+    -------
+    result : int
+        The size of the pixel data of the handle, in bytes. An icon is
+        counted as 32 bits per pixel for each of its sizes.
+
+    """
+    if isinstance(handle, QImage):
+        return handle.width() * handle.height() * handle.depth() // 8
+    if isinstance(handle, QIcon):
+        total = 0
+        for mode in _ICON_MODE_MAP.itervalues():
+            for state in _ICON_STATE_MAP.itervalues():
+                for size in handle.availableSizes(mode, state):
+                    total += size.width() * size.height() * 4
+        return total
+    return 0
@@ -2,13 +2,17 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
+from collections import OrderedDict
 import logging
+from multiprocessing.pool import ThreadPool
+from threading import Lock
 from urlparse import urlparse
 
+from enaml.resource_cache import snapshot_nbytes
 from enaml.utils import id_generator
 
 from .q_deferred_caller import deferredCall
-from .qt_resource import convert_resource
+from .qt_resource import convert_resource, decode_images, resource_nbytes
 
 
 logger = logging.getLogger(__name__)
@@ -71,18 +75,181 @@ class DeferredResource(object):
         self._callback = callback
 
 
+class QtResourceStore(object):
+    """ A process-wide store of the resource handles which carry an
+    entity tag.
+
+    The store outlives the sessions of a client process. When a session
+    requests a resource which is in the store, it sends the tag of the
+    stored handle so that the server can confirm that it is unchanged
+    with a 'not_modified' reply instead of sending the data again. The
+    store is bounded by an approximate byte budget.
+
+    """
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        """ Initialize a QtResourceStore.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            The byte budget of the stored handles. The default is 32MB.
+
+        """
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._num_bytes = 0
+
+    def lookup(self, key):
+        """ Get the (etag, handle) stored for a key, or None.
+
+        """
+        item = self._items.pop(key, None)
+        if item is None:
+            return None
+        self._items[key] = item
+        return item[:2]
+
+    def store(self, key, etag, handle, size):
+        """ Store the handle of a resource with its entity tag.
+
+        """
+        items = self._items
+        old = items.pop(key, None)
+        if old is not None:
+            self._num_bytes -= old[2]
+        if size > self.max_bytes:
+            return
+        items[key] = (etag, handle, size)
+        self._num_bytes += size
+        while self._num_bytes > self.max_bytes:
+            ignored, item = items.popitem(last=False)
+            self._num_bytes -= item[2]
+
+
+#: The store shared by the resource managers of the client sessions.
+shared_store = QtResourceStore()
+
+
+def _decode(resource):
+    """ Decode a resource dict on a worker thread, or return None.
+
+    """
+    try:
+        return decode_images(resource)
+    except Exception:
+        logger.exception('failed to decode resource')
+
+
+class QtResourceDecoder(object):
+    """ A pool of worker threads which decode the image data of resource
+    dicts off the main thread.
+
+    """
+    def __init__(self, threads=2):
+        """ Initialize a QtResourceDecoder.
+
+        Parameters
+        ----------
+        threads : int, optional
+            The number of worker threads. The default is 2. The threads
+            are started on the first decode.
+
+        """
+        self._threads = threads
+        self._pool = None
+        self._lock = Lock()
+
+    def decode(self, resource, callback):
+        """ Decode the images of a resource dict on a worker thread.
+
+        Parameters
+        ----------
+        resource : dict
+            The dictionary representation of the resource.
+
+        callback : callable
+            A callable which is invoked on the main thread with the
+            result of `decode_images` for the resource, or with None
+            if the decoding raised an exception.
+
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPool(self._threads)
+            pool = self._pool
+        pool.apply_async(
+            _decode, (resource,),
+            callback=lambda decoded: deferredCall(callback, decoded),
+        )
+
+    def close(self):
+        """ Stop the worker threads once the pending decodes are done.
+
+        """
+        with self._lock:
+            pool = self._pool
+            self._pool = None
+        if pool is not None:
+            pool.close()
+
+
+#: The decoder shared by the resource managers of the client sessions.
+shared_decoder = QtResourceDecoder()
+
+
 class QtResourceManager(object):
     """ An object which manages requesting urls from the server session.
 
+    The loaded resource handles are cached by url and metadata. The
+    cache is bounded by an approximate byte budget: when the handles
+    exceed it, the least recently used ones are evicted. A handle which
+    is pinned by an owner, typically a widget which displays it, is
+    never evicted.
+
     """
-    def __init__(self):
+    def __init__(self, max_bytes=64 * 1024 * 1024, store=None,
+                 decoder=None, decode_threshold=64 * 1024):
         """ Initialize a QtResourceManager.
 
+        Parameters
+        ----------
+        max_bytes : int, optional
+            The byte budget of the cached handles. The default is 64MB.
+
+        store : QtResourceStore, optional
+            The store of tagged handles used to revalidate resources
+            with the server. The default is the process-wide store.
+
+        decoder : QtResourceDecoder, optional
+            The decoder used for the resources of which the data is at
+            least `decode_threshold` bytes. The default is the process
+            wide decoder.
+
+        decode_threshold : int or None, optional
+            The size of the data of a loaded resource from which it is
+            decoded on a worker thread instead of the main thread. The
+            default is 64KB. None decodes every resource on the main
+            thread.
+
         """
-        self._handles = {}
+        self._max_bytes = max_bytes
+        self._store = store if store is not None else shared_store
+        self._decoder = decoder if decoder is not None else shared_decoder
+        self._decode_threshold = decode_threshold
+        self._decodes = 0
+        self._held = {}
+        self._revalidated = 0
+        self._handles = OrderedDict()
+        self._sizes = {}
+        self._num_bytes = 0
+        self._pins = {}
+        self._owners = {}
         self._pending = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
 
-    def load(self, url, metadata, request):
+    def load(self, url, metadata, request, owner=None):
         """ Load the resource handle for the given url.
 
         This method will asynchronously load the resource for the given
@@ -102,6 +269,11 @@ class QtResourceManager(object):
             An URLRequest instance to use for making requests from the
             server side session, if such requests are required.
 
+        owner : tuple, optional
+            An (object_id, slot) tuple which pins the resource in the
+            cache until the owner loads another resource in the same
+            slot or is released.
+
         Returns
         -------
         result : DeferredResource
@@ -115,13 +287,21 @@ class QtResourceManager(object):
         if key_handler is None:
             msg = 'unhandled request scheme for url: `%s`'
             logger.error(msg % url)
+            if owner is not None:
+                self.release(*owner)
             return loader
         keyval = key_handler(metadata)
         key = (url, keyval)
+        if owner is not None:
+            self._pin(owner, key)
         handles = self._handles
         if key in handles:
-            deferredCall(loader._notify, handles[key])
+            self._hits += 1
+            handle = handles.pop(key)
+            handles[key] = handle
+            deferredCall(loader._notify, handle)
             return loader
+        self._misses += 1
         pending = self._pending
         if key in pending:
             pending[key].append(loader)
@@ -129,14 +309,88 @@ class QtResourceManager(object):
         req_id = req_id_generator.next()
         pending[req_id] = key
         pending[key] = [loader]
-        request(req_id, url, metadata)
+        stored = self._store.lookup(key)
+        if stored is not None:
+            etag, self._held[req_id] = stored
+            request(req_id, url, metadata, etag)
+        else:
+            request(req_id, url, metadata)
         return loader
 
-    def on_load(self, req_id, url, resource):
+    def release(self, object_id, slot=None):
+        """ Release the resources pinned by an owner.
+
+        Parameters
+        ----------
+        object_id : str
+            The object id of the owner.
+
+        slot : str, optional
+            The slot to release. The default releases all the slots of
+            the object.
+
+        """
+        slots = self._owners.get(object_id)
+        if not slots:
+            return
+        if slot is None:
+            keys = slots.values()
+            del self._owners[object_id]
+        elif slot in slots:
+            keys = [slots.pop(slot)]
+            if not slots:
+                del self._owners[object_id]
+        else:
+            return
+        for key in keys:
+            self._unpin(key)
+        self._evict()
+
+    def set_max_bytes(self, max_bytes):
+        """ Set the byte budget of the cached handles.
+
+        Unpinned handles are evicted immediately to meet a smaller
+        budget.
+
+        """
+        self._max_bytes = max_bytes
+        self._evict()
+
+    def stats(self):
+        """ Get the statistics of the resource cache.
+
+        Returns
+        -------
+        result : dict
+            A dict with the 'hits' and 'misses' of the loads, the
+            number of 'evictions', the number of misses 'revalidated'
+            by the server without a transfer, the number of resources
+            'decoded_async' on a worker thread, the number of cached
+            'handles', the 'num_bytes' and 'pinned_bytes' of the cached
+            handles, and the 'max_bytes' budget.
+
+        """
+        sizes = self._sizes
+        pinned = sum(sizes.get(key, 0) for key in self._pins)
+        stats = {}
+        stats['hits'] = self._hits
+        stats['misses'] = self._misses
+        stats['evictions'] = self._evictions
+        stats['revalidated'] = self._revalidated
+        stats['decoded_async'] = self._decodes
+        stats['handles'] = len(self._handles)
+        stats['num_bytes'] = self._num_bytes
+        stats['pinned_bytes'] = pinned
+        stats['max_bytes'] = self._max_bytes
+        return stats
+
+    def on_load(self, req_id, url, resource, etag=None):
         """ Handle the loading of a requested resource.
 
         This method is called by the QtSession object when it receives
-        a reply for a previously requested resource.
+        a reply for a previously requested resource. A resource with a
+        large payload is decoded on a worker thread; the loaders are
+        then notified on a later cycle of the event loop.
 
         Parameters
         ----------
@@ -149,19 +403,49 @@ class QtResourceManager(object):
         resource : dict
             The dictionary representation of the loaded resource.
 
+        etag : str, optional
+            The entity tag of the resource, if the server sent one.
+
         """
         pending = self._pending
         if req_id in pending:
+            self._held.pop(req_id, None)
             key = pending.pop(req_id)
-            if key in pending:
-                loaders = pending.pop(key)
+            threshold = self._decode_threshold
+            if (threshold is not None and
+                    snapshot_nbytes(resource) >= threshold):
+                self._decodes += 1
+                self._decoder.decode(
+                    resource,
+                    lambda decoded: self._on_decoded(key, decoded, etag),
+                )
             else:
-                loaders = ()
-            qt_resource = convert_resource(resource)
-            if qt_resource is not None:
-                self._handles[key] = qt_resource
-                for loader in loaders:
-                    loader._notify(qt_resource)
+                self._on_decoded(key, resource, etag)
+
+    def on_not_modified(self, req_id, url):
+        """ Handle the revalidation of a requested resource.
+
+        This method is called by the QtSession object when the server
+        replies that the tagged handle which was sent with the request
+        is still current.
+
+        Parameters
+        ----------
+        req_id : str
+            The unique identifier for the request.
+
+        url : str
+            The resource url which was requested.
+
+        """
+        pending = self._pending
+        if req_id in pending:
+            key = pending.pop(req_id)
+            handle = self._held.pop(req_id, None)
+            if handle is not None:
+                self._revalidated += 1
+                self._add_handle(key, handle)
+            self._finish(key, handle)
 
     def on_fail(self, req_id, url):
         """ Handle the failed loading of a requested resource.
@@ -185,6 +469,7 @@ class QtResourceManager(object):
         # TODO use something like a failed-to-load image here?
         pending = self._pending
         if req_id in pending:
+            self._held.pop(req_id, None)
             key = pending.pop(req_id)
             if key in pending:
                 del pending[key]
@@ -192,6 +477,86 @@ class QtResourceManager(object):
     #--------------------------------------------------------------------------
     # Private API
     #--------------------------------------------------------------------------
+    def _add_handle(self, key, handle):
+        """ Add a loaded handle to the cache and return its size.
+
+        """
+        size = resource_nbytes(handle)
+        self._handles[key] = handle
+        self._num_bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        return size
+
+    def _on_decoded(self, key, resource, etag):
+        """ Convert a loaded resource dict and notify its loaders.
+
+        """
+        qt_resource = None
+        if resource is not None:
+            qt_resource = convert_resource(resource)
+        if qt_resource is not None:
+            size = self._add_handle(key, qt_resource)
+            if etag is not None:
+                self._store.store(key, etag, qt_resource, size)
+        self._finish(key, qt_resource)
+
+    def _finish(self, key, handle):
+        """ Notify the loaders waiting for a key and trim the cache.
+
+        """
+        loaders = self._pending.pop(key, ())
+        if handle is not None:
+            for loader in loaders:
+                loader._notify(handle)
+            self._evict()
+
+    def _pin(self, owner, key):
+        """ Pin a key for an (object_id, slot) owner, releasing the key
+        it previously pinned.
+
+        """
+        object_id, slot = owner
+        slots = self._owners.setdefault(object_id, {})
+        old = slots.get(slot)
+        if old == key:
+            return
+        slots[slot] = key
+        pins = self._pins
+        pins[key] = pins.get(key, 0) + 1
+        if old is not None:
+            self._unpin(old)
+            self._evict()
+
+    def _unpin(self, key):
+        """ Decrement the pin count of a key.
+
+        """
+        pins = self._pins
+        count = pins[key] - 1
+        if count:
+            pins[key] = count
+        else:
+            del pins[key]
+
+    def _evict(self):
+        """ Evict the least recently used unpinned handles until the
+        cache fits its budget.
+
+        """
+        if self._num_bytes <= self._max_bytes:
+            return
+        handles = self._handles
+        sizes = self._sizes
+        pins = self._pins
+        for key in list(handles):
+            if self._num_bytes <= self._max_bytes:
+                break
+            if key in pins:
+                continue
+            del handles[key]
+            self._num_bytes -= sizes.pop(key)
+            self._evictions += 1
+
     def _make_image_key(self, metadata):
         """ Make a key value for the image metadata.
 
@@ -5,8 +5,11 @@
 from collections import defaultdict
 import logging
 
+from enaml.layout.layout_stats import LayoutStats, LayoutStatsLogger
 from enaml.utils import make_dispatcher
 
+from .qt.QtGui import QWidget
+from .q_deferred_caller import timedCall
 from .qt_resource_manager import QtResourceManager
 from .qt_widget_registry import QtWidgetRegistry
 
@@ -22,7 +25,7 @@ class URLRequest(object):
     """ A simple object for making url requests.
 
     """
-    def __init__(self, session):
+    def __init__(self, session, owner=None):
         """ Initialize a URLRequest.
 
         Parameters
@@ -30,10 +33,15 @@ class URLRequest(object):
         session : Session
             The session object for which the url is being requested.
 
+        owner : tuple, optional
+            The (object_id, slot) tuple of the object which requested
+            the url. It is used to prioritize a batched request.
+
         """
         self._session = session
+        self._owner = owner
 
-    def __call__(self, req_id, url, metadata):
+    def __call__(self, req_id, url, metadata, etag=None):
         """ Make a request for the given url resource.
 
         Parameters
@@ -47,6 +55,10 @@ class URLRequest(object):
         metadata : dict
             Additional metadata to pass along with the request.
 
+        etag : str, optional
+            The entity tag of a copy of the resource held by the client.
+            The server replies 'not_modified' if it is still current.
+
         Returns
         -------
         result : bool
@@ -56,8 +68,14 @@ class URLRequest(object):
         content['id'] = req_id
         content['url'] = url
         content['metadata'] = metadata
+        if etag is not None:
+            content['etag'] = etag
         session = self._session
-        session.send(session._session_id, 'url_request', content)
+        batch = session._url_batch
+        if batch is not None:
+            batch.append((self._owner, content))
+        else:
+            session.send(session._session_id, 'url_request', content)
 
 
 class QtSession(object):
@@ -82,6 +100,10 @@ class QtSession(object):
         self._registered_objects = {}
         self._windows = []
         self._socket = None
+        self._layout_stats = LayoutStats()
+        self._layout_log = None
+        self._url_batch = None
+        self._url_batch_depth = 0
 
     #--------------------------------------------------------------------------
     # Public API
@@ -116,8 +138,12 @@ class QtSession(object):
         # request resources from the server for startup purposes.
         self._socket = socket
         socket.on_message(self.on_message)
-        for window in self._windows:
-            window.activate()
+        self._begin_url_batch()
+        try:
+            for window in self._windows:
+                window.activate()
+        finally:
+            self._end_url_batch()
 
     def build(self, tree, parent):
         """ Build and return a new widget using the given tree dict.
@@ -181,7 +207,11 @@ class QtSession(object):
             The QtObject to unregister from the session.
 
         """
-        self._registered_objects.pop(obj.object_id(), None)
+        object_id = obj.object_id()
+        self._registered_objects.pop(object_id, None)
+        manager = self._resource_manager
+        if manager is not None:
+            manager.release(object_id)
 
     def lookup(self, object_id):
         """ Lookup a registered object with the given object id.
@@ -200,7 +230,7 @@ class QtSession(object):
         """
         return self._registered_objects.get(object_id)
 
-    def load_resource(self, url, metadata=None):
+    def load_resource(self, url, metadata=None, owner=None):
         """ Asynchronously Load the resource pointed to by the given url.
 
         Parameters
@@ -212,6 +242,11 @@ class QtSession(object):
             Additional metadata required by the session to load the
             requested resource.
 
+        owner : tuple, optional
+            An (object_id, slot) tuple which pins the loaded resource in
+            the resource cache until the object loads another resource
+            in the same slot, releases it, or is unregistered.
+
         Returns
         -------
         result : DeferredResource
@@ -221,8 +256,105 @@ class QtSession(object):
         """
         if metadata is None:
             metadata = {}
-        request = URLRequest(self)
-        return self._resource_manager.load(url, metadata, request)
+        request = URLRequest(self, owner)
+        return self._resource_manager.load(url, metadata, request, owner)
+
+    def release_resource(self, object_id, slot):
+        """ Release a resource pinned by an object of the session.
+
+        Parameters
+        ----------
+        object_id : str
+            The object id of the owner of the resource.
+
+        slot : str
+            The slot of the resource, as given to `load_resource`.
+
+        """
+        self._resource_manager.release(object_id, slot)
+
+    def resource_stats(self):
+        """ Get the statistics of the resource cache of the session.
+
+        Returns
+        -------
+        result : dict
+            The statistics of the cache. See the method
+            `QtResourceManager.stats` for the format.
+
+        """
+        return self._resource_manager.stats()
+
+    def set_resource_budget(self, max_bytes):
+        """ Set the byte budget of the resource cache of the session.
+
+        Parameters
+        ----------
+        max_bytes : int
+            The approximate number of bytes of resource handles to keep
+            when they are not in use by a widget.
+
+        """
+        self._resource_manager.set_max_bytes(max_bytes)
+
+    def layout_stats(self):
+        """ Get a snapshot of the layout instrumentation of the session.
+
+        Returns
+        -------
+        result : dict
+            The snapshot of the layout stats of the session. See the
+            method `LayoutStats.snapshot` for the format.
+
+        """
+        containers = []
+        for obj in self._registered_objects.itervalues():
+            get_stats = getattr(obj, 'layout_stats', None)
+            if get_stats is not None:
+                stats = get_stats()
+                if stats is not None:
+                    containers.append(stats)
+        return self._layout_stats.snapshot(containers)
+
+    def record_relayout(self, widget, causes, elapsed):
+        """ Record a relayout request handled by a widget of the session.
+
+        Parameters
+        ----------
+        widget : QtConstraintsWidget
+            The widget which handled the relayout action.
+
+        causes : sequence
+            The names of the traits which caused the relayout.
+
+        elapsed : float
+            The time spent handling the relayout, in seconds.
+
+        """
+        self._layout_stats.record_relayout(widget, causes, elapsed)
+
+    def start_layout_log(self, interval=10.0):
+        """ Periodically log a summary of the layout instrumentation.
+
+        Parameters
+        ----------
+        interval : float, optional
+            The logging interval, in seconds. The default is 10.0.
+
+        """
+        self.stop_layout_log()
+        log = LayoutStatsLogger(self.layout_stats, interval, timedCall, logger)
+        self._layout_log = log
+        log.start()
+
+    def stop_layout_log(self):
+        """ Stop logging the layout instrumentation.
+
+        """
+        log = self._layout_log
+        if log is not None:
+            log.stop()
+            self._layout_log = None
 
     #--------------------------------------------------------------------------
     # Messaging API
@@ -291,7 +423,11 @@ class QtSession(object):
         if window is not None:
             self._windows.append(window)
             window.initialize()
-            window.activate()
+            self._begin_url_batch()
+            try:
+                window.activate()
+            finally:
+                self._end_url_batch()
 
     def on_action_url_reply(self, content):
         """ Handle the 'url_reply' action from the Enaml session.
@@ -303,10 +439,19 @@ class QtSession(object):
         manager = self._resource_manager
         if status == 'ok':
             resource = content['resource']
-            manager.on_load(req_id, url, resource)
+            manager.on_load(req_id, url, resource, content.get('etag'))
+        elif status == 'not_modified':
+            manager.on_not_modified(req_id, url)
         else:
             manager.on_fail(req_id, url)
 
+    def on_action_url_reply_batch(self, content):
+        """ Handle the 'url_reply_batch' action from the Enaml session.
+
+        """
+        for reply in content['replies']:
+            self.on_action_url_reply(reply)
+
     def on_action_message_batch(self, content):
         """ Handle the 'message_batch' action sent by the Enaml session.
 
@@ -325,19 +470,24 @@ class QtSession(object):
         for value in actions.itervalues():
             ordered.extend(value)
         objects = self._registered_objects
-        for object_id, action, msg_content in ordered:
-            try:
-                obj = objects[object_id]
-            except KeyError:
-                msg = "Invalid object id sent to QtSession %s:%s"
-                logger.warn(msg % (object_id, action))
-            else:
-                dispatch_action(obj, action, msg_content)
+        self._begin_url_batch()
+        try:
+            for object_id, action, msg_content in ordered:
+                try:
+                    obj = objects[object_id]
+                except KeyError:
+                    msg = "Invalid object id sent to QtSession %s:%s"
+                    logger.warn(msg % (object_id, action))
+                else:
+                    dispatch_action(obj, action, msg_content)
+        finally:
+            self._end_url_batch()
 
     def on_action_close(self, content):
         """ Handle the 'close' action sent by the Enaml session.
 
         """
+        self.stop_layout_log()
         for window in self._windows:
             window.destroy()
         self._windows = []
@@ -346,3 +496,63 @@ class QtSession(object):
         self._socket.on_message(None)
         self._socket = None
 
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _begin_url_batch(self):
+        """ Start collecting the url requests into a single batch.
+
+        The widgets request the resources declared in their snapshots
+        when they are activated. Collecting those requests lets the
+        session send all the uncached urls of a build in one message.
+        Calls may be nested; the batch is sent by the outermost call
+        to `_end_url_batch`.
+
+        """
+        if self._url_batch_depth == 0:
+            self._url_batch = []
+        self._url_batch_depth += 1
+
+    def _end_url_batch(self):
+        """ Send the collected url requests as a 'url_request_batch'.
+
+        The requests are ordered by priority: those of the widgets
+        which will be visible when their window is shown come first,
+        the others keep the order in which they were made.
+
+        """
+        self._url_batch_depth -= 1
+        if self._url_batch_depth > 0:
+            return
+        batch = self._url_batch
+        self._url_batch = None
+        if not batch:
+            return
+        priority = self._url_priority
+        ordered = sorted(
+            (priority(owner), index, content)
+            for index, (owner, content) in enumerate(batch)
+        )
+        content = {'requests': [item[2] for item in ordered]}
+        self.send(self._session_id, 'url_request_batch', content)
+
+    def _url_priority(self, owner):
+        """ Compute the priority of a url requested by an owner.
+
+        Returns
+        -------
+        result : int
+            0 if the owner is a widget which is visible or will be when
+            its window is shown, 1 otherwise.
+
+        """
+        if owner is not None:
+            obj = self._registered_objects.get(owner[0])
+            if obj is not None:
+                widget = obj.widget()
+                if isinstance(widget, QWidget):
+                    if widget.isWindow():
+                        return 0
+                    if widget.isVisibleTo(widget.window()):
+                        return 0
+        return 1
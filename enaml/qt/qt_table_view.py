@@ -0,0 +1,85 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from .qt.QtGui import QTableView
+from .qt_abstract_item_view import QtAbstractItemView
+
+
+class QtTableView(QtAbstractItemView):
+    """ A Qt implementation of an Enaml TableView.
+
+    """
+    #--------------------------------------------------------------------------
+    # Setup Methods
+    #--------------------------------------------------------------------------
+    def create_widget(self, parent, tree):
+        """ Create the underlying table view widget.
+
+        """
+        return QTableView(parent)
+
+    def create(self, tree):
+        """ Create and initialize the underlying widget.
+
+        """
+        super(QtTableView, self).create(tree)
+        self.set_show_horizontal_header(tree['show_horizontal_header'])
+        self.set_show_vertical_header(tree['show_vertical_header'])
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def visible_window(self):
+        """ Get the window of the model which is visible in the view.
+
+        """
+        widget = self.widget()
+        model = widget.model()
+        rows = model.rowCount()
+        cols = model.columnCount()
+        if rows == 0 or cols == 0:
+            return None
+        viewport = widget.viewport()
+        first_row = max(widget.rowAt(0), 0)
+        last_row = widget.rowAt(viewport.height() - 1)
+        if last_row == -1:
+            last_row = rows - 1
+        first_col = max(widget.columnAt(0), 0)
+        last_col = widget.columnAt(viewport.width() - 1)
+        if last_col == -1:
+            last_col = cols - 1
+        return (first_row, last_row, first_col, last_col)
+
+    #--------------------------------------------------------------------------
+    # Message Handling
+    #--------------------------------------------------------------------------
+    def on_action_set_show_horizontal_header(self, content):
+        """ Handle the 'set_show_horizontal_header' action from the
+        Enaml widget.
+
+        """
+        self.set_show_horizontal_header(content['show_horizontal_header'])
+
+    def on_action_set_show_vertical_header(self, content):
+        """ Handle the 'set_show_vertical_header' action from the Enaml
+        widget.
+
+        """
+        self.set_show_vertical_header(content['show_vertical_header'])
+
+    #--------------------------------------------------------------------------
+    # Widget Update Methods
+    #--------------------------------------------------------------------------
+    def set_show_horizontal_header(self, show):
+        """ Set whether the horizontal header is visible.
+
+        """
+        self.widget().horizontalHeader().setVisible(show)
+
+    def set_show_vertical_header(self, show):
+        """ Set whether the vertical header is visible.
+
+        """
+        self.widget().verticalHeader().setVisible(show)
+
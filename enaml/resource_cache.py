@@ -0,0 +1,327 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from collections import OrderedDict
+from hashlib import sha1
+from threading import Lock
+from time import time
+
+
+def _update_digest(digest, value):
+    """ Feed a snapshot value into a digest in a canonical form.
+
+    """
+    if isinstance(value, dict):
+        digest.update('{')
+        for key in sorted(value):
+            _update_digest(digest, key)
+            _update_digest(digest, value[key])
+        digest.update('}')
+    elif isinstance(value, (list, tuple)):
+        digest.update('[')
+        for item in value:
+            _update_digest(digest, item)
+        digest.update(']')
+    elif isinstance(value, unicode):
+        digest.update('u%d:' % len(value))
+        digest.update(value.encode('utf-8'))
+    elif isinstance(value, str):
+        digest.update('s%d:' % len(value))
+        digest.update(value)
+    else:
+        digest.update(repr(value))
+
+
+def snapshot_etag(snapshot):
+    """ Compute the entity tag of a resource snapshot.
+
+    Parameters
+    ----------
+    snapshot : dict
+        The snapshot dict of a resource.
+
+    Returns
+    -------
+    result : str
+        A hex digest of the content of the snapshot. Two snapshots with
+        the same content have the same tag.
+
+    """
+    digest = sha1()
+    _update_digest(digest, snapshot)
+    return digest.hexdigest()
+
+
+def snapshot_nbytes(snapshot):
+    """ Compute the approximate size of a resource snapshot.
+
+    Parameters
+    ----------
+    snapshot : dict
+        The snapshot dict of a resource.
+
+    Returns
+    -------
+    result : int
+        The total length of the strings held by the snapshot.
+
+    """
+    if isinstance(snapshot, dict):
+        return sum(snapshot_nbytes(value) for value in snapshot.itervalues())
+    if isinstance(snapshot, (list, tuple)):
+        return sum(snapshot_nbytes(item) for item in snapshot)
+    if isinstance(snapshot, basestring):
+        return len(snapshot)
+    return 0
+
+
+def freeze_metadata(metadata):
+    """ Convert request metadata into a hashable value.
+
+    Parameters
+    ----------
+    metadata : dict
+        The metadata of a url request. Lists, which are how tuples
+        arrive from a client, are converted to tuples.
+
+    Returns
+    -------
+    result : tuple
+        The sorted (key, value) items of the metadata.
+
+    """
+    def freeze(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(freeze(item) for item in value)
+        if isinstance(value, dict):
+            return freeze_metadata(value)
+        return value
+    return tuple(sorted((key, freeze(value)) for key, value in
+                        metadata.iteritems()))
+
+
+class ResourceCache(object):
+    """ A thread-safe cache of resource snapshots which can be shared
+    by the sessions of a process.
+
+    The cache holds the snapshot dicts of loaded resources along with
+    their entity tags, keyed by url and metadata. Entries expire after
+    a time to live, so that a provider is consulted again eventually,
+    and the least recently used entries are evicted past the entry and
+    byte limits. Concurrent requests for a key which is being loaded
+    wait for the load in progress instead of starting another one.
+
+    Since the cache is shared, the key of a resource must identify the
+    same resource in every session which uses the cache. A resource
+    manager keys the resources of a provider which is not shared by
+    url, metadata and provider, so that the sessions with providers of
+    their own never see each other's resources. A provider which
+    changes the content of a url is only consulted again once the
+    entry expires or is invalidated.
+
+    """
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024,
+                 ttl=600.0, clock=time):
+        """ Initialize a ResourceCache.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            The maximum number of cached snapshots. The default is 512.
+
+        max_bytes : int, optional
+            The maximum total size of the cached snapshots. The default
+            is 64MB.
+
+        ttl : float or None, optional
+            The time in seconds after which an entry expires. The
+            default is 600. None indicates that entries never expire.
+
+        clock : callable, optional
+            The clock used for the expiry times. The default is
+            `time.time`.
+
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._num_bytes = 0
+        self._pending = {}
+        self._lock = Lock()
+
+    def __len__(self):
+        """ Returns the number of cached snapshots.
+
+        """
+        return len(self._entries)
+
+    @property
+    def num_bytes(self):
+        """ The total size of the cached snapshots.
+
+        """
+        return self._num_bytes
+
+    def request(self, key, callback, load):
+        """ Request the snapshot of a resource.
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the resource, typically the url and the frozen
+            metadata of the request.
+
+        callback : callable
+            A callable which is invoked with the snapshot and the tag
+            of the resource, or with (None, None) if the load fails. It
+            is invoked on the calling thread for a cached resource, and
+            otherwise on the thread which completes the load.
+
+        load : callable
+            A callable which is invoked to load the resource on a cache
+            miss. It is passed a reply callable which must be invoked,
+            from any thread, with the loaded resource or None.
+
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                waiters = self._pending.get(key)
+                if waiters is not None:
+                    waiters.append(callback)
+                    return
+                self._pending[key] = [callback]
+        if entry is not None:
+            callback(entry[0], entry[1])
+            return
+        load(lambda resource: self._on_loaded(key, resource))
+
+    def invalidate(self, key):
+        """ Drop the snapshot of a resource from the cache.
+
+        """
+        with self._lock:
+            self._discard(key)
+
+    def clear(self):
+        """ Drop all the snapshots and reset the counters.
+
+        """
+        with self._lock:
+            self._entries.clear()
+            self._num_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """ Get the statistics of the cache.
+
+        Returns
+        -------
+        result : dict
+            A dict with the 'hits', 'misses' and 'evictions' counts and
+            the number of 'entries' and 'num_bytes' of the cache.
+
+        """
+        stats = {}
+        stats['hits'] = self.hits
+        stats['misses'] = self.misses
+        stats['evictions'] = self.evictions
+        stats['entries'] = len(self._entries)
+        stats['num_bytes'] = self._num_bytes
+        return stats
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _lookup(self, key):
+        """ Get the fresh entry for a key, or None. The lock must be
+        held.
+
+        """
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        if entry[3] is not None and entry[3] <= self._clock():
+            self._discard(key)
+            return None
+        del entries[key]
+        entries[key] = entry
+        return entry
+
+    def _discard(self, key):
+        """ Remove the entry for a key. The lock must be held.
+
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._num_bytes -= entry[2]
+
+    def _on_loaded(self, key, resource):
+        """ Store a loaded resource and notify the waiters.
+
+        """
+        if resource is not None:
+            snapshot = resource.snapshot()
+            etag = snapshot_etag(snapshot)
+            size = snapshot_nbytes(snapshot)
+        else:
+            snapshot = etag = None
+        with self._lock:
+            waiters = self._pending.pop(key, ())
+            if snapshot is not None and size <= self.max_bytes:
+                self._discard(key)
+                expires = None
+                if self.ttl is not None:
+                    expires = self._clock() + self.ttl
+                self._entries[key] = (snapshot, etag, size, expires)
+                self._num_bytes += size
+                self._evict()
+        for callback in waiters:
+            callback(snapshot, etag)
+
+    def _evict(self):
+        """ Evict the least recently used entries past the limits. The
+        lock must be held.
+
+        """
+        entries = self._entries
+        while entries and (len(entries) > self.max_entries or
+                           self._num_bytes > self.max_bytes):
+            key, entry = entries.popitem(last=False)
+            self._num_bytes -= entry[2]
+            self.evictions += 1
+
+
+#: The process-wide cache shared by the resource managers of sessions.
+_shared_cache = None
+
+#: The lock which guards the creation of the shared cache.
+_shared_lock = Lock()
+
+
+def shared_resource_cache():
+    """ Get the process-wide resource cache, creating it on first use.
+
+    Returns
+    -------
+    result : ResourceCache
+        The cache shared by the sessions of the process.
+
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResourceCache()
+        return _shared_cache
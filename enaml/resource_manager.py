@@ -2,13 +2,17 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
+from collections import OrderedDict
 import logging
 from urlparse import urlparse
 
-from traits.api import HasTraits, Dict, Str
+from traits.api import HasTraits, Dict, Instance, Str
 
 from .icon_provider import IconProvider
 from .image_provider import ImageProvider
+from .resource_cache import (
+    ResourceCache, freeze_metadata, shared_resource_cache,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -33,6 +37,24 @@ class ResourceManager(HasTraits):
     #: A dict of icon providers for the `icon://...` scheme.
     icon_providers = Dict(Str, IconProvider)
 
+    #: The cache of loaded resources. By default, this is the cache
+    #: shared by all the sessions of the process. The resources of a
+    #: provider which declares itself `shared` are keyed by their url
+    #: and metadata, so they are loaded once for all of the sessions.
+    #: The resources of the other providers are also keyed by the
+    #: provider object, and are only served to the sessions which use
+    #: that object. A cached resource is served without asking the
+    #: provider again until it expires, after the time to live of the
+    #: cache (10 minutes for the shared cache), or is invalidated. A
+    #: provider which changes its content under a fixed url should
+    #: call `invalidate` when it does, or the manager should be given
+    #: a cache of its own with a shorter time to live. Set it to None
+    #: to consult the providers for every request.
+    cache = Instance(ResourceCache)
+
+    def _cache_default(self):
+        return shared_resource_cache()
+
     def load(self, url, metadata, reply):
         """ Load a resource from the manager.
 
@@ -49,81 +71,155 @@ class ResourceManager(HasTraits):
         reply : URLReply
             A url reply which will be invoked with the loaded resource
             object, or None if the loading fails. It must be safe to
-            invoke this reply from a thread.
+            invoke this reply from a thread. When the manager has a
+            cache, the reply is sent the cached snapshot instead.
+
+        """
+        self.load_batch([(url, metadata, reply)])
+
+    def load_batch(self, items):
+        """ Load a batch of resources from the manager.
+
+        The cached resources are replied immediately. The others are
+        grouped by provider and each provider is handed its requests at
+        once through its bulk loading method, in the order of the items.
+
+        Parameters
+        ----------
+        items : list of tuple
+            The (url, metadata, reply) tuples of the resources to load,
+            in priority order. See the `load` method for the meaning of
+            the items.
+
+        """
+        cache = self.cache
+        groups = OrderedDict()
+        for url, metadata, reply in items:
+            spec = urlparse(url)
+            handler = getattr(self, '_load_' + spec.scheme, None)
+            if handler is None:
+                msg = 'unhandled url resource scheme: `%s`'
+                logger.error(msg % url)
+                reply(None)
+                continue
+            provider = self._lookup_provider(spec)
+            if provider is None:
+                msg = 'no %s provider registered for url: `%s`'
+                logger.error(msg % (spec.scheme, url))
+                reply(None)
+                continue
+            group_key = (spec.scheme, id(provider))
+            group = groups.setdefault(group_key, (handler, provider, []))[2]
+            path = spec.path
+            if cache is None:
+                group.append((path, metadata, reply))
+                continue
+            key = self._cache_key(url, metadata, provider)
+            cache.request(
+                key, reply.send_snapshot,
+                lambda loaded, path=path, metadata=metadata, group=group:
+                    group.append((path, metadata, loaded)),
+            )
+        for handler, provider, requests in groups.itervalues():
+            if requests:
+                handler(provider, requests)
+
+    def invalidate(self, url, metadata=None):
+        """ Drop a resource from the cache of the manager.
+
+        The next request for the resource is handed to its provider.
+
+        Parameters
+        ----------
+        url : str
+            The url of the resource.
+
+        metadata : dict, optional
+            The metadata with which the resource was requested. The
+            default is an empty dict.
 
         """
-        scheme = urlparse(url).scheme
-        handler = getattr(self, '_load_' + scheme, None)
-        if handler is None:
-            msg = 'unhandled url resource scheme: `%s`'
-            logger.error(msg % url)
-            reply(None)
+        cache = self.cache
+        if cache is None:
             return
-        handler(url, metadata, reply)
+        provider = self._lookup_provider(urlparse(url))
+        if provider is not None:
+            key = self._cache_key(url, metadata or {}, provider)
+            cache.invalidate(key)
 
     #--------------------------------------------------------------------------
     # Private API
     #--------------------------------------------------------------------------
-    def _load_image(self, url, metadata, reply):
-        """ Load an image resource.
+    def _lookup_provider(self, spec):
+        """ Get the provider registered for a parsed url, or None.
 
-        This is a private handler method called by the `load` method.
-        It should not be called directly by user code.
+        The providers of a scheme are held in the `<scheme>_providers`
+        dict of the manager, keyed by the location of the url.
 
-        Parameters
-        ----------
-        url : str
-            The url pointing to the image to load.
+        """
+        providers = getattr(self, spec.scheme + '_providers', None)
+        if providers is None:
+            return None
+        return providers.get(spec.netloc)
 
-        metadata : dict
-            The image loader accepts optional 'size' metadata which
-            is the desired size with which to load the image. The
-            default is (-1, -1) which indicates the images natural
-            size should be used.
+    def _cache_key(self, url, metadata, provider):
+        """ Get the key of a resource in the cache of the manager.
 
-        reply : URLReply
-            A url reply which will be invoked with the loaded image
-            object, or None if the loading fails. It must be safe to
-            invoke this reply from a thread.
+        The key of a resource of a provider which is not `shared`
+        includes the provider, so that the resource is only served to
+        the sessions which use that provider.
 
         """
-        spec = urlparse(url)
-        provider = self.image_providers.get(spec.netloc)
-        if provider is None:
-            msg = 'no image provider registered for url: `%s`'
-            logger.error(msg % url)
-            reply(None)
-            return
-        size = metadata.get('size', (-1, -1))
-        provider.request_image(spec.path, size, reply)
+        key = (url, freeze_metadata(metadata))
+        if not getattr(provider, 'shared', False):
+            key += (provider,)
+        return key
 
-    def _load_icon(self, url, metadata, reply):
-        """ Load an icon resource.
+    def _load_image(self, provider, requests):
+        """ Load a batch of image resources.
 
-        This is a private handler method called by the `load` method.
-        It should not be called directly by user code.
+        This is a private handler method called by the `load_batch`
+        method. It should not be called directly by user code.
 
         Parameters
         ----------
-        url : str
-            The url pointing to the icon to load.
-
-        metadata : dict
-            The icon loader does not accept any metadata. Any data
-            in this dict will be ignored.
-
-        reply : URLReply
-            A url reply which will be invoked with the loaded icon
+        provider : ImageProvider
+            The provider of the images.
+
+        requests : list of tuple
+            The (path, metadata, reply) tuples of the images to load.
+            The image loader accepts optional 'size' metadata which is
+            the desired size with which to load the image. The default
+            is (-1, -1) which indicates the images natural size should
+            be used. The reply will be invoked with the loaded image
             object, or None if the loading fails. It must be safe to
-            invoke this reply from a thread.
+            invoke the reply from a thread.
 
         """
-        spec = urlparse(url)
-        provider = self.icon_providers.get(spec.netloc)
-        if provider is None:
-            msg = 'no icon provider registered for url: `%s`'
-            logger.error(msg % url)
-            reply(None)
-            return
-        provider.request_icon(spec.path, reply)
+        provider.request_images([
+            (path, metadata.get('size', (-1, -1)), reply)
+            for path, metadata, reply in requests
+        ])
+
+    def _load_icon(self, provider, requests):
+        """ Load a batch of icon resources.
 
+        This is a private handler method called by the `load_batch`
+        method. It should not be called directly by user code.
+
+        Parameters
+        ----------
+        provider : IconProvider
+            The provider of the icons.
+
+        requests : list of tuple
+            The (path, metadata, reply) tuples of the icons to load.
+            The icon loader does not accept any metadata. The reply
+            will be invoked with the loaded icon object, or None if
+            the loading fails. It must be safe to invoke the reply
+            from a thread.
+
+        """
+        provider.request_icons([
+            (path, reply) for path, metadata, reply in requests
+        ])
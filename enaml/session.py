@@ -3,6 +3,7 @@
 #  All rights reserved.
 #------------------------------------------------------------------------------
 import logging
+from threading import Lock
 
 from traits.api import (
     HasTraits, Instance, List, Str, ReadOnly, Enum, Property, on_trait_change
@@ -11,6 +12,7 @@ from traits.api import (
 from enaml.widgets.window import Window
 
 from .application import deferred_call
+from .resource_cache import snapshot_etag
 from .resource_manager import ResourceManager
 from .signaling import Signal
 from .socket_interface import ActionSocketInterface
@@ -102,8 +104,12 @@ class DeferredBatch(object):
 class URLReply(object):
     """ A reply object for sending a loaded resource to a client session.
 
+    The reply carries the entity tag of the resource, a hash of its
+    snapshot. If the client sent the tag of the copy it already holds
+    and the tag is unchanged, the resource data is not sent again.
+
     """
-    def __init__(self, session, req_id, url):
+    def __init__(self, session, req_id, url, etag=None, batch=None):
         """ Initialize a URLReply.
 
         Parameters
@@ -119,10 +125,20 @@ class URLReply(object):
             The url that was sent with the originating request. This
             url will be included in the response.
 
+        etag : str, optional
+            The entity tag of the copy of the resource held by the
+            client, if any.
+
+        batch : URLReplyBatch, optional
+            The batch which collects the reply, if the request was part
+            of a batched request.
+
         """
         self._session = session
         self._req_id = req_id
         self._url = url
+        self._etag = etag
+        self._batch = batch
 
     def __call__(self, resource):
         """ Send the reply to the client session.
@@ -134,14 +150,126 @@ class URLReply(object):
             to load.
 
         """
-        reply = {'id': self._req_id, 'url': self._url}
         if resource is None:
+            self.send_snapshot(None, None)
+        else:
+            snapshot = resource.snapshot()
+            self.send_snapshot(snapshot, snapshot_etag(snapshot))
+
+    def send_snapshot(self, snapshot, etag):
+        """ Send the reply for a resource snapshot to the client session.
+
+        Parameters
+        ----------
+        snapshot : dict
+            The snapshot of the loaded resource, or None if the resource
+            failed to load.
+
+        etag : str
+            The entity tag of the snapshot.
+
+        """
+        reply = {'id': self._req_id, 'url': self._url}
+        if snapshot is None:
             reply['status'] = 'fail'
+        elif etag is not None and etag == self._etag:
+            reply['status'] = 'not_modified'
+            reply['etag'] = etag
         else:
             reply['status'] = 'ok'
-            reply['resource'] = resource.snapshot()
-        session = self._session
-        session.send(session.session_id, 'url_reply', reply)
+            reply['resource'] = snapshot
+            reply['etag'] = etag
+        batch = self._batch
+        if batch is not None:
+            batch.add(reply)
+        else:
+            session = self._session
+            session.send(session.session_id, 'url_reply', reply)
+
+
+class URLReplyBatch(object):
+    """ A collector which streams the replies to a batched url request.
+
+    The replies which are ready when the collector flushes, typically
+    every cached or synchronously loaded resource of the batch, are sent
+    together in one 'url_reply_batch' message, ordered as the requests
+    were. The client orders the requests by priority, so the resources
+    of the visible widgets come first. Replies completed later by a
+    provider thread are sent in later messages as they arrive.
+
+    """
+    def __init__(self, session, post=deferred_call):
+        """ Initialize a URLReplyBatch.
+
+        Parameters
+        ----------
+        session : Session
+            The session object for which the resources are loaded.
+
+        post : callable, optional
+            The callable used to schedule a flush on the main thread.
+            The default is `deferred_call`.
+
+        """
+        self._session = session
+        self._post = post
+        self._order = {}
+        self._ready = []
+        self._scheduled = False
+        self._lock = Lock()
+
+    def create_reply(self, req_id, url, etag=None):
+        """ Create the reply for the next request of the batch.
+
+        Parameters
+        ----------
+        req_id : str
+            The identifier that was sent with the request.
+
+        url : str
+            The url that was sent with the request.
+
+        etag : str, optional
+            The entity tag of the copy of the resource held by the
+            client, if any.
+
+        Returns
+        -------
+        result : URLReply
+            A reply which is collected by this batch.
+
+        """
+        self._order[req_id] = len(self._order)
+        return URLReply(self._session, req_id, url, etag, self)
+
+    def add(self, reply):
+        """ Add the content of a reply to the batch.
+
+        This method is called by a `URLReply` of the batch and is safe
+        to call from a thread.
+
+        """
+        with self._lock:
+            self._ready.append(reply)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._post(self._flush)
+
+    def _flush(self):
+        """ Send the ready replies to the client session.
+
+        """
+        with self._lock:
+            ready = self._ready
+            self._ready = []
+            self._scheduled = False
+        if ready:
+            order = self._order
+            ready.sort(key=lambda reply: order[reply['id']])
+            session = self._session
+            content = {'replies': ready}
+            session.send(session.session_id, 'url_reply_batch', content)
 
 
 class Session(HasTraits):
@@ -542,6 +670,23 @@ class Session(HasTraits):
         """
         url = content['url']
         metadata = content['metadata']
-        reply = URLReply(self, content['id'], url)
+        etag = content.get('etag')
+        reply = URLReply(self, content['id'], url, etag)
         self.resource_manager.load(url, metadata, reply)
 
+    def on_action_url_request_batch(self, content):
+        """ Handle the 'url_request_batch' action from the client
+        session.
+
+        The requests arrive in priority order and the replies are
+        streamed back in that order in 'url_reply_batch' messages.
+
+        """
+        batch = URLReplyBatch(self)
+        items = []
+        for request in content['requests']:
+            url = request['url']
+            reply = batch.create_reply(request['id'], url, request.get('etag'))
+            items.append((url, request['metadata'], reply))
+        self.resource_manager.load_batch(items)
+
@@ -0,0 +1,388 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import numpy as np
+
+from .item_model import (
+    AbstractTableModel, ITEM_IS_SELECTABLE, ITEM_IS_ENABLED, ITEM_IS_EDITABLE,
+)
+
+
+def default_formatter(values):
+    """ The default formatter of a ColumnTableModel.
+
+    Parameters
+    ----------
+    values : ndarray
+        The one dimensional array of values to format.
+
+    Returns
+    -------
+    result : list
+        The list of unicode display values.
+
+    """
+    return map(unicode, values.tolist())
+
+
+def _descending_key(values):
+    """ Compute a sort key which orders an array in descending order.
+
+    Floating point values are negated and integer and boolean values
+    are complemented, which reverses their order without overflow.
+    Other values are replaced by the negated rank of their value, which
+    works for any sortable dtype.
+
+    """
+    kind = values.dtype.kind
+    if kind == 'f':
+        return -values
+    if kind in 'biu':
+        return ~values
+    inverse = np.unique(values, return_inverse=True)[1]
+    return -inverse
+
+
+class ColumnTableModel(AbstractTableModel):
+    """ A table model which stores its data as one NumPy array per
+    column.
+
+    The rows of the model are a view onto the rows of the columns. The
+    view is defined by an optional filter mask and optional sort keys,
+    and is stored as an array of indices into the columns, so sorting
+    and filtering never copy the data. Sorting and filtering are done
+    with vectorized NumPy operations.
+
+    The display data of a block of items is produced one column at a
+    time by the formatter of the column, which receives an array of
+    values and returns their display strings. This makes the cost of
+    formatting a visible window proportional to the number of columns
+    rather than the number of cells.
+
+    The view is not updated when values are changed with `set_values`.
+    Call `sort` or `filter` again to re-apply the view to new values.
+
+    """
+    base_flags = ITEM_IS_ENABLED | ITEM_IS_SELECTABLE
+
+    #: The maximum number of change notifications emitted by a single
+    #: call to `set_values`. Changes which span more runs of rows are
+    #: notified as a single range covering all of them.
+    max_change_ranges = 64
+
+    def __init__(self, columns, headers=None, formatters=None,
+                 editable=False):
+        """ Initialize a ColumnTableModel.
+
+        Parameters
+        ----------
+        columns : sequence
+            A sequence of one dimensional array-like objects which hold
+            the values of the columns. They must all have the same
+            length. They are converted to arrays without copying when
+            possible, so that arrays passed in are shared with the model.
+
+        headers : sequence or None, optional
+            The unicode horizontal headers for the columns. If None, the
+            columns are numbered. The default is None.
+
+        formatters : dict or None, optional
+            A dict which maps a column index to a formatter for the
+            column. A formatter is a callable which takes an array of
+            values and returns a sequence of unicode display values of
+            the same length. Columns without a formatter use the
+            `default_formatter`. The default is None.
+
+        editable : bool, optional
+            Whether the items of the model can be edited. Edited values
+            are converted to the dtype of their column. The default is
+            False.
+
+        """
+        columns = [np.asarray(column) for column in columns]
+        lengths = set(len(column) for column in columns)
+        if len(lengths) > 1:
+            raise ValueError('The columns must have the same length.')
+        for column in columns:
+            if column.ndim != 1:
+                raise ValueError('The columns must be one dimensional.')
+        self._columns = columns
+        self._num_source_rows = lengths.pop() if lengths else 0
+        self._headers = headers
+        self._formatters = formatters or {}
+        self._editable = editable
+        self._sort_keys = []
+        self._mask = None
+        self._rows = None
+        self._positions = None
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def column(self, column):
+        """ Get the array which holds the values of a column.
+
+        Parameters
+        ----------
+        column : int
+            The index of the column.
+
+        Returns
+        -------
+        result : ndarray
+            The array of the values of the column, in source order. The
+            array is shared with the model and should be modified with
+            `set_values` so that views are notified.
+
+        """
+        return self._columns[column]
+
+    def source_rows(self):
+        """ Get the source rows which are shown by the model.
+
+        Returns
+        -------
+        result : ndarray
+            The array of the indices into the columns of the rows of the
+            model, in the order they are shown.
+
+        """
+        rows = self._rows
+        if rows is None:
+            return np.arange(self._num_source_rows)
+        return rows.copy()
+
+    def sort(self, keys, ascending=True):
+        """ Sort the rows of the model.
+
+        The sort is stable, and is re-applied when the filter of the
+        model is changed.
+
+        Parameters
+        ----------
+        keys : int, sequence of ints or None
+            The index of the column to sort by, or a sequence of column
+            indices in order of precedence. None removes the sort and
+            restores the source order.
+
+        ascending : bool or sequence of bools, optional
+            The direction of the sort for all keys, or for each key in
+            turn. The default is True.
+
+        """
+        if keys is None:
+            keys = []
+        elif isinstance(keys, (int, long)):
+            keys = [keys]
+        if isinstance(ascending, bool):
+            ascending = [ascending] * len(keys)
+        if len(ascending) != len(keys):
+            raise ValueError('There must be one direction for each key.')
+        self.begin_change_layout()
+        self._sort_keys = zip(keys, ascending)
+        self._update_rows()
+        self.end_change_layout()
+
+    def filter(self, predicate):
+        """ Filter the rows of the model.
+
+        Parameters
+        ----------
+        predicate : callable, array-like or None
+            A boolean mask over the source rows which selects the rows
+            to show, or a callable which takes the list of column arrays
+            and returns such a mask, e.g. ``lambda c: c[0] > 10``. None
+            removes the filter.
+
+        """
+        if callable(predicate):
+            predicate = predicate(self._columns)
+        if predicate is not None:
+            predicate = np.asarray(predicate, dtype=bool)
+            if predicate.shape != (self._num_source_rows,):
+                raise ValueError('The filter mask must match the rows.')
+        self.begin_reset_model()
+        self._mask = predicate
+        self._update_rows()
+        self.end_reset_model()
+
+    def set_values(self, column, rows, values):
+        """ Set values of a column and notify the changed ranges.
+
+        One change notification is emitted for each run of consecutive
+        model rows which are affected, up to `max_change_ranges`. Rows
+        which are hidden by the filter are updated without notification.
+
+        Parameters
+        ----------
+        column : int
+            The index of the column to modify.
+
+        rows : int, slice or array-like
+            The source rows to modify, as accepted by NumPy indexing.
+
+        values : object or array-like
+            The value or values to assign to the rows.
+
+        """
+        self._columns[column][rows] = values
+        changed = self._model_rows(rows)
+        if len(changed) == 0:
+            return
+        breaks = np.flatnonzero(np.diff(changed) != 1)
+        if len(breaks) >= self.max_change_ranges:
+            starts = [changed[0]]
+            ends = [changed[-1]]
+        else:
+            starts = [changed[0]] + changed[breaks + 1].tolist()
+            ends = changed[breaks].tolist() + [changed[-1]]
+        index = self.index
+        for start, end in zip(starts, ends):
+            self.notify_data_changed(
+                index(int(start), column), index(int(end), column)
+            )
+
+    #--------------------------------------------------------------------------
+    # AbstractItemModel Interface
+    #--------------------------------------------------------------------------
+    def flags(self, index):
+        """ Returns the flags for the given index.
+
+        """
+        flags = self.base_flags
+        if self._editable:
+            flags |= ITEM_IS_EDITABLE
+        return flags
+
+    def row_count(self, parent=None):
+        """ Returns the number of rows shown by the model.
+
+        """
+        if parent is not None:
+            return 0
+        rows = self._rows
+        if rows is None:
+            return self._num_source_rows
+        return len(rows)
+
+    def column_count(self, parent=None):
+        """ Returns the number of columns of the model.
+
+        """
+        if parent is not None:
+            return 0
+        return len(self._columns)
+
+    def data(self, index):
+        """ Returns the display data for the given index.
+
+        """
+        row = index.row
+        col = index.column
+        return self.block_data(row, row, col, col)[0][0]
+
+    def block_data(self, first_row, last_row, first_column, last_column):
+        """ Returns the display data for a block of items, formatting
+        each column of the block with a single formatter call.
+
+        """
+        rows = self._rows
+        source = slice(first_row, last_row + 1)
+        if rows is not None:
+            source = rows[source]
+        formatters = self._formatters
+        formatted = []
+        for col in xrange(first_column, last_column + 1):
+            formatter = formatters.get(col, default_formatter)
+            formatted.append(formatter(self._columns[col][source]))
+        return map(list, zip(*formatted))
+
+    def edit_data(self, index):
+        """ Returns the raw value of the given index for editing.
+
+        """
+        return self._columns[index.column][self._source_row(index.row)]
+
+    def set_data(self, index, value):
+        """ Converts the value to the dtype of its column, stores it and
+        returns True, or returns False if it cannot be converted.
+
+        """
+        column = self._columns[index.column]
+        try:
+            value = column.dtype.type(value)
+        except (TypeError, ValueError):
+            return False
+        self.set_values(index.column, self._source_row(index.row), value)
+        return True
+
+    def horizontal_header_data(self, section):
+        """ Returns the horizontal header data for the given section.
+
+        """
+        headers = self._headers
+        if headers is not None:
+            return headers[section]
+        return super(ColumnTableModel, self).horizontal_header_data(section)
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _update_rows(self):
+        """ Recompute the source rows of the model from the filter mask
+        and the sort keys.
+
+        """
+        rows = None
+        if self._mask is not None:
+            rows = np.flatnonzero(self._mask)
+        sort_keys = self._sort_keys
+        if sort_keys:
+            if rows is None:
+                rows = np.arange(self._num_source_rows)
+            keys = []
+            for col, asc in sort_keys:
+                key = self._columns[col][rows]
+                if not asc:
+                    key = _descending_key(key)
+                keys.append(key)
+            # lexsort treats the last key as the primary key.
+            keys.reverse()
+            rows = rows[np.lexsort(keys)]
+        self._rows = rows
+        self._positions = None
+
+    def _source_row(self, row):
+        """ Map a model row to a source row.
+
+        """
+        rows = self._rows
+        if rows is None:
+            return row
+        return rows[row]
+
+    def _model_rows(self, rows):
+        """ Map source rows to the sorted array of model rows which show
+        them. Source rows which are hidden are dropped.
+
+        """
+        n = self._num_source_rows
+        if isinstance(rows, slice):
+            source = np.arange(*rows.indices(n))
+        else:
+            source = np.atleast_1d(np.asarray(rows))
+            if source.dtype == bool:
+                source = np.flatnonzero(source)
+            else:
+                source = source % n if n else source
+        if self._rows is None:
+            return np.unique(source)
+        positions = self._positions
+        if positions is None:
+            positions = np.empty(n, dtype=np.intp)
+            positions.fill(-1)
+            positions[self._rows] = np.arange(len(self._rows))
+            self._positions = positions
+        model_rows = positions[source]
+        return np.unique(model_rows[model_rows >= 0])
@@ -0,0 +1,155 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from collections import OrderedDict
+from os import stat
+
+
+def directory_mtime(path):
+    """ Get the modification time of a directory.
+
+    Parameters
+    ----------
+    path : string
+        The path of the directory.
+
+    Returns
+    -------
+    result : float or None
+        The modification time of the directory, or None if it cannot
+        be read.
+
+    """
+    try:
+        return stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class DirectoryCache(object):
+    """ A least recently used cache of directory listings.
+
+    A listing is the list of (is_dir, name) records of all the entries
+    of a directory, stored with the modification time the directory had
+    when it was read. A lookup compares that time with the current
+    modification time of the directory, so a listing is never returned
+    after an entry has been added, removed or renamed. A change which
+    falls within the timestamp resolution of the file system is not
+    detected.
+
+    The size of the cache is bounded by the total number of records of
+    the listings it holds.
+
+    """
+    def __init__(self, max_entries=100000):
+        """ Initialize a DirectoryCache.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            The maximum total number of records held by the cache. A
+            listing with more records than this is not cached. The
+            default is 100000.
+
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._listings = OrderedDict()
+        self._num_entries = 0
+
+    def __len__(self):
+        """ Returns the number of listings in the cache.
+
+        """
+        return len(self._listings)
+
+    @property
+    def num_entries(self):
+        """ The total number of records held by the cache.
+
+        """
+        return self._num_entries
+
+    def lookup(self, path, mtime=None):
+        """ Get the cached listing of a directory.
+
+        Parameters
+        ----------
+        path : string
+            The absolute path of the directory.
+
+        mtime : float or None, optional
+            The current modification time of the directory, if it is
+            already known. If None, the directory is stat'ed.
+
+        Returns
+        -------
+        result : list or None
+            The list of (is_dir, name) records of the directory, or None
+            if it is not cached or its cached listing is out of date.
+            The list must not be modified.
+
+        """
+        listing = self._listings.get(path)
+        if listing is not None:
+            if mtime is None:
+                mtime = directory_mtime(path)
+            if listing[0] == mtime:
+                records = listing[1]
+                self._listings[path] = self._listings.pop(path)
+                self.hits += 1
+                return records
+            self.invalidate(path)
+        self.misses += 1
+        return None
+
+    def store(self, path, mtime, records):
+        """ Store the listing of a directory.
+
+        Parameters
+        ----------
+        path : string
+            The absolute path of the directory.
+
+        mtime : float or None
+            The modification time of the directory, taken before the
+            directory was read. If None, the listing is not stored.
+
+        records : list
+            The list of (is_dir, name) records of the directory. The
+            cache takes ownership of the list.
+
+        """
+        self.invalidate(path)
+        if mtime is None or len(records) > self.max_entries:
+            return
+        self._listings[path] = (mtime, records)
+        self._num_entries += len(records)
+        listings = self._listings
+        while self._num_entries > self.max_entries:
+            ignored, (ignored, evicted) = listings.popitem(last=False)
+            self._num_entries -= len(evicted)
+
+    def invalidate(self, path):
+        """ Drop the listing of a directory from the cache.
+
+        Parameters
+        ----------
+        path : string
+            The absolute path of the directory.
+
+        """
+        listing = self._listings.pop(path, None)
+        if listing is not None:
+            self._num_entries -= len(listing[1])
+
+    def clear(self):
+        """ Drop all listings and reset the counters.
+
+        """
+        self._listings.clear()
+        self._num_entries = 0
+        self.hits = 0
+        self.misses = 0
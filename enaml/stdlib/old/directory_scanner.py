@@ -0,0 +1,178 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from os import listdir
+from os.path import isdir, join
+from threading import Thread
+from time import time
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+
+def iter_directory(path):
+    """ Iterate over the entries of a directory.
+
+    When `scandir` is available (Python 3.5+ or the `scandir` package),
+    the file type of each entry is taken from the directory read itself
+    on platforms which report it, which avoids a `stat` call for every
+    entry. Otherwise, each entry is checked with `os.path.isdir`.
+
+    Parameters
+    ----------
+    path : string
+        The path of the directory to read.
+
+    Returns
+    -------
+    result : generator
+        A generator which yields an (is_dir, name) tuple for each entry
+        of the directory. Symbolic links are reported as the type of
+        their target.
+
+    """
+    if scandir is not None:
+        for entry in scandir(path):
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            yield (is_dir, entry.name)
+    else:
+        for name in listdir(path):
+            yield (isdir(join(path, name)), name)
+
+
+class DirectoryScanner(object):
+    """ An object which reads a directory on a background thread and
+    delivers the entries in batches on the main thread.
+
+    The entries are delivered through the `post` callable, which must
+    arrange for a callback to be invoked on the main thread, such as
+    `enaml.application.deferred_call`. A batch is delivered when it
+    reaches the batch size, or when the batch interval has elapsed
+    since the last delivery, so that the first entries of a slow
+    directory are shown quickly.
+
+    A scanner which is cancelled stops reading at the next entry, and
+    delivers nothing more, including batches which were posted before
+    the cancellation but not yet processed.
+
+    """
+    def __init__(self, path, accept, on_batch, on_done, post,
+                 batch_size=1000, batch_interval=0.05):
+        """ Initialize a DirectoryScanner.
+
+        Parameters
+        ----------
+        path : string
+            The path of the directory to read.
+
+        accept : callable or None
+            A callable which takes the is_dir flag and the name of an
+            entry and returns whether to deliver it. It is invoked on
+            the background thread. If None, all entries are delivered.
+
+        on_batch : callable
+            A callable which is invoked on the main thread with a list
+            of (is_dir, name) tuples for each batch of entries.
+
+        on_done : callable
+            A callable which is invoked on the main thread when the
+            directory has been read. It is passed the exception which
+            stopped the read, or None.
+
+        post : callable
+            A callable which takes a callback and its positional
+            arguments and invokes the callback on the main thread.
+
+        batch_size : int, optional
+            The maximum number of entries in a batch. The default is
+            1000.
+
+        batch_interval : float, optional
+            The maximum time in seconds to hold a partial batch. The
+            default is 0.05.
+
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self._accept = accept
+        self._on_batch = on_batch
+        self._on_done = on_done
+        self._post = post
+        self._cancelled = False
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def start(self):
+        """ Start reading the directory on a daemon thread.
+
+        """
+        thread = Thread(target=self.run)
+        thread.daemon = True
+        thread.start()
+
+    def cancel(self):
+        """ Cancel the scan. This should be called on the main thread.
+
+        """
+        self._cancelled = True
+
+    def cancelled(self):
+        """ Get whether the scan has been cancelled.
+
+        """
+        return self._cancelled
+
+    def run(self):
+        """ Read the directory and post the batches of entries.
+
+        This method is run by the thread created by `start`, but it may
+        also be called directly to perform the scan on the calling
+        thread.
+
+        """
+        accept = self._accept
+        batch_size = self.batch_size
+        batch_interval = self.batch_interval
+        batch = []
+        error = None
+        last_post = time()
+        try:
+            for record in iter_directory(self.path):
+                if self._cancelled:
+                    return
+                if accept is None or accept(*record):
+                    batch.append(record)
+                if batch and (len(batch) >= batch_size or
+                              time() - last_post >= batch_interval):
+                    self._post(self._dispatch, self._on_batch, batch)
+                    batch = []
+                    last_post = time()
+        except (OSError, IOError) as exc:
+            error = exc
+        if self._cancelled:
+            return
+        if batch:
+            self._post(self._dispatch, self._on_batch, batch)
+        self._post(self._dispatch, self._on_done, error)
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _dispatch(self, callback, arg):
+        """ Invoke a callback on the main thread unless the scan has
+        been cancelled.
+
+        """
+        if not self._cancelled:
+            callback(arg)
@@ -0,0 +1,509 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from collections import namedtuple
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+from threading import Event, Thread
+
+from .directory_cache import directory_mtime
+from .directory_scanner import iter_directory
+
+
+#: The changes of a directory between two observations. 'added' is a
+#: list of (is_dir, name) records, 'removed' is a list of names,
+#: 'renamed' is a list of (old_name, new_name) tuples and 'mtime' is the
+#: modification time of the directory taken before the changes were
+#: observed, or None.
+DirectoryChanges = namedtuple(
+    'DirectoryChanges', 'added removed renamed mtime'
+)
+
+
+#------------------------------------------------------------------------------
+# Inotify Support
+#------------------------------------------------------------------------------
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF |
+    IN_MOVE_SELF | IN_ONLYDIR
+)
+
+_RESCAN_MASK = IN_DELETE_SELF | IN_MOVE_SELF | IN_Q_OVERFLOW | IN_IGNORED
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _load_libc():
+    """ Load the C library if it provides inotify, or return None.
+
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+_libc = _load_libc()
+
+
+def inotify_available():
+    """ Returns whether inotify can be used on this platform.
+
+    """
+    return _libc is not None
+
+
+#------------------------------------------------------------------------------
+# Directory Watchers
+#------------------------------------------------------------------------------
+class DirectoryWatcher(object):
+    """ A base class for objects which watch a directory on a background
+    thread and post the changes of its entries to the main thread.
+
+    A watcher keeps a snapshot of the entries of the directory. The
+    changes are delivered as a DirectoryChanges tuple which is the
+    difference between two snapshots, or as None when the watcher has
+    lost track of the directory and it must be read again. A watcher
+    stops after it delivers None.
+
+    Subclasses must implement the `watch` method.
+
+    """
+    def __init__(self, path, mtime, records, on_change, post):
+        """ Initialize a DirectoryWatcher.
+
+        Parameters
+        ----------
+        path : string
+            The path of the directory to watch.
+
+        mtime : float or None
+            The modification time of the directory when the records
+            were read. If the directory has changed since, a rescan
+            is requested when the watcher is started.
+
+        records : iterable
+            The (is_dir, name) records of the entries of the directory.
+
+        on_change : callable
+            A callable which is invoked on the main thread with the
+            DirectoryChanges, or None to request a rescan.
+
+        post : callable
+            A callable which takes a callback and its positional
+            arguments and invokes the callback on the main thread.
+
+        """
+        self.path = path
+        self._mtime = mtime
+        self._snapshot = dict((name, is_dir) for is_dir, name in records)
+        self._on_change = on_change
+        self._post = post
+        self._cancelled = False
+        self._stopped = Event()
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def start(self):
+        """ Start watching the directory on a daemon thread.
+
+        If the directory has changed since the records were read, a
+        rescan is requested instead.
+
+        """
+        if directory_mtime(self.path) != self._mtime:
+            self.rescan()
+            self.close()
+            return
+        thread = Thread(target=self._run)
+        thread.daemon = True
+        thread.start()
+
+    def cancel(self):
+        """ Stop watching the directory. Changes which were posted but
+        not yet delivered are dropped. This should be called on the
+        main thread.
+
+        """
+        self._cancelled = True
+        self._stopped.set()
+
+    def cancelled(self):
+        """ Get whether the watcher has been cancelled.
+
+        """
+        return self._cancelled
+
+    def watch(self):
+        """ Watch the directory until the watcher is cancelled.
+
+        This is called on the background thread. It must be implemented
+        by subclasses, which report changes with `update` and `rescan`.
+
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """ Release the resources of the watcher. This is called once,
+        when the background thread exits or when `start` requests a
+        rescan instead. The default implementation does nothing.
+
+        """
+        pass
+
+    def update(self, snapshot, mtime, renamed=()):
+        """ Post the changes between the current snapshot and a new one.
+
+        Parameters
+        ----------
+        snapshot : dict
+            The dict which maps the name of each entry of the directory
+            to whether it is a directory. It becomes the new snapshot.
+
+        mtime : float or None
+            The modification time of the directory taken before the new
+            snapshot was read.
+
+        renamed : iterable, optional
+            The (old_name, new_name) tuples of observed renames. A rename
+            is reported as such if the old entry has disappeared and the
+            new one has appeared. Otherwise it is reported as a removal
+            and an addition, as appropriate.
+
+        """
+        old = self._snapshot
+        self._snapshot = snapshot
+        self._post_changes(old, snapshot, mtime, renamed)
+
+    def patch(self, entries, mtime, renamed=()):
+        """ Post the changes of some entries of the current snapshot.
+
+        The cost of this method is proportional to the number of entries
+        given, rather than to the size of the directory.
+
+        Parameters
+        ----------
+        entries : dict
+            The dict which maps the name of each changed entry to
+            whether it is a directory, or to None if it was removed.
+
+        mtime : float or None
+            The modification time of the directory taken before the
+            changes were read.
+
+        renamed : iterable, optional
+            The (old_name, new_name) tuples of observed renames, as for
+            `update`.
+
+        """
+        snapshot = self._snapshot
+        old = dict(
+            (name, snapshot[name]) for name in entries if name in snapshot
+        )
+        new = {}
+        for name, is_dir in entries.iteritems():
+            if is_dir is None:
+                snapshot.pop(name, None)
+            else:
+                snapshot[name] = is_dir
+                new[name] = is_dir
+        self._post_changes(old, new, mtime, renamed)
+
+    def rescan(self):
+        """ Post a request to read the directory again, and stop.
+
+        """
+        self._post(self._dispatch, None)
+        self._stopped.set()
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _run(self):
+        """ The body of the background thread.
+
+        """
+        try:
+            self.watch()
+        finally:
+            self.close()
+
+    def _post_changes(self, old, new, mtime, renamed):
+        """ Post the difference between two snapshots, if any.
+
+        """
+        renames = []
+        moved = set()
+        for old_name, new_name in renamed:
+            if (old_name in old and old_name not in new and
+                    new_name in new and new_name not in old and
+                    old_name not in moved and new_name not in moved):
+                renames.append((old_name, new_name))
+                moved.add(old_name)
+                moved.add(new_name)
+        added = [
+            (is_dir, name) for name, is_dir in new.iteritems()
+            if name not in old and name not in moved
+        ]
+        removed = [
+            name for name in old if name not in new and name not in moved
+        ]
+        if added or removed or renames:
+            changes = DirectoryChanges(added, removed, renames, mtime)
+            self._post(self._dispatch, changes)
+
+    def _dispatch(self, changes):
+        """ Deliver changes on the main thread unless the watcher has
+        been cancelled.
+
+        """
+        if not self._cancelled:
+            self._on_change(changes)
+
+
+class PollingWatcher(DirectoryWatcher):
+    """ A DirectoryWatcher which polls the modification time of the
+    directory, and reads the directory when it changes.
+
+    Renames are reported as a removal and an addition.
+
+    """
+    def __init__(self, path, mtime, records, on_change, post, interval=2.0):
+        """ Initialize a PollingWatcher.
+
+        Parameters
+        ----------
+        path, mtime, records, on_change, post
+            The arguments of DirectoryWatcher.
+
+        interval : float, optional
+            The time in seconds between polls. The default is 2.0.
+
+        """
+        super(PollingWatcher, self).__init__(
+            path, mtime, records, on_change, post
+        )
+        self.interval = interval
+
+    def watch(self):
+        """ Poll the directory until the watcher is cancelled.
+
+        """
+        path = self.path
+        mtime = self._mtime
+        stopped = self._stopped
+        while not stopped.wait(self.interval):
+            current = directory_mtime(path)
+            if current is None:
+                self.rescan()
+                return
+            if current == mtime:
+                continue
+            mtime = current
+            try:
+                snapshot = dict(
+                    (name, is_dir) for is_dir, name in iter_directory(path)
+                )
+            except (OSError, IOError):
+                self.rescan()
+                return
+            if not stopped.is_set():
+                self.update(snapshot, current)
+
+
+class InotifyWatcher(DirectoryWatcher):
+    """ A DirectoryWatcher which uses the Linux inotify api.
+
+    The watch is created when the watcher is initialized, which raises
+    an OSError if inotify is not available or the watch cannot be
+    created. The events of each read are applied to the snapshot and
+    reported as one set of changes, with renames within the directory
+    reported as such.
+
+    """
+    #: The time in seconds to wait for an event before checking whether
+    #: the watcher has been cancelled.
+    poll_timeout = 0.5
+
+    #: The time in seconds to wait for more events after an event is
+    #: read, so that a burst of events is reported as one change.
+    coalesce_timeout = 0.05
+
+    def __init__(self, path, mtime, records, on_change, post):
+        """ Initialize an InotifyWatcher.
+
+        Parameters
+        ----------
+        path, mtime, records, on_change, post
+            The arguments of DirectoryWatcher.
+
+        """
+        super(InotifyWatcher, self).__init__(
+            path, mtime, records, on_change, post
+        )
+        if _libc is None:
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        if isinstance(path, unicode):
+            cpath = path.encode(sys.getfilesystemencoding())
+        else:
+            cpath = path
+        if _libc.inotify_add_watch(fd, cpath, _WATCH_MASK) < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+
+    def watch(self):
+        """ Read inotify events until the watcher is cancelled.
+
+        """
+        fd = self._fd
+        stopped = self._stopped
+        while not stopped.is_set():
+            if not select.select([fd], [], [], self.poll_timeout)[0]:
+                continue
+            # The time is taken before the events are read, so that it
+            # never covers a change which is not reported.
+            mtime = directory_mtime(self.path)
+            events = []
+            while select.select([fd], [], [], self.coalesce_timeout)[0]:
+                events.extend(self._read_events())
+            if stopped.is_set():
+                return
+            if not self._apply_events(events, mtime):
+                self.rescan()
+                return
+
+    def close(self):
+        """ Close the inotify file descriptor.
+
+        """
+        os.close(self._fd)
+
+    def _read_events(self):
+        """ Read and parse the pending inotify events.
+
+        Returns
+        -------
+        result : list
+            The list of (mask, cookie, name) tuples of the events.
+
+        """
+        try:
+            data = os.read(self._fd, 65536)
+        except OSError as exc:
+            if exc.errno == errno.EAGAIN:
+                return []
+            raise
+        events = []
+        offset = 0
+        size = _EVENT_HEADER.size
+        while offset + size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += size
+            name = data[offset:offset + length].rstrip('\0')
+            offset += length
+            events.append((mask, cookie, name))
+        return events
+
+    def _apply_events(self, events, mtime):
+        """ Apply a list of inotify events to the snapshot and post the
+        changes, along with the modification time of the directory.
+
+        Returns
+        -------
+        result : bool
+            False if the events require a rescan, True otherwise.
+
+        """
+        path = self.path
+        if isinstance(path, unicode):
+            encoding = sys.getfilesystemencoding()
+            decode = lambda name: name.decode(encoding)
+        else:
+            decode = lambda name: name
+        entries = {}
+        moved_from = {}
+        renamed = []
+        for mask, cookie, name in events:
+            if mask & _RESCAN_MASK:
+                return False
+            name = decode(name)
+            is_dir = bool(mask & IN_ISDIR)
+            if mask & IN_CREATE:
+                entries[name] = is_dir
+            elif mask & IN_DELETE:
+                entries[name] = None
+            elif mask & IN_MOVED_FROM:
+                entries[name] = None
+                moved_from[cookie] = name
+            elif mask & IN_MOVED_TO:
+                entries[name] = is_dir
+                old_name = moved_from.pop(cookie, None)
+                if old_name is not None:
+                    renamed.append((old_name, name))
+        self.patch(entries, mtime, renamed)
+        return True
+
+
+def create_watcher(path, mtime, records, on_change, post, kind='auto',
+                   interval=2.0):
+    """ Create a watcher for a directory.
+
+    Parameters
+    ----------
+    path, mtime, records, on_change, post
+        The arguments of DirectoryWatcher.
+
+    kind : str, optional
+        'inotify' to use inotify, 'poll' to poll the directory, or
+        'auto' to use inotify when it is available and to poll
+        otherwise. The default is 'auto'.
+
+    interval : float, optional
+        The polling interval in seconds. The default is 2.0.
+
+    Returns
+    -------
+    result : DirectoryWatcher
+        The watcher, which has not been started.
+
+    """
+    if kind in ('auto', 'inotify'):
+        try:
+            return InotifyWatcher(path, mtime, records, on_change, post)
+        except OSError:
+            if kind == 'inotify':
+                raise
+    elif kind != 'poll':
+        raise ValueError("Invalid watcher kind '%s'" % kind)
+    return PollingWatcher(path, mtime, records, on_change, post, interval)
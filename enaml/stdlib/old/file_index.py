@@ -0,0 +1,677 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from array import array
+from mmap import mmap, ACCESS_READ
+import os
+from os.path import abspath, exists, islink, join
+import struct
+import sys
+from threading import Thread
+
+from .directory_cache import directory_mtime
+from .directory_scanner import iter_directory
+
+
+#: The magic bytes at the start of an index file.
+_MAGIC = b'ENFIDX01'
+
+#: The sections of an index file, in file order, with the typecode of
+#: their items, or None for a byte blob. The entries of a directory are
+#: stored contiguously in directory order, and the directories in the
+#: preorder of the walk, so that the subdirectories of a directory have
+#: the contiguous ids which end at its 'dir_ends' value. The 'order'
+#: section is the permutation which sorts the entries by their key, the
+#: lower case name, and the keys are stored in that order, each one
+#: followed by a null byte.
+_SECTIONS = (
+    ('dir_mtimes', 'd'),
+    ('dir_entries', 'I'),
+    ('dir_ends', 'I'),
+    ('dir_path_offsets', 'I'),
+    ('dir_paths', None),
+    ('name_offsets', 'I'),
+    ('names', None),
+    ('flags', None),
+    ('entry_dirs', 'I'),
+    ('order', 'I'),
+    ('key_offsets', 'I'),
+    ('keys', None),
+)
+
+#: The header of an index file: the directory and entry counts, and the
+#: offset and length of each section.
+_HEADER = struct.Struct('<II%dQ' % (2 * len(_SECTIONS)))
+
+#: The encoding of the paths stored in an index file.
+_ENCODING = sys.getfilesystemencoding() or 'utf-8'
+
+
+def _encode(path):
+    """ Encode a unicode path into the file system encoding.
+
+    """
+    if isinstance(path, unicode):
+        return path.encode(_ENCODING)
+    return path
+
+
+def _offsets(items, separator):
+    """ Get the offsets of the items of a joined blob.
+
+    Parameters
+    ----------
+    items : list of bytes
+        The items of the blob.
+
+    separator : int
+        The length of the separator which follows each item.
+
+    Returns
+    -------
+    result : array
+        The start offset of each item, followed by the length of the
+        blob.
+
+    """
+    result = array('I', [0])
+    offset = 0
+    append = result.append
+    for length in map(len, items):
+        offset += length + separator
+        append(offset)
+    return result
+
+
+def _write_index(filename, dirs):
+    """ Write the directories of a walk into an index file.
+
+    Parameters
+    ----------
+    filename : string
+        The path of the file to write.
+
+    dirs : list
+        The [path, mtime, records, end] lists of the directories, in
+        the preorder of the walk.
+
+    """
+    dir_mtimes = array('d')
+    dir_entries = array('I', [0])
+    dir_ends = array('I')
+    dir_paths = []
+    names = []
+    flags = []
+    entry_dirs = array('I')
+    for dir_id, (path, mtime, records, end) in enumerate(dirs):
+        dir_mtimes.append(mtime)
+        dir_ends.append(end)
+        dir_paths.append(path)
+        names.extend(name for is_dir, name in records)
+        flags.extend(
+            b'\x01' if is_dir else b'\x00' for is_dir, name in records
+        )
+        entry_dirs.extend([dir_id] * len(records))
+        dir_entries.append(len(names))
+
+    keys = [name.lower() for name in names]
+    order = sorted(xrange(len(keys)), key=keys.__getitem__)
+    sorted_keys = [keys[index] for index in order]
+    sorted_keys.append(b'')
+
+    data = {
+        'dir_mtimes': dir_mtimes,
+        'dir_entries': dir_entries,
+        'dir_ends': dir_ends,
+        'dir_path_offsets': _offsets(dir_paths, 0),
+        'dir_paths': b''.join(dir_paths),
+        'name_offsets': _offsets(names, 0),
+        'names': b''.join(names),
+        'flags': b''.join(flags),
+        'entry_dirs': entry_dirs,
+        'order': array('I', order),
+        'key_offsets': _offsets(sorted_keys[:-1], 1),
+        'keys': b'\x00'.join(sorted_keys),
+    }
+    blobs = []
+    layout = []
+    offset = len(_MAGIC) + _HEADER.size
+    for name, typecode in _SECTIONS:
+        item = data[name]
+        if typecode is not None:
+            if sys.byteorder == 'big':
+                item.byteswap()
+            item = item.tostring()
+        offset += -offset % 8
+        blobs.append((offset, item))
+        layout.extend((offset, len(item)))
+        offset += len(item)
+
+    with open(filename, 'wb') as handle:
+        handle.write(_MAGIC)
+        handle.write(_HEADER.pack(len(dirs), len(names), *layout))
+        for offset, item in blobs:
+            handle.seek(offset)
+            handle.write(item)
+
+
+class _IndexReader(object):
+    """ A read-only view of a memory-mapped index file.
+
+    """
+    def __init__(self, filename):
+        with open(filename, 'rb') as handle:
+            self._map = mmap(handle.fileno(), 0, access=ACCESS_READ)
+        mm = self._map
+        if mm[:len(_MAGIC)] != _MAGIC:
+            mm.close()
+            raise ValueError('%r is not a file index' % filename)
+        header = _HEADER.unpack_from(mm, len(_MAGIC))
+        self.num_dirs = header[0]
+        self.num_entries = header[1]
+        self._sections = {}
+        for index, (name, typecode) in enumerate(_SECTIONS):
+            offset = header[2 + 2 * index]
+            length = header[3 + 2 * index]
+            self._sections[name] = (offset, length)
+        self._dir_ids = None
+
+    def close(self):
+        self._map.close()
+
+    #--------------------------------------------------------------------------
+    # Section Access
+    #--------------------------------------------------------------------------
+    def _u32(self, section, index):
+        offset = self._sections[section][0]
+        return struct.unpack_from('<I', self._map, offset + 4 * index)[0]
+
+    def _array(self, section, typecode):
+        offset, length = self._sections[section]
+        result = array(typecode)
+        result.fromstring(self._map[offset:offset + length])
+        if sys.byteorder == 'big':
+            result.byteswap()
+        return result
+
+    def _blob(self, section, start, end):
+        offset = self._sections[section][0]
+        return self._map[offset + start:offset + end]
+
+    def key(self, rank):
+        start = self._u32('key_offsets', rank)
+        end = self._u32('key_offsets', rank + 1) - 1
+        return self._blob('keys', start, end)
+
+    def dir_path(self, dir_id):
+        start = self._u32('dir_path_offsets', dir_id)
+        end = self._u32('dir_path_offsets', dir_id + 1)
+        return self._blob('dir_paths', start, end)
+
+    def entry(self, index):
+        start = self._u32('name_offsets', index)
+        end = self._u32('name_offsets', index + 1)
+        name = self._blob('names', start, end)
+        is_dir = self._blob('flags', index, index + 1) == b'\x01'
+        return (is_dir, name, self._u32('entry_dirs', index))
+
+    #--------------------------------------------------------------------------
+    # Directories
+    #--------------------------------------------------------------------------
+    def dir_id(self, path):
+        """ Get the id of a directory from its path, or None.
+
+        """
+        dir_ids = self._dir_ids
+        if dir_ids is None:
+            offsets = self._array('dir_path_offsets', 'I')
+            offset = self._sections['dir_paths'][0]
+            paths = self._map[offset:offset + offsets[-1]]
+            dir_ids = self._dir_ids = dict(
+                (paths[offsets[i]:offsets[i + 1]], i)
+                for i in xrange(self.num_dirs)
+            )
+        return dir_ids.get(path)
+
+    def dir_end(self, dir_id):
+        return self._u32('dir_ends', dir_id)
+
+    def dir_size(self, dir_id):
+        """ Get the number of entries below a directory.
+
+        """
+        last = self._u32('dir_entries', self.dir_end(dir_id))
+        return last - self._u32('dir_entries', dir_id)
+
+    def listing(self, path, mtime):
+        """ Get the stored listing of a directory if its modification
+        time is unchanged, or None.
+
+        """
+        dir_id = self.dir_id(path)
+        if dir_id is None:
+            return None
+        offset = self._sections['dir_mtimes'][0]
+        stored = struct.unpack_from('<d', self._map, offset + 8 * dir_id)[0]
+        if stored != mtime:
+            return None
+        return self.records(dir_id)
+
+    def records(self, dir_id):
+        """ Get the (is_dir, name) records of a directory.
+
+        """
+        first = self._u32('dir_entries', dir_id)
+        last = self._u32('dir_entries', dir_id + 1)
+        offset = self._sections['name_offsets'][0]
+        ends = array('I')
+        ends.fromstring(self._map[offset + 4 * first:offset + 4 * last + 4])
+        if sys.byteorder == 'big':
+            ends.byteswap()
+        start = ends[0]
+        blob = self._blob('names', start, ends[-1])
+        flags = self._blob('flags', first, last)
+        records = []
+        begin = 0
+        for index in xrange(last - first):
+            end = ends[index + 1] - start
+            records.append((flags[index] == b'\x01', blob[begin:end]))
+            begin = end
+        return records
+
+    #--------------------------------------------------------------------------
+    # Searching
+    #--------------------------------------------------------------------------
+    def prefix_ranks(self, text):
+        """ Generate the ranks of the keys which start with a text.
+
+        """
+        lo = 0
+        hi = self.num_entries
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < text:
+                lo = mid + 1
+            else:
+                hi = mid
+        for rank in xrange(lo, self.num_entries):
+            if not self.key(rank).startswith(text):
+                break
+            yield rank
+
+    def substring_ranks(self, text):
+        """ Generate the ranks of the keys which contain a text.
+
+        """
+        offset, length = self._sections['keys']
+        end = offset + length
+        pos = offset
+        find = self._map.find
+        while True:
+            pos = find(text, pos, end)
+            if pos < 0:
+                break
+            target = pos - offset
+            lo = 0
+            hi = self.num_entries
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._u32('key_offsets', mid + 1) <= target:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo >= self.num_entries:
+                break
+            yield lo
+            pos = offset + self._u32('key_offsets', lo + 1)
+
+    def order(self, rank):
+        return self._u32('order', rank)
+
+
+class FileIndex(object):
+    """ A persistent index of the file names below a set of roots.
+
+    The index is stored in a memory-mapped file, so that it is usable
+    as soon as it is opened and its pages are shared with the operating
+    system cache. The names are stored in a sorted array of lower case
+    keys, which is searched with a binary search for a prefix query,
+    and with a scan of the contiguous keys for a substring query. The
+    names are therefore matched case insensitively for ASCII text.
+
+    An update walks the roots and stats every directory, but only reads
+    the directories whose modification time differs from the one stored
+    in the index; the listings of the other directories are taken from
+    the current index. The new index is written to a temporary file and
+    replaces the current one when complete, so queries are served from
+    the current index while an update runs on a background thread.
+
+    Symbolic links to directories are not followed.
+
+    """
+    def __init__(self, filename, roots, include_hidden=False):
+        """ Initialize a FileIndex.
+
+        The index file is opened if it exists. Use `update` or
+        `start_update` to build or refresh it.
+
+        Parameters
+        ----------
+        filename : string
+            The path of the index file.
+
+        roots : list of string
+            The paths of the directories to index. A root which is
+            below another root is ignored.
+
+        include_hidden : bool, optional
+            Whether to index the names which start with a period and
+            walk the hidden directories. The default is False.
+
+        """
+        self.filename = filename
+        self.roots = []
+        for root in sorted(set(abspath(_encode(root)) for root in roots)):
+            for other in self.roots:
+                if root.startswith(other.rstrip(os.sep) + os.sep):
+                    break
+            else:
+                self.roots.append(root)
+        self.include_hidden = include_hidden
+        self.num_listed = 0
+        self.num_reused = 0
+        self._reader = None
+        self._update_thread = None
+        self._cancelled = None
+        if exists(filename):
+            try:
+                self._reader = _IndexReader(filename)
+            except (ValueError, struct.error, EnvironmentError):
+                self._reader = None
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    @property
+    def num_entries(self):
+        """ The number of names in the index.
+
+        """
+        reader = self._reader
+        return reader.num_entries if reader is not None else 0
+
+    @property
+    def num_directories(self):
+        """ The number of directories walked by the last update.
+
+        """
+        reader = self._reader
+        return reader.num_dirs if reader is not None else 0
+
+    def close(self):
+        """ Cancel a running update and close the index file.
+
+        """
+        self.cancel_update()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def is_updating(self):
+        """ Get whether an update is running on a background thread.
+
+        """
+        return self._update_thread is not None
+
+    def update(self):
+        """ Update the index on the calling thread.
+
+        """
+        self.cancel_update()
+        temp = self.filename + '.tmp'
+        self._build(temp, [False])
+        self._install(temp)
+
+    def start_update(self, post, on_done=None):
+        """ Update the index on a daemon thread.
+
+        Any running update is cancelled.
+
+        Parameters
+        ----------
+        post : callable
+            A callable which takes a callback and its positional
+            arguments and invokes the callback on the main thread, such
+            as `enaml.application.deferred_call`. The new index is
+            installed on the main thread.
+
+        on_done : callable, optional
+            A callable which is invoked on the main thread when the
+            update completes. It is passed the exception which stopped
+            the update, or None.
+
+        """
+        self.cancel_update()
+        cancelled = self._cancelled = [False]
+        temp = '%s.%d.tmp' % (self.filename, id(cancelled))
+
+        def run():
+            error = None
+            try:
+                self._build(temp, cancelled)
+            except (EnvironmentError, ValueError) as exc:
+                error = exc
+            post(self._finish_update, cancelled, temp, error, on_done)
+
+        thread = self._update_thread = Thread(target=run)
+        thread.daemon = True
+        thread.start()
+
+    def cancel_update(self):
+        """ Cancel the running background update, if any.
+
+        """
+        if self._cancelled is not None:
+            self._cancelled[0] = True
+            self._cancelled = None
+            self._update_thread = None
+
+    def search(self, text, substring=False, limit=100, under=None,
+               dirs_only=False):
+        """ Search the index for names.
+
+        Parameters
+        ----------
+        text : string
+            The text to search for, which is matched case insensitively.
+
+        substring : bool, optional
+            Whether to match the names which contain the text, rather
+            than the names which start with it. The default is False.
+
+        limit : int or None, optional
+            The maximum number of results. The default is 100.
+
+        under : string, optional
+            If given, only the names below this directory are returned.
+
+        dirs_only : bool, optional
+            Whether to only return the directories. The default is
+            False.
+
+        Returns
+        -------
+        result : list of unicode
+            The full paths of the matching names, ordered by name.
+
+        """
+        reader = self._reader
+        if reader is None:
+            return []
+        text = _encode(text).lower().replace(b'\x00', b'')
+        lo = hi = prefix = None
+        if under is not None:
+            under = abspath(_encode(under))
+            lo = reader.dir_id(under)
+            if lo is None:
+                prefix = under.rstrip(os.sep) + os.sep
+            else:
+                hi = reader.dir_end(lo)
+        results = []
+        if limit is not None and limit <= 0:
+            return results
+        if lo is not None and reader.dir_size(lo) * 8 < reader.num_entries:
+            return self._search_subtree(text, substring, limit, lo, dirs_only)
+        if substring:
+            ranks = reader.substring_ranks(text)
+        else:
+            ranks = reader.prefix_ranks(text)
+        for rank in ranks:
+            is_dir, name, dir_id = reader.entry(reader.order(rank))
+            if dirs_only and not is_dir:
+                continue
+            if lo is not None and not lo <= dir_id < hi:
+                continue
+            path = join(reader.dir_path(dir_id), name)
+            if prefix is not None and not path.startswith(prefix):
+                continue
+            results.append(path.decode(_ENCODING, 'replace'))
+            if len(results) == limit:
+                break
+        return results
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _search_subtree(self, text, substring, limit, dir_id, dirs_only):
+        """ Search the names below a small directory by scanning its
+        listings rather than the whole index.
+
+        """
+        reader = self._reader
+        found = []
+        for subdir in xrange(dir_id, reader.dir_end(dir_id)):
+            path = None
+            for is_dir, name in reader.records(subdir):
+                if dirs_only and not is_dir:
+                    continue
+                key = name.lower()
+                if substring:
+                    matched = text in key
+                else:
+                    matched = key.startswith(text)
+                if matched:
+                    if path is None:
+                        path = reader.dir_path(subdir)
+                    found.append((key, join(path, name)))
+        found.sort()
+        return [
+            found_path.decode(_ENCODING, 'replace')
+            for found_key, found_path in found[:limit]
+        ]
+
+    def _walk(self, cancelled):
+        """ Walk the roots and get the listings of their directories,
+        in preorder.
+
+        """
+        reader = self._reader
+        include_hidden = self.include_hidden
+        dirs = []
+        seen = set()
+        listed = reused = 0
+        for root in self.roots:
+            stack = [root]
+            while stack:
+                if cancelled[0]:
+                    return None
+                item = stack.pop()
+                if isinstance(item, int):
+                    dirs[item][3] = len(dirs)
+                    continue
+                path = item
+                if path in seen:
+                    continue
+                seen.add(path)
+                mtime = directory_mtime(path)
+                if mtime is None:
+                    continue
+                records = None
+                if reader is not None:
+                    records = reader.listing(path, mtime)
+                if records is None:
+                    try:
+                        records = list(iter_directory(path))
+                    except EnvironmentError:
+                        continue
+                    if not include_hidden:
+                        records = [
+                            record for record in records
+                            if not record[1].startswith(b'.')
+                        ]
+                    listed += 1
+                else:
+                    reused += 1
+                dir_id = len(dirs)
+                dirs.append([path, mtime, records, dir_id + 1])
+                stack.append(dir_id)
+                for is_dir, name in reversed(records):
+                    if is_dir:
+                        child = join(path, name)
+                        if not islink(child):
+                            stack.append(child)
+        self.num_listed = listed
+        self.num_reused = reused
+        return dirs
+
+    def _build(self, temp, cancelled):
+        """ Walk the roots and write a new index to a temporary file.
+
+        Nothing is written if every directory of the current index was
+        reused, since the index is then up to date.
+
+        """
+        if exists(temp):
+            os.remove(temp)
+        dirs = self._walk(cancelled)
+        if dirs is None or cancelled[0]:
+            return
+        reader = self._reader
+        if (self.num_listed == 0 and reader is not None and
+                self.num_reused == reader.num_dirs):
+            return
+        _write_index(temp, dirs)
+
+    def _install(self, temp):
+        """ Replace the index file with a newly written one.
+
+        """
+        if not exists(temp):
+            return
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        try:
+            os.rename(temp, self.filename)
+        except OSError:
+            # Windows does not replace an existing file on rename.
+            os.remove(self.filename)
+            os.rename(temp, self.filename)
+        self._reader = _IndexReader(self.filename)
+
+    def _finish_update(self, cancelled, temp, error, on_done):
+        """ Install the result of a background update on the main
+        thread.
+
+        """
+        if cancelled[0]:
+            if exists(temp):
+                os.remove(temp)
+            return
+        self._cancelled = None
+        self._update_thread = None
+        if error is None:
+            self._install(temp)
+        if on_done is not None:
+            on_done(error)
@@ -0,0 +1,251 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from fnmatch import translate
+import re
+
+
+#: The characters which have a special meaning in a regex.
+_REGEX_SPECIAL = frozenset('.^$*+?{}[]|()\\')
+
+
+def _regex_literal(pattern):
+    """ Get the literal text matched by a regex, if it is one.
+
+    Parameters
+    ----------
+    pattern : string
+        The regex pattern to analyze.
+
+    Returns
+    -------
+    result : string or None
+        The text matched by the pattern if it only contains literal and
+        escaped non-alphanumeric characters, or None otherwise.
+
+    """
+    chars = []
+    escaped = False
+    for char in pattern:
+        if escaped:
+            if char.isalnum():
+                return None
+            chars.append(char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char in _REGEX_SPECIAL:
+            return None
+        else:
+            chars.append(char)
+    if escaped:
+        return None
+    return ''.join(chars)
+
+
+class FilePattern(object):
+    """ A case insensitive file name pattern with fast paths for the
+    common literal forms.
+
+    A pattern is compiled into one of the following kinds, so that the
+    patterns typed in a filter box are usually matched with string
+    methods instead of a regex:
+
+        'all'       matches every name
+        'exact'     matches a literal name
+        'prefix'    matches names which start with a literal
+        'suffix'    matches names which end with a literal
+        'substring' matches names which contain a literal
+        'segments'  matches names which contain literals in order
+        'regex'     matches with a compiled regex
+
+    With the 'regex' syntax, the pattern is matched at the start of the
+    name as with `re.match`, so a literal is a prefix, and the '.*'
+    and '$' forms around a literal are recognized. With the 'glob'
+    syntax, the pattern must match the whole name as with `fnmatch`,
+    and globs which only use '*' are matched by segments.
+
+    """
+    def __init__(self, pattern, syntax='regex'):
+        """ Initialize a FilePattern.
+
+        Parameters
+        ----------
+        pattern : string
+            The pattern to compile.
+
+        syntax : str, optional
+            The syntax of the pattern, either 'regex' or 'glob'. The
+            default is 'regex'.
+
+        """
+        if syntax == 'regex':
+            self._compile_regex(pattern)
+        elif syntax == 'glob':
+            self._compile_glob(pattern)
+        else:
+            raise ValueError("Invalid pattern syntax '%s'" % syntax)
+        self.pattern = pattern
+        self.syntax = syntax
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def match(self, name):
+        """ Returns whether a name matches the pattern.
+
+        """
+        kind = self.kind
+        if kind == 'all':
+            return True
+        if kind == 'regex':
+            return self._rgx.match(name) is not None
+        name = name.lower()
+        text = self.text
+        if kind == 'prefix':
+            return name.startswith(text)
+        if kind == 'substring':
+            return text in name
+        if kind == 'suffix':
+            return name.endswith(text)
+        if kind == 'exact':
+            return name == text
+        segments = self.segments
+        first = segments[0]
+        last = segments[-1]
+        if not name.startswith(first):
+            return False
+        start = len(first)
+        end = len(name) - len(last)
+        if end < start or not name.endswith(last):
+            return False
+        for segment in segments[1:-1]:
+            pos = name.find(segment, start, end)
+            if pos < 0:
+                return False
+            start = pos + len(segment)
+        return True
+
+    def refines(self, other):
+        """ Returns whether every name which matches this pattern also
+        matches another pattern.
+
+        The test is conservative: False may be returned for a pattern
+        which is in fact a refinement.
+
+        Parameters
+        ----------
+        other : FilePattern
+            The pattern to compare against.
+
+        """
+        if other.kind == 'all':
+            return True
+        if (self.pattern, self.syntax) == (other.pattern, other.syntax):
+            return True
+        kind = self.kind
+        if kind == 'exact':
+            return other.match(self.text)
+        other_kind = other.kind
+        if kind in ('all', 'regex') or other_kind in ('regex', 'segments'):
+            return False
+        other_text = other.text
+        if kind == 'segments':
+            if other_kind == 'substring':
+                return any(other_text in seg for seg in self.segments)
+            if other_kind == 'prefix':
+                return self.segments[0].startswith(other_text)
+            if other_kind == 'suffix':
+                return self.segments[-1].endswith(other_text)
+            return False
+        text = self.text
+        if other_kind == 'substring':
+            return other_text in text
+        if other_kind == 'prefix':
+            return kind == 'prefix' and text.startswith(other_text)
+        if other_kind == 'suffix':
+            return kind == 'suffix' and text.endswith(other_text)
+        return False
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _set_literal(self, kind, text):
+        """ Set the pattern to a literal kind.
+
+        """
+        self.kind = kind
+        self.text = text.lower()
+        self.segments = None
+        self._rgx = None
+
+    def _compile_regex(self, pattern):
+        """ Compile a pattern with the regex syntax.
+
+        """
+        body = pattern
+        anchored = body.endswith('$') and not body.endswith('\\$')
+        if anchored:
+            body = body[:-1]
+        if body.startswith('^'):
+            body = body[1:]
+        leading = body.startswith('.*')
+        if leading:
+            body = body[2:]
+        trailing = body.endswith('.*') and not body.endswith('\\.*')
+        if trailing:
+            body = body[:-2]
+        text = _regex_literal(body)
+        if text is not None and not (anchored and trailing):
+            if not text:
+                if not anchored or leading:
+                    self._set_literal('all', '')
+                    return
+            elif anchored:
+                self._set_literal('suffix' if leading else 'exact', text)
+                return
+            else:
+                self._set_literal('substring' if leading else 'prefix', text)
+                return
+        self.kind = 'regex'
+        self.text = None
+        self.segments = None
+        self._rgx = re.compile(pattern, re.IGNORECASE)
+
+    def _compile_glob(self, pattern):
+        """ Compile a pattern with the glob syntax.
+
+        """
+        if '?' in pattern or '[' in pattern:
+            self.kind = 'regex'
+            self.text = None
+            self.segments = None
+            self._rgx = re.compile(translate(pattern), re.IGNORECASE)
+            return
+        segments = pattern.lower().split('*')
+        if len(segments) == 1:
+            self._set_literal('exact', segments[0])
+        elif not ''.join(segments):
+            self._set_literal('all', '')
+        elif len(segments) == 2:
+            first, last = segments
+            if not last:
+                self._set_literal('prefix', first)
+            elif not first:
+                self._set_literal('suffix', last)
+            else:
+                self._set_segments(segments)
+        elif len(segments) == 3 and not segments[0] and not segments[2]:
+            self._set_literal('substring', segments[1])
+        else:
+            self._set_segments(segments)
+
+    def _set_segments(self, segments):
+        """ Set the pattern to the segments kind.
+
+        """
+        self.kind = 'segments'
+        self.text = None
+        self.segments = segments
+        self._rgx = None
@@ -4,11 +4,16 @@
 #------------------------------------------------------------------------------
 from collections import namedtuple
 from functools import wraps
-from os import listdir
-from os.path import abspath, isabs, normpath, join, isdir, pardir
-import re
+from os.path import abspath, isabs, normpath, join, pardir
 
-from enaml.core.item_model import AbstractListModel, ModelIndex, ALIGN_LEFT, ALIGN_VCENTER
+from enaml.application import Application, deferred_call
+from enaml.signaling import Signal
+
+from .directory_cache import DirectoryCache, directory_mtime
+from .directory_scanner import DirectoryScanner, iter_directory
+from .directory_watcher import create_watcher
+from .file_pattern import FilePattern
+from .item_model import AbstractListModel, ModelIndex, ALIGN_LEFT, ALIGN_VCENTER
 
 
 # A named tuple which holds the relative path of an item in the 
@@ -51,10 +56,39 @@ class FlatFileSystemModel(AbstractListModel):
     """ A concrete list model implementation which navigates a mounted
     filesystem one directory at a time.
 
+    When an application is running, the directory is read on a
+    background thread and its entries are inserted into the model in
+    batches, so that a large or slow directory does not block the ui.
+    Changing the directory, the file pattern or the hidden flag while
+    a directory is being read cancels the read.
+
+    The listings of directories are kept in a DirectoryCache, so that
+    returning to a directory which has not changed, or changing the
+    file pattern or the hidden flag, does not read the directory again.
+    While an application is running, the current directory is watched,
+    and the entries which are added, removed or renamed are updated in
+    the model in place.
+
+    The rows of the model are the entries of the listing which pass
+    the filters, in the order of the listing. Changing the file pattern
+    or the hidden flag filters the listing in memory, and reports the
+    difference as ranges of removed and inserted rows. When the new
+    filter refines the previous one, as when typing more characters of
+    a prefix or substring, only the rows which are shown are tested.
+
     """
+    #: The maximum number of row ranges reported for a change of the
+    #: filters. A change which produces more ranges resets the model.
+    max_filter_ranges = 256
+
+    #: A signal emitted when the current directory has been read. The
+    #: payload is the exception which stopped the read, or None.
+    directory_loaded = Signal()
+
     def __init__(
         self, directory='.', show_hidden=False, file_pattern=r'.*', 
-        dir_icon=None, file_icon=None):
+        dir_icon=None, file_icon=None, asynchronous=True, cache=None,
+        watch='auto', poll_interval=2.0, pattern_syntax='regex'):
         """ Initialize a FlatFilesystemModel.
 
         Parameters
@@ -80,14 +114,49 @@ class FlatFileSystemModel(AbstractListModel):
         file_icon : Icon, optional
             An optional icon to display next to file name.
 
+        asynchronous : bool, optional
+            Whether to read directories on a background thread. This
+            requires an application instance, without which directories
+            are always read synchronously. Defaults to True.
+
+        cache : DirectoryCache, optional
+            The cache of directory listings to use. A cache may be
+            shared between models. Defaults to a new cache for the
+            model.
+
+        watch : str or None, optional
+            How to watch the current directory for changes: 'inotify',
+            'poll' or 'auto', which uses inotify when it is available
+            and polls otherwise. None disables watching. Watching
+            requires an application instance. Defaults to 'auto'.
+
+        poll_interval : float, optional
+            The interval in seconds between polls of the directory when
+            it is watched by polling. Defaults to 2.0.
+
+        pattern_syntax : str, optional
+            The syntax of the file pattern, either 'regex' or 'glob'.
+            Patterns which are literal prefixes, suffixes or substrings
+            are matched without a regex in both syntaxes. Defaults to
+            'regex'.
+
         """
         self._cwd = abspath(normpath(directory))
         self._show_hidden = show_hidden
         self._file_pattern = file_pattern
-        self._file_pattern_rgx = re.compile(file_pattern, re.IGNORECASE)
+        self._pattern_syntax = pattern_syntax
+        self._file_matcher = FilePattern(file_pattern, pattern_syntax)
         self._dir_icon = dir_icon
         self._file_icon = file_icon
+        self._asynchronous = asynchronous
+        self._cache = cache if cache is not None else DirectoryCache()
+        self._watch = watch
+        self._poll_interval = poll_interval
         self._contents = []
+        self._records = []
+        self._mtime = None
+        self._scanner = None
+        self._watcher = None
         self._loadcwd()
 
     #--------------------------------------------------------------------------
@@ -131,38 +200,284 @@ class FlatFileSystemModel(AbstractListModel):
     def _loadcwd(self):
         """ Loads the contents of the current working directory.
 
-        Parameters
-        ----------
-        directory : string
-            The directory for which to retrieve items.
-
-        Returns
-        -------
-        result : list of 2-tuples
-            A list of 2-tuples of the form (bool, string) where the 
-            boolean indicates whether the item is a directory and 
-            the string is the relative path to the item.
+        The contents are reset to the parent directory entry, and the
+        entries of the directory are taken from the cache if it holds
+        an up to date listing. Otherwise, they are read either
+        synchronously, or on a background thread when the model is
+        asynchronous and there is an application to deliver the
+        results. Any read or watch in progress is cancelled.
 
         """
-        contents = self._contents = []
-        push = contents.append
-        cwd = self._cwd
-        filter_dir = self.filter_dir
-        filter_file = self.filter_file
-        rcd = _FlatRecord
+        scanner = self._scanner
+        if scanner is not None:
+            scanner.cancel()
+            self._scanner = None
+        watcher = self._watcher
+        if watcher is not None:
+            watcher.cancel()
+            self._watcher = None
 
         # The first item in a directory is always the relative path to
         # the parent directory. This allows for simple navigation 
         # through the filesystem. But we may want to update it in the
         # future to use something like a breadcrumbs widget.
-        push(rcd(True, pardir))
-        for item in listdir(cwd):
-            if isdir(join(cwd, item)):
-                if filter_dir(item):
-                    push(rcd(True, item))
+        self._contents = [_FlatRecord(True, pardir)]
+
+        # The time is taken before the directory is read, so that a
+        # change made during the read invalidates the cached listing.
+        cwd = self._cwd
+        self._mtime = mtime = directory_mtime(cwd)
+        records = self._cache.lookup(cwd, mtime)
+        if records is not None:
+            self._records = records
+            self._contents.extend(self._filter_records(records))
+            self._start_watcher()
+            self.directory_loaded(None)
+        elif self._asynchronous and Application.instance() is not None:
+            self._records = []
+            scanner = DirectoryScanner(
+                cwd, None, self._insert_batch, self._finish_load,
+                deferred_call,
+            )
+            self._scanner = scanner
+            scanner.start()
+        else:
+            records = self._records = list(iter_directory(cwd))
+            self._contents.extend(self._filter_records(records))
+            self._cache.store(cwd, mtime, records)
+            self._start_watcher()
+            self.directory_loaded(None)
+
+    def _accept(self, is_dir, name):
+        """ Returns whether to include a directory entry in the model.
+
+        """
+        if is_dir:
+            return self.filter_dir(name)
+        return self.filter_file(name)
+
+    def _filter_records(self, records):
+        """ Returns the list of _FlatRecord objects for the (is_dir,
+        name) records which pass the filters of the model.
+
+        """
+        accept = self._accept
+        rcd = _FlatRecord
+        return [rcd(*record) for record in records if accept(*record)]
+
+    def _insert_batch(self, batch):
+        """ Append a batch of directory entries to the model.
+
+        """
+        self._records.extend(batch)
+        self._append_rows(self._filter_records(batch))
+
+    def _append_rows(self, new_contents):
+        """ Append _FlatRecord objects to the contents of the model.
+
+        """
+        if not new_contents:
+            return
+        contents = self._contents
+        first = len(contents)
+        last = first + len(new_contents) - 1
+        self.begin_insert_rows(None, first, last)
+        contents.extend(new_contents)
+        self.end_insert_rows(None, first, last)
+
+    def _finish_load(self, error):
+        """ Complete the asynchronous read of the current directory.
+
+        """
+        self._scanner = None
+        if error is None:
+            self._cache.store(self._cwd, self._mtime, self._records)
+            self._start_watcher()
+        self.directory_loaded(error)
+
+    def _start_watcher(self):
+        """ Start watching the current directory, if enabled.
+
+        """
+        if self._watch is None or Application.instance() is None:
+            return
+        watcher = create_watcher(
+            self._cwd, self._mtime, self._records, self._apply_changes,
+            deferred_call, self._watch, self._poll_interval,
+        )
+        self._watcher = watcher
+        watcher.start()
+
+    def _apply_changes(self, changes):
+        """ Apply the changes reported by the directory watcher.
+
+        Parameters
+        ----------
+        changes : DirectoryChanges or None
+            The changes of the directory, or None if the directory must
+            be read again.
+
+        """
+        cwd = self._cwd
+        if changes is None:
+            self._watcher = None
+            self._cache.invalidate(cwd)
+            self.begin_reset_model()
+            self._loadcwd()
+            self.end_reset_model()
+            return
+
+        added, removed, renamed, mtime = changes
+        accept = self._accept
+        renames = dict(renamed)
+        gone = set(removed)
+
+        # The rows are kept in the order of the records, so an entry
+        # which is renamed into view is moved to the end of the records,
+        # where its row is appended.
+        records = []
+        moved = []
+        for record in self._records:
+            is_dir, name = record
+            if name in renames:
+                new_name = renames[name]
+                if accept(is_dir, new_name) and not accept(is_dir, name):
+                    moved.append((is_dir, new_name))
+                else:
+                    records.append((is_dir, new_name))
+            elif name not in gone:
+                records.append(record)
+        records.extend(moved)
+        records.extend(added)
+        self._records = records
+        self._mtime = mtime
+        self._cache.store(cwd, mtime, records)
+
+        # Renamed entries which are shown are updated in place if they
+        # still pass the filters, and removed otherwise.
+        contents = self._contents
+        rows = dict(
+            (record.rel_path, row) for row, record in enumerate(contents)
+            if row > 0
+        )
+        rcd = _FlatRecord
+        new_contents = [rcd(*record) for record in moved]
+        new_contents.extend(self._filter_records(added))
+        removed_rows = [
+            rows[rel_path] for rel_path in removed if rel_path in rows
+        ]
+        for old_name, new_name in renamed:
+            row = rows.get(old_name)
+            if row is None:
+                continue
+            is_dir = contents[row].is_dir
+            if accept(is_dir, new_name):
+                contents[row] = rcd(is_dir, new_name)
+                index = self.index(row, 0)
+                self.notify_data_changed(index, index)
+            else:
+                removed_rows.append(row)
+
+        removed_rows.sort(reverse=True)
+        i = 0
+        count = len(removed_rows)
+        while i < count:
+            last = first = removed_rows[i]
+            i += 1
+            while i < count and removed_rows[i] == first - 1:
+                first = removed_rows[i]
+                i += 1
+            self.begin_remove_rows(None, first, last)
+            del contents[first:last + 1]
+            self.end_remove_rows(None, first, last)
+        self._append_rows(new_contents)
+
+    def _refilter(self, narrow):
+        """ Update the rows of the model after a change of the filters.
+
+        Parameters
+        ----------
+        narrow : bool
+            True if the new filters only accept entries which the old
+            filters accepted, in which case only the rows which are
+            shown are tested.
+
+        """
+        contents = self._contents
+        if narrow:
+            pairs = ((record, True) for record in contents[1:])
+        else:
+            pairs = self._shown_records()
+        accept = self._accept
+        rcd = _FlatRecord
+
+        # Compute the ranges of removed and inserted rows, in order, with
+        # the positions they have when the previous ranges are applied.
+        # If there are too many ranges, the model is reset instead.
+        max_ranges = self.max_filter_ranges
+        ranges = []
+        row = 1
+        run_kind = None
+        run_start = 0
+        run_items = []
+        for record, shown in pairs:
+            show = accept(*record)
+            if not show and not shown:
+                # The record has no row before or after the change.
+                continue
+            if show == shown:
+                kind = None
+            else:
+                kind = 'insert' if show else 'remove'
+            if kind != run_kind:
+                if run_kind is not None:
+                    ranges.append((run_kind, run_start, run_items))
+                    if len(ranges) > max_ranges:
+                        break
+                run_kind = kind
+                run_start = row
+                run_items = []
+            if kind == 'remove':
+                run_items.append(record)
             else:
-                if filter_file(item):
-                    push(rcd(False, item))
+                if kind == 'insert':
+                    run_items.append(rcd(*record))
+                row += 1
+        else:
+            if run_kind is not None:
+                ranges.append((run_kind, run_start, run_items))
+
+        if len(ranges) > max_ranges:
+            self.begin_reset_model()
+            contents[1:] = self._filter_records(self._records)
+            self.end_reset_model()
+            return
+        for kind, first, items in ranges:
+            last = first + len(items) - 1
+            if kind == 'remove':
+                self.begin_remove_rows(None, first, last)
+                del contents[first:last + 1]
+                self.end_remove_rows(None, first, last)
+            else:
+                self.begin_insert_rows(None, first, last)
+                contents[first:first] = items
+                self.end_insert_rows(None, first, last)
+
+    def _shown_records(self):
+        """ Returns a generator of (record, shown) tuples for the records
+        of the listing, where shown indicates whether the record has a
+        row in the model.
+
+        """
+        contents = self._contents
+        count = len(contents)
+        row = 1
+        for record in self._records:
+            if row < count and contents[row].rel_path == record[1]:
+                row += 1
+                yield (record, True)
+            else:
+                yield (record, False)
 
     #--------------------------------------------------------------------------
     # Public Properties
@@ -174,13 +489,13 @@ class FlatFileSystemModel(AbstractListModel):
         """
         return self._show_hidden
 
-    @_reset_model
     def _set_show_hidden(self, show):
         """ Set whether or not hidden directories and files are shown.
 
         """
-        self._show_hidden = show
-        self._loadcwd()
+        if show != self._show_hidden:
+            self._show_hidden = show
+            self._refilter(not show)
 
     show_hidden = property(_get_show_hidden, _set_show_hidden)
 
@@ -190,17 +505,35 @@ class FlatFileSystemModel(AbstractListModel):
         """
         return self._file_pattern
 
-    @_reset_model
     def _set_file_pattern(self, file_pattern):
         """ Set the pattern to be used by the model.
 
         """
+        old = self._file_matcher
+        matcher = FilePattern(file_pattern, self._pattern_syntax)
         self._file_pattern = file_pattern
-        self._file_pattern_rgx = re.compile(file_pattern, re.IGNORECASE)
-        self._loadcwd()
+        self._file_matcher = matcher
+        self._refilter(matcher.refines(old))
 
     file_pattern = property(_get_file_pattern, _set_file_pattern)
 
+    def _get_pattern_syntax(self):
+        """ Return the syntax of the file pattern.
+
+        """
+        return self._pattern_syntax
+
+    def _set_pattern_syntax(self, syntax):
+        """ Set the syntax of the file pattern.
+
+        """
+        matcher = FilePattern(self._file_pattern, syntax)
+        self._pattern_syntax = syntax
+        self._file_matcher = matcher
+        self._refilter(False)
+
+    pattern_syntax = property(_get_pattern_syntax, _set_pattern_syntax)
+
     def _get_dir_icon(self):
         """ Return the directory icon in use by the model.
 
@@ -240,6 +573,13 @@ class FlatFileSystemModel(AbstractListModel):
         """
         return self._cwd
 
+    def is_loading(self):
+        """ Returns whether the current working directory is still
+        being read on a background thread.
+
+        """
+        return self._scanner is not None
+
     @_reset_model
     def chdir(self, directory):
         """ Sets the current working directory and refresh the model.
@@ -340,5 +680,5 @@ class FlatFileSystemModel(AbstractListModel):
         """
         if not self._show_hidden and item.startswith('.'):
             return False
-        return bool(self._file_pattern_rgx.match(item))
+        return self._file_matcher.match(item)
 
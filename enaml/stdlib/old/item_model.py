@@ -4,7 +4,7 @@
 #------------------------------------------------------------------------------
 from abc import ABCMeta, abstractmethod
 
-from .signaling import Signal
+from enaml.signaling import Signal
 
 
 #------------------------------------------------------------------------------
@@ -702,6 +702,38 @@ class AbstractItemModel(object):
         """
         raise NotImplementedError
 
+    #--------------------------------------------------------------------------
+    # Block Data Methods
+    #--------------------------------------------------------------------------
+    def block_data(self, first_row, last_row, first_column, last_column):
+        """ Get the display data for a block of top-level items.
+
+        The default implementation calls `data` for each item. Models
+        which can produce the display data of many items at once more
+        cheaply should reimplement this method.
+
+        Arguments
+        ---------
+        first_row, last_row : int
+            The inclusive range of rows of the block.
+
+        first_column, last_column : int
+            The inclusive range of columns of the block.
+
+        Returns
+        -------
+        values : list
+            The list of row lists of display data for the block.
+
+        """
+        index = self.index
+        data = self.data
+        columns = xrange(first_column, last_column + 1)
+        values = []
+        for row in xrange(first_row, last_row + 1):
+            values.append([data(index(row, col)) for col in columns])
+        return values
+
     #--------------------------------------------------------------------------
     # Auxiliary Data Methods
     #--------------------------------------------------------------------------
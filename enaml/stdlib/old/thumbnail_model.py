@@ -5,8 +5,9 @@
 from collections import namedtuple
 from functools import wraps
 
-from enaml.core.toolkit import Toolkit
-from enaml.core.item_model import AbstractListModel, ALIGN_HCENTER, ALIGN_VCENTER
+from enaml.application import deferred_call
+
+from .item_model import AbstractListModel, ALIGN_HCENTER, ALIGN_VCENTER
 
 
 # A named tuple representing a thumbnail. It contains the 'name' to show
@@ -48,8 +49,6 @@ class ThumbnailModel(AbstractListModel):
 
         """
         self._thumbs = thumbs[:] if thumbs is not None else []
-        self._toolkit = Toolkit.active_toolkit()
-        self._icon_cls = self._toolkit['Icon']
 
     #--------------------------------------------------------------------------
     # Abstract List Model Implementation
@@ -77,12 +76,10 @@ class ThumbnailModel(AbstractListModel):
         return ALIGN_HCENTER | ALIGN_VCENTER
     
     def decoration(self, index):
-        """ Returns the icon for the given row. The icons are created
-        on the fly from the images contained in the thumbnails.
+        """ Returns the image of the thumbnail for the given row.
 
         """
-        image = self._thumbs[index.row].image
-        return self._icon_cls.from_image(image)
+        return self._thumbs[index.row].image
 
     #--------------------------------------------------------------------------
     # Private API
@@ -119,6 +116,8 @@ class ThumbnailModel(AbstractListModel):
         the appropriate data refresh.
 
         """
+        if not thumbs:
+            return
         idx = len(self._thumbs)
         last = idx + len(thumbs) - 1
         self.begin_insert_rows(None, idx, last)
@@ -174,7 +173,7 @@ class ThumbnailModel(AbstractListModel):
         thumbnail creation and then request the update.
 
         """
-        self._toolkit.app.call_on_main(self._insert, idx, thumb)
+        deferred_call(self._insert, idx, thumb)
 
     def append(self, thumb):
         """ Append the given thumbnail to the model and trigger the
@@ -192,7 +191,7 @@ class ThumbnailModel(AbstractListModel):
         thumbnail creation and then request the update.
 
         """
-        self._toolkit.app.call_on_main(self._append, thumb)
+        deferred_call(self._append, thumb)
 
     def extend(self, thumbs):
         """ Extend the model with the given thumbnails and trigger the
@@ -210,7 +209,7 @@ class ThumbnailModel(AbstractListModel):
         thumbnail creation and then request the update.
 
         """
-        self._toolkit.app.call_on_main(self._extend, thumbs)
+        deferred_call(self._extend, thumbs)
 
     def remove(self, idx, count):
         """ Remove the specified thumbnails from the model.
@@ -230,7 +229,7 @@ class ThumbnailModel(AbstractListModel):
         thumbnail creation and then request the update.
 
         """
-        self._toolkit.app.call_on_main(self._remove, idx, count)
+        deferred_call(self._remove, idx, count)
 
     def thumbnail(self, index):
         """ Returns the thumbnail for the given model index.
@@ -271,12 +270,12 @@ class ThumbnailModel(AbstractListModel):
         thumbnail creation and then request the update.
 
         """
-        self._toolkit.app.call_on_main(self._set_thumbnails, thumbs)
+        deferred_call(self._set_thumbnails, thumbs)
 
     def clear(self):
         """ Clear the model of all thumbnails and trigger the 
         appropriate refresh.
 
         """
-        self._toolkit.app.call_on_main(self._clear)
+        deferred_call(self._clear)
 
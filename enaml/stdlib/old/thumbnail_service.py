@@ -0,0 +1,566 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from collections import deque, OrderedDict
+from cStringIO import StringIO
+import errno
+from hashlib import sha1
+from multiprocessing import Pool, cpu_count
+import os
+from threading import Lock, Thread
+from time import time
+
+from enaml.application import deferred_call
+from enaml.image_provider import Image
+
+from .thumbnail_model import Thumbnail
+
+
+def thumbnail_key(path, mtime, file_size, size):
+    """ Get the cache key of a thumbnail.
+
+    Parameters
+    ----------
+    path : string
+        The absolute path of the image file.
+
+    mtime : float
+        The modification time of the image file.
+
+    file_size : int
+        The size in bytes of the image file.
+
+    size : tuple
+        The (width, height) bounding size of the thumbnail.
+
+    Returns
+    -------
+    result : str
+        The hex digest which names the thumbnail in a cache.
+
+    """
+    if isinstance(path, unicode):
+        path = path.encode('utf-8')
+    text = '%s\0%r\0%d\0%dx%d' % (path, mtime, file_size, size[0], size[1])
+    return sha1(text).hexdigest()
+
+
+def cache_path(directory, key):
+    """ Get the path of a thumbnail in a cache directory.
+
+    The thumbnails are spread over 256 subdirectories by the first two
+    characters of their key.
+
+    """
+    return os.path.join(directory, key[:2], key)
+
+
+def scale_image(path, size):
+    """ Decode an image file and scale it down to a thumbnail.
+
+    PIL is used when it is installed, and Qt otherwise. An image is
+    scaled down to fit the size while maintaining its aspect ratio, but
+    it is never scaled up.
+
+    Parameters
+    ----------
+    path : string
+        The path of the image file.
+
+    size : tuple
+        The (width, height) bounding size of the thumbnail.
+
+    Returns
+    -------
+    result : str or None
+        The thumbnail encoded as a PNG, or None if the image cannot be
+        decoded or has a width or height of zero.
+
+    """
+    try:
+        from PIL import Image as PILImage
+    except ImportError:
+        PILImage = None
+    if PILImage is not None:
+        try:
+            img = PILImage.open(path)
+            # Let the JPEG decoder downscale while decoding, to the
+            # smallest power of two reduction which covers the size.
+            img.draft('RGB', size)
+            img.load()
+        except IOError:
+            return None
+        width, height = img.size
+        if width == 0 or height == 0:
+            return None
+        if img.mode not in ('1', 'L', 'LA', 'P', 'RGB', 'RGBA'):
+            img = img.convert('RGBA')
+        if width > size[0] or height > size[1]:
+            img.thumbnail(size, PILImage.ANTIALIAS)
+        buf = StringIO()
+        img.save(buf, 'PNG')
+        return buf.getvalue()
+
+    from enaml.qt.qt.QtCore import Qt, QBuffer, QByteArray, QIODevice
+    from enaml.qt.qt.QtGui import QImage
+    img = QImage(path)
+    if img.isNull() or img.width() == 0 or img.height() == 0:
+        return None
+    if img.width() > size[0] or img.height() > size[1]:
+        img = img.scaled(
+            size[0], size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation,
+        )
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.WriteOnly)
+    img.save(buf, 'PNG')
+    buf.close()
+    return str(data)
+
+
+def load_thumbnail(task):
+    """ Load a thumbnail from a cache directory, or create it.
+
+    This is the function run by the workers of a ThumbnailService. A
+    new thumbnail is written to the cache directory.
+
+    Parameters
+    ----------
+    task : tuple
+        A (path, size, cache_dir, scale) tuple. The cache directory may
+        be None. The scale callable has the signature of `scale_image`
+        and must be picklable.
+
+    Returns
+    -------
+    result : tuple or None
+        A (key, data, written) tuple where written is whether the
+        thumbnail was added to the cache, or None if the file is not
+        a usable image.
+
+    """
+    path, size, cache_dir, scale = task
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = thumbnail_key(path, st.st_mtime, st.st_size, size)
+    if cache_dir is not None:
+        cached = cache_path(cache_dir, key)
+        try:
+            with open(cached, 'rb') as handle:
+                data = handle.read()
+        except IOError:
+            pass
+        else:
+            # Touch the file so that it is kept by a later eviction.
+            try:
+                os.utime(cached, None)
+            except OSError:
+                pass
+            return (key, data, False)
+    # A file which fails to decode for any reason is skipped, so that
+    # a single bad image does not stop the load of a directory.
+    try:
+        data = scale(path, size)
+    except Exception:
+        return None
+    if data is None:
+        return None
+    written = False
+    if cache_dir is not None:
+        cached = cache_path(cache_dir, key)
+        temp = '%s.%d.tmp' % (cached, os.getpid())
+        try:
+            try:
+                os.makedirs(os.path.dirname(cached))
+            except OSError as exc:
+                if exc.errno != errno.EEXIST:
+                    raise
+            with open(temp, 'wb') as handle:
+                handle.write(data)
+            os.rename(temp, cached)
+            written = True
+        except EnvironmentError:
+            pass
+    return (key, data, written)
+
+
+class ThumbnailCache(object):
+    """ The bookkeeping of an on-disk thumbnail cache.
+
+    The thumbnails are files named by their key in a cache directory.
+    They are read and written by the workers of a ThumbnailService,
+    which report them to the cache. The cache evicts the least recently
+    used thumbnails when its total size or number of files exceeds its
+    limits. The order of use is recovered from the modification times
+    of the files when the cache is first used in a process.
+
+    """
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024,
+                 max_entries=None):
+        """ Initialize a ThumbnailCache.
+
+        Parameters
+        ----------
+        directory : string
+            The cache directory. It is created as needed.
+
+        max_bytes : int, optional
+            The maximum total size of the cached thumbnails. The
+            default is 256MB.
+
+        max_entries : int or None, optional
+            The maximum number of cached thumbnails. The default is
+            None and indicates no limit.
+
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = None
+        self._num_bytes = 0
+        self._lock = Lock()
+
+    @property
+    def num_bytes(self):
+        """ The total size of the cached thumbnails.
+
+        """
+        with self._lock:
+            self._ensure_scanned()
+            return self._num_bytes
+
+    def __len__(self):
+        """ Returns the number of cached thumbnails.
+
+        """
+        with self._lock:
+            self._ensure_scanned()
+            return len(self._entries)
+
+    def record(self, key, size, written):
+        """ Record the use of a thumbnail by a worker.
+
+        Parameters
+        ----------
+        key : str
+            The key of the thumbnail.
+
+        size : int
+            The size in bytes of the thumbnail.
+
+        written : bool
+            Whether the thumbnail was written to the cache by the
+            worker, rather than read from it.
+
+        """
+        with self._lock:
+            self._ensure_scanned()
+            entries = self._entries
+            old = entries.pop(key, None)
+            if old is not None:
+                self._num_bytes -= old
+            elif not written and not os.path.exists(
+                    cache_path(self.directory, key)):
+                return
+            entries[key] = size
+            self._num_bytes += size
+            self._evict()
+
+    def clear(self):
+        """ Remove all the cached thumbnails.
+
+        """
+        with self._lock:
+            self._ensure_scanned()
+            for key in self._entries:
+                self._remove(key)
+            self._entries.clear()
+            self._num_bytes = 0
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _ensure_scanned(self):
+        """ Scan the cache directory on first use.
+
+        """
+        if self._entries is not None:
+            return
+        found = []
+        if os.path.isdir(self.directory):
+            for sub in os.listdir(self.directory):
+                subdir = os.path.join(self.directory, sub)
+                if len(sub) != 2 or not os.path.isdir(subdir):
+                    continue
+                for key in os.listdir(subdir):
+                    if key.endswith('.tmp'):
+                        continue
+                    try:
+                        st = os.stat(os.path.join(subdir, key))
+                    except OSError:
+                        continue
+                    found.append((st.st_mtime, key, st.st_size))
+        found.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in found)
+        self._num_bytes = sum(size for _, _, size in found)
+        self._evict()
+
+    def _evict(self):
+        """ Remove the least recently used thumbnails which exceed the
+        limits of the cache.
+
+        """
+        entries = self._entries
+        max_entries = self.max_entries
+        while entries and (self._num_bytes > self.max_bytes or
+                           (max_entries is not None and
+                            len(entries) > max_entries)):
+            key, size = entries.popitem(last=False)
+            self._num_bytes -= size
+            self._remove(key)
+
+    def _remove(self, key):
+        try:
+            os.remove(cache_path(self.directory, key))
+        except OSError:
+            pass
+
+
+class ThumbnailRequest(object):
+    """ A handle on a running thumbnail load.
+
+    """
+    def __init__(self):
+        self._cancelled = False
+        self._done = False
+
+    def cancel(self):
+        """ Cancel the load. This should be called on the main thread.
+
+        No more thumbnails are added to the model after a cancel,
+        including the batches which are already posted.
+
+        """
+        self._cancelled = True
+
+    def cancelled(self):
+        """ Get whether the load has been cancelled.
+
+        """
+        return self._cancelled
+
+    def done(self):
+        """ Get whether the load has completed.
+
+        """
+        return self._done
+
+
+class ThumbnailService(object):
+    """ A service which creates thumbnails on a pool of worker
+    processes and adds them to thumbnail models in batches.
+
+    A load iterates over its paths on a dispatch thread, so a path
+    generator which walks the file system runs off the main thread. The
+    paths are handed to the worker processes, which read the thumbnail
+    from the on-disk cache or decode and scale the image and write it
+    to the cache. The results are collected in the order of the paths
+    and added to the model on the main thread in batches, so that the
+    thumbnails appear progressively and in order.
+
+    A thumbnail is cached under a key derived from the path, the
+    modification time and the size of the file, and the thumbnail size,
+    so a changed file is never served from a stale thumbnail.
+
+    """
+    def __init__(self, size=(256, 256), cache_dir=None,
+                 max_cache_bytes=256 * 1024 * 1024, max_cache_entries=None,
+                 processes=None, scale=scale_image, batch_size=32,
+                 batch_interval=0.1, post=deferred_call):
+        """ Initialize a ThumbnailService.
+
+        Parameters
+        ----------
+        size : tuple, optional
+            The (width, height) bounding size of the thumbnails. The
+            default is (256, 256).
+
+        cache_dir : string or None, optional
+            The directory of the on-disk cache. The default is None
+            and indicates that thumbnails are not cached.
+
+        max_cache_bytes : int, optional
+            The maximum total size of the cached thumbnails. The
+            default is 256MB.
+
+        max_cache_entries : int or None, optional
+            The maximum number of cached thumbnails. The default is
+            None and indicates no limit.
+
+        processes : int or None, optional
+            The number of worker processes. The default of None uses
+            the number of CPUs. With 0, the thumbnails are created on
+            the dispatch thread.
+
+        scale : callable, optional
+            The picklable callable which creates a thumbnail, with the
+            signature of `scale_image`, which is the default.
+
+        batch_size : int, optional
+            The maximum number of thumbnails added to a model at once.
+            The default is 32.
+
+        batch_interval : float, optional
+            The maximum time in seconds to hold a partial batch. The
+            default is 0.1.
+
+        post : callable, optional
+            A callable which takes a callback and its positional
+            arguments and invokes the callback on the main thread. The
+            default is `enaml.application.deferred_call`.
+
+        """
+        self.size = tuple(size)
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        if cache_dir is not None:
+            cache_dir = os.path.abspath(cache_dir)
+            self.cache = ThumbnailCache(
+                cache_dir, max_cache_bytes, max_cache_entries,
+            )
+        else:
+            self.cache = None
+        self._cache_dir = cache_dir
+        self._processes = processes
+        self._scale = scale
+        self._post = post
+        self._pool = None
+        self._pool_lock = Lock()
+
+    #--------------------------------------------------------------------------
+    # Public API
+    #--------------------------------------------------------------------------
+    def load(self, model, paths, on_done=None):
+        """ Load the thumbnails of image files into a model.
+
+        Parameters
+        ----------
+        model : ThumbnailModel
+            The model to which the thumbnails are appended. The name of
+            a thumbnail is the file name of the image and its metadata
+            is a dict with the 'path' of the image.
+
+        paths : iterable
+            The paths of the image files. It is iterated on the dispatch
+            thread. Files which are not usable images are skipped.
+
+        on_done : callable, optional
+            A callable which is invoked on the main thread with the
+            request when the load completes, unless it is cancelled.
+
+        Returns
+        -------
+        result : ThumbnailRequest
+            The request which can be used to cancel the load.
+
+        """
+        request = ThumbnailRequest()
+        args = (request, model, paths, on_done)
+        thread = Thread(target=self._run, args=args)
+        thread.daemon = True
+        thread.start()
+        return request
+
+    def close(self):
+        """ Terminate the worker processes.
+
+        """
+        with self._pool_lock:
+            pool = self._pool
+            self._pool = None
+        if pool is not None:
+            pool.terminate()
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _get_pool(self):
+        """ Get the worker pool, creating it on first use.
+
+        """
+        if self._processes == 0:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = Pool(self._processes)
+            return self._pool
+
+    def _run(self, request, model, paths, on_done):
+        """ Dispatch the paths of a load to the workers and post the
+        batches of thumbnails. This runs on the dispatch thread.
+
+        """
+        pool = self._get_pool()
+        max_pending = 4 * (self._processes or cpu_count())
+        size = self.size
+        cache_dir = self._cache_dir
+        scale = self._scale
+        batch = []
+        pending = deque()
+        state = {'last_post': time()}
+
+        def collect(path, result):
+            if result is None:
+                return
+            key, data, written = result
+            if self.cache is not None:
+                self.cache.record(key, len(data), written)
+            image = Image(data=data)
+            name = os.path.basename(path)
+            batch.append(Thumbnail(name, image, {'path': path}))
+            if (len(batch) >= self.batch_size or
+                    time() - state['last_post'] >= self.batch_interval):
+                self._post(self._dispatch, request, model.extend, batch[:])
+                del batch[:]
+                state['last_post'] = time()
+
+        for path in paths:
+            if request._cancelled:
+                return
+            task = (path, size, cache_dir, scale)
+            if pool is None:
+                collect(path, load_thumbnail(task))
+                continue
+            pending.append((path, pool.apply_async(load_thumbnail, (task,))))
+            while len(pending) >= max_pending:
+                path, result = pending.popleft()
+                collect(path, result.get())
+        while pending:
+            if request._cancelled:
+                return
+            path, result = pending.popleft()
+            collect(path, result.get())
+        if batch:
+            self._post(self._dispatch, request, model.extend, batch)
+        self._post(self._finish, request, on_done)
+
+    def _dispatch(self, request, callback, arg):
+        """ Invoke a callback on the main thread unless the request has
+        been cancelled.
+
+        """
+        if not request._cancelled:
+            callback(arg)
+
+    def _finish(self, request, on_done):
+        """ Complete a request on the main thread.
+
+        """
+        if request._cancelled:
+            return
+        request._done = True
+        if on_done is not None:
+            on_done(request)
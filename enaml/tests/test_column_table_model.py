@@ -0,0 +1,122 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from unittest import TestCase, skipIf
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+else:
+    from enaml.stdlib.old.column_table_model import ColumnTableModel
+
+
+@skipIf(np is None, 'numpy is not installed')
+class TestColumnTableModel(TestCase):
+    """ Test the sorting, filtering and notifications of a
+    ColumnTableModel.
+
+    """
+    def setUp(self):
+        self.ints = np.array([3, 1, 2, 1, 3])
+        self.names = np.array(['c', 'a', 'e', 'b', 'd'])
+        self.floats = np.array([0.5, 1.5, 2.5, 3.5, 4.5])
+        self.model = ColumnTableModel(
+            [self.ints, self.names, self.floats],
+            formatters={2: lambda values: np.char.mod(u'%.1f', values)},
+        )
+        self.changes = []
+        self.model.data_changed.connect(self.changes.append)
+
+    def column_data(self, column):
+        model = self.model
+        values = model.block_data(0, model.row_count() - 1, column, column)
+        return [row[0] for row in values]
+
+    def changed_rows(self):
+        return [(tl.row, br.row) for tl, br in self.changes]
+
+    def test_block_data(self):
+        """ Test that a block is formatted column by column.
+
+        """
+        values = self.model.block_data(1, 2, 0, 2)
+        self.assertEqual(values, [[u'1', u'a', u'1.5'], [u'2', u'e', u'2.5']])
+        index = self.model.index(4, 2)
+        self.assertEqual(self.model.data(index), u'4.5')
+
+    def test_sort(self):
+        """ Test a stable sort on one key without copying the data.
+
+        """
+        self.model.sort(0)
+        self.assertEqual(self.column_data(1), [u'a', u'b', u'e', u'c', u'd'])
+        self.assertTrue(self.model.column(0) is self.ints)
+        self.model.sort(None)
+        self.assertEqual(self.column_data(1), [u'c', u'a', u'e', u'b', u'd'])
+
+    def test_multi_key_sort(self):
+        """ Test a sort on several keys with mixed directions.
+
+        """
+        self.model.sort([0, 1], [True, False])
+        self.assertEqual(self.column_data(1), [u'b', u'a', u'e', u'd', u'c'])
+        self.model.sort([0, 2], False)
+        self.assertEqual(self.column_data(2), [
+            u'4.5', u'0.5', u'2.5', u'3.5', u'1.5',
+        ])
+
+    def test_filter(self):
+        """ Test that a filter composes with the sort.
+
+        """
+        self.model.sort(1)
+        self.model.filter(lambda columns: columns[0] > 1)
+        self.assertEqual(self.model.row_count(), 3)
+        self.assertEqual(self.column_data(1), [u'c', u'd', u'e'])
+        self.model.filter(None)
+        self.assertEqual(self.model.row_count(), 5)
+        self.assertEqual(self.column_data(1), [u'a', u'b', u'c', u'd', u'e'])
+
+    def test_set_values_ranges(self):
+        """ Test that an update notifies each run of changed rows.
+
+        """
+        self.model.set_values(2, [0, 1, 3], 9.0)
+        self.assertEqual(self.changed_rows(), [(0, 1), (3, 3)])
+        self.assertEqual(self.floats[3], 9.0)
+
+    def test_set_values_sorted(self):
+        """ Test that an update is notified at the sorted positions and
+        not at all for hidden rows.
+
+        """
+        self.model.sort(1)
+        self.model.filter(self.ints != 2)
+        self.model.set_values(2, slice(0, 3), 0.0)
+        # Source rows 0 and 1 ('c' and 'a') are shown at rows 2 and 0,
+        # and source row 2 ('e') is hidden.
+        self.assertEqual(self.changed_rows(), [(0, 0), (2, 2)])
+
+    def test_set_values_coalesced(self):
+        """ Test that many runs are notified as a single range.
+
+        """
+        self.model.max_change_ranges = 2
+        self.model.set_values(0, [0, 2, 4], 7)
+        self.assertEqual(self.changed_rows(), [(0, 4)])
+
+    def test_set_data(self):
+        """ Test that edited values are converted to the column dtype.
+
+        """
+        model = ColumnTableModel([self.ints], editable=True)
+        self.assertTrue(model.set_data(model.index(1, 0), u'42'))
+        self.assertEqual(self.ints[1], 42)
+        self.assertFalse(model.set_data(model.index(1, 0), u'x'))
+
+
+if __name__ == '__main__':
+    import unittest
+    unittest.main()
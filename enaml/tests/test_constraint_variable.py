@@ -0,0 +1,124 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from unittest import TestCase
+
+from enaml.layout.constraint_variable import (
+    ConstraintVariable, LinearSum, flatten_constraints,
+)
+
+
+class TestFlattenConstraints(TestCase):
+    """ Test the flat serialization of symbolic constraints.
+
+    """
+    def setUp(self):
+        self.left = ConstraintVariable('left', 'a')
+        self.width = ConstraintVariable('width', 'a')
+        self.other = ConstraintVariable('left', 'b')
+
+    def test_variable_table(self):
+        """ Test that variables are shared between constraints.
+
+        """
+        cns = [
+            self.left + self.width == self.other,
+            self.other >= self.left + 10,
+        ]
+        info = flatten_constraints(cns)
+        self.assertEqual(
+            sorted(info['variables']),
+            [('a', 'left'), ('a', 'width'), ('b', 'left')],
+        )
+        self.assertEqual(len(info['constraints']), 2)
+
+    def test_normalized_form(self):
+        """ Test that the rhs is moved to the lhs of the constraint.
+
+        """
+        cn = (2 * self.left + 5 <= self.width - 3) | 'strong' | 0.5
+        info = flatten_constraints([cn])
+        op, strength, weight, constant, pairs = info['constraints'][0]
+        self.assertEqual(op, '<=')
+        self.assertEqual(strength, 'strong')
+        self.assertEqual(weight, 0.5)
+        self.assertEqual(constant, 8.0)
+        self.assertEqual(pairs, [0, 2.0, 1, -1.0])
+
+    def test_cancelled_terms(self):
+        """ Test that terms which cancel out are dropped.
+
+        """
+        cn = self.left + self.width == self.left + 10
+        info = flatten_constraints([cn])
+        pairs = info['constraints'][0][4]
+        variables = info['variables']
+        self.assertEqual(len(pairs), 2)
+        self.assertEqual(variables[pairs[0]], ('a', 'width'))
+        self.assertEqual(pairs[1], 1.0)
+
+    def test_empty(self):
+        """ Test flattening an empty list of constraints.
+
+        """
+        info = flatten_constraints([])
+        self.assertEqual(info, {'variables': [], 'constraints': []})
+
+
+class TestLinearSum(TestCase):
+    """ Test the in place accumulation of linear expressions.
+
+    """
+    def setUp(self):
+        self.x = ConstraintVariable('x', 'a')
+        self.y = ConstraintVariable('y', 'a')
+
+    def coeffs(self, expr):
+        return dict((term.var.name, term.coeff) for term in expr.terms)
+
+    def test_accumulate(self):
+        """ Test that terms of the same variable are combined.
+
+        """
+        builder = LinearSum()
+        for i in range(10):
+            builder += self.x
+            builder += 2 * self.y
+        builder += 5
+        expr = builder.expression()
+        self.assertEqual(self.coeffs(expr), {'x': 10.0, 'y': 20.0})
+        self.assertEqual(expr.constant, 5.0)
+
+    def test_cancelled_terms(self):
+        """ Test that terms which cancel out are dropped.
+
+        """
+        builder = LinearSum()
+        builder.add(self.x + self.y + 3)
+        builder.add(self.x, -1.0)
+        expr = builder.expression()
+        self.assertEqual(self.coeffs(expr), {'y': 1.0})
+        self.assertEqual(expr.constant, 3.0)
+
+    def test_expression_add(self):
+        """ Test that the symbolic operators yield reduced terms.
+
+        """
+        expr = (self.x + self.y) + (self.x - self.y) + 2 * self.x
+        self.assertEqual(self.coeffs(expr), {'x': 4.0})
+        expr = self.x - self.x
+        self.assertEqual(expr.terms, ())
+        expr = 0 * self.x + self.y
+        self.assertEqual(self.coeffs(expr), {'y': 1.0})
+
+    def test_as_dict(self):
+        """ Test the dict of a constraint.
+
+        """
+        cn = self.x + 10 == self.y
+        dct = cn.as_dict()
+        self.assertEqual(dct['type'], 'linear_constraint')
+        self.assertEqual(dct['op'], '==')
+        self.assertEqual(dct['strength'], 'required')
+        self.assertEqual(dct['lhs']['constant'], 10.0)
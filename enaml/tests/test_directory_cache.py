@@ -0,0 +1,214 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+from threading import Event
+from unittest import TestCase, skipIf
+
+from enaml.stdlib.old.directory_cache import DirectoryCache, directory_mtime
+from enaml.stdlib.old.directory_watcher import (
+    DirectoryChanges, InotifyWatcher, PollingWatcher, inotify_available,
+)
+from enaml.stdlib.old.flat_file_system_model import FlatFileSystemModel
+
+
+class TestDirectoryCache(TestCase):
+    """ Test the validation and bounds of a DirectoryCache.
+
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = DirectoryCache(max_entries=3)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_hit_and_miss(self):
+        """ Test that a listing is returned while the directory is
+        unchanged.
+
+        """
+        path = self.directory
+        records = [(False, 'a')]
+        self.assertEqual(self.cache.lookup(path), None)
+        self.cache.store(path, directory_mtime(path), records)
+        self.assertTrue(self.cache.lookup(path) is records)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_stale(self):
+        """ Test that a listing is dropped when the mtime differs.
+
+        """
+        path = self.directory
+        self.cache.store(path, directory_mtime(path) - 10, [(False, 'a')])
+        self.assertEqual(self.cache.lookup(path), None)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_bounded(self):
+        """ Test that the least recently used listings are evicted.
+
+        """
+        cache = self.cache
+        paths = []
+        for name in ('a', 'b', 'c'):
+            path = os.path.join(self.directory, name)
+            os.mkdir(path)
+            paths.append(path)
+        cache.store(paths[0], directory_mtime(paths[0]), [(False, 'x')])
+        cache.store(paths[1], directory_mtime(paths[1]), [(False, 'x')])
+        cache.lookup(paths[0])
+        cache.store(paths[2], directory_mtime(paths[2]), [(False, 'x')] * 2)
+        self.assertEqual(cache.num_entries, 3)
+        self.assertEqual(cache.lookup(paths[1]), None)
+        self.assertNotEqual(cache.lookup(paths[0]), None)
+        cache.store(paths[1], directory_mtime(paths[1]), [(False, 'x')] * 4)
+        self.assertEqual(cache.lookup(paths[1]), None)
+
+
+class TestDirectoryWatcher(TestCase):
+    """ Test the change reports of the directory watchers.
+
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.changes = []
+        self.received = Event()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def post(self, callback, *args):
+        callback(*args)
+
+    def on_change(self, changes):
+        self.changes.append(changes)
+        self.received.set()
+
+    def test_update(self):
+        """ Test the difference of two snapshots.
+
+        """
+        records = [(False, 'a'), (False, 'b'), (True, 'c')]
+        watcher = PollingWatcher(
+            self.directory, None, records, self.on_change, self.post,
+        )
+        watcher.update({'a': False, 'd': False, 'c': True}, 1.0)
+        self.assertEqual(self.changes, [
+            DirectoryChanges([(False, 'd')], ['b'], [], 1.0),
+        ])
+
+    def test_patch_rename(self):
+        """ Test that a matched rename is reported as such.
+
+        """
+        records = [(False, 'a'), (False, 'b')]
+        watcher = PollingWatcher(
+            self.directory, None, records, self.on_change, self.post,
+        )
+        watcher.patch({'a': None, 'z': False, 'b': None}, 1.0, [('a', 'z')])
+        self.assertEqual(self.changes, [
+            DirectoryChanges([], ['b'], [('a', 'z')], 1.0),
+        ])
+
+    def test_cancel(self):
+        """ Test that a cancelled watcher delivers nothing.
+
+        """
+        watcher = PollingWatcher(
+            self.directory, None, [], self.on_change, self.post,
+        )
+        watcher.cancel()
+        watcher.update({'a': False}, 1.0)
+        self.assertEqual(self.changes, [])
+
+    @skipIf(not inotify_available(), 'inotify is not available')
+    def test_inotify(self):
+        """ Test that inotify reports a new file and a rename.
+
+        """
+        path = self.directory
+        watcher = InotifyWatcher(
+            path, directory_mtime(path), [], self.on_change, self.post,
+        )
+        watcher.start()
+        try:
+            open(os.path.join(path, 'a'), 'w').close()
+            self.assertTrue(self.received.wait(5.0))
+            self.received.clear()
+            os.rename(os.path.join(path, 'a'), os.path.join(path, 'b'))
+            self.assertTrue(self.received.wait(5.0))
+        finally:
+            watcher.cancel()
+        self.assertEqual(self.changes[0].added, [(False, 'a')])
+        self.assertEqual(self.changes[1].renamed, [('a', 'b')])
+
+
+class TestFileSystemModelChanges(TestCase):
+    """ Test that a FlatFileSystemModel applies changes in place.
+
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name in ('a.txt', 'b.txt', 'c.txt', 'd.py'):
+            open(os.path.join(self.directory, name), 'w').close()
+        self.model = FlatFileSystemModel(
+            self.directory, file_pattern=r'.*\.txt', asynchronous=False,
+            watch=None,
+        )
+        self.events = []
+        self.model.rows_removed.connect(
+            lambda event: self.events.append(('removed',) + event[1:])
+        )
+        self.model.rows_inserted.connect(
+            lambda event: self.events.append(('inserted',) + event[1:])
+        )
+        self.model.model_reset.connect(
+            lambda *args: self.events.append(('reset',))
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def names(self):
+        model = self.model
+        return sorted(
+            model.data(model.index(row, 0))
+            for row in range(1, model.row_count(None))
+        )
+
+    def test_cached_navigation(self):
+        """ Test that returning to a directory is served from the cache.
+
+        """
+        model = self.model
+        cache = model._cache
+        os.mkdir(os.path.join(self.directory, 'sub'))
+        cache.clear()
+        model.chdir('sub')
+        model.chdir(os.pardir)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+        model.chdir('sub')
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_apply_changes(self):
+        """ Test that changes update the rows without a reset.
+
+        """
+        model = self.model
+        changes = DirectoryChanges(
+            [(False, 'e.txt'), (False, 'f.py')], ['b.txt', 'c.txt'],
+            [('a.txt', 'a.py'), ('d.py', 'd.txt')], 1.0,
+        )
+        model._apply_changes(changes)
+        self.assertEqual(self.names(), ['d.txt', 'e.txt'])
+        self.assertFalse(('reset',) in self.events)
+        kinds = [event[0] for event in self.events]
+        self.assertEqual(kinds, ['removed', 'inserted'])
+        records = sorted(model._cache._listings[model.getcwd()][1])
+        self.assertEqual(records, [
+            (False, 'a.py'), (False, 'd.txt'), (False, 'e.txt'),
+            (False, 'f.py'),
+        ])
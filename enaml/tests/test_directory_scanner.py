@@ -0,0 +1,96 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from enaml.stdlib.old.directory_scanner import DirectoryScanner, iter_directory
+from enaml.stdlib.old.flat_file_system_model import FlatFileSystemModel
+
+
+class TestDirectoryScanner(TestCase):
+    """ Test the batching and cancellation of a DirectoryScanner.
+
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name in ('a.txt', 'b.py', 'c.txt', '.hidden'):
+            open(os.path.join(self.directory, name), 'w').close()
+        os.mkdir(os.path.join(self.directory, 'sub'))
+        self.posted = []
+        self.batches = []
+        self.done = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def post(self, callback, *args):
+        self.posted.append((callback, args))
+
+    def drain(self):
+        for callback, args in self.posted:
+            callback(*args)
+        del self.posted[:]
+
+    def make_scanner(self, path=None, **kwargs):
+        return DirectoryScanner(
+            path or self.directory, lambda is_dir, name: True,
+            self.batches.append, self.done.append, self.post, **kwargs
+        )
+
+    def test_iter_directory(self):
+        """ Test that the entries are reported with their type.
+
+        """
+        records = sorted(iter_directory(self.directory))
+        self.assertEqual(records, [
+            (False, '.hidden'), (False, 'a.txt'), (False, 'b.py'),
+            (False, 'c.txt'), (True, 'sub'),
+        ])
+
+    def test_batches(self):
+        """ Test that the entries are delivered in bounded batches.
+
+        """
+        self.make_scanner(batch_size=2, batch_interval=3600).run()
+        self.assertEqual(self.batches, [])
+        self.drain()
+        self.assertEqual([len(batch) for batch in self.batches], [2, 2, 1])
+        self.assertEqual(self.done, [None])
+
+    def test_cancel(self):
+        """ Test that posted batches are dropped after a cancel.
+
+        """
+        scanner = self.make_scanner(batch_size=2)
+        scanner.run()
+        scanner.cancel()
+        self.drain()
+        self.assertEqual(self.batches, [])
+        self.assertEqual(self.done, [])
+
+    def test_error(self):
+        """ Test that a failed read is reported on completion.
+
+        """
+        path = os.path.join(self.directory, 'missing')
+        self.make_scanner(path).run()
+        self.drain()
+        self.assertEqual(self.batches, [])
+        self.assertTrue(isinstance(self.done[0], OSError))
+
+    def test_model_filters(self):
+        """ Test that a synchronous model applies its filters.
+
+        """
+        model = FlatFileSystemModel(
+            self.directory, file_pattern=r'.*\.txt', asynchronous=False,
+        )
+        names = [model.data(model.index(row, 0))
+                 for row in range(model.row_count(None))]
+        self.assertEqual(names[0], os.pardir)
+        self.assertEqual(sorted(names[1:]), ['a.txt', 'c.txt', 'sub'])
+        self.assertFalse(model.is_loading())
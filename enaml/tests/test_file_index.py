@@ -0,0 +1,111 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from enaml.stdlib.old.file_index import FileIndex
+
+
+class TestFileIndex(TestCase):
+    """ Test the queries and updates of a FileIndex.
+
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.tree = os.path.join(self.directory, 'tree')
+        for path in ('docs', 'docs/api', 'src', '.git'):
+            os.makedirs(os.path.join(self.tree, path))
+        for path in ('docs/Readme.txt', 'docs/api/readme.rst', 'src/read.py',
+                     'src/setup.py', 'notes.txt', '.git/readme'):
+            self.touch(path)
+        self.filename = os.path.join(self.directory, 'files.idx')
+        self.index = FileIndex(self.filename, [self.tree])
+        self.index.update()
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def touch(self, path):
+        open(os.path.join(self.tree, path), 'w').close()
+
+    def names(self, paths):
+        return [os.path.relpath(path, self.tree) for path in paths]
+
+    def test_prefix(self):
+        """ Test a case insensitive prefix search in name order.
+
+        """
+        self.assertEqual(self.names(self.index.search('READ')), [
+            'src/read.py', 'docs/api/readme.rst', 'docs/Readme.txt',
+        ])
+        self.assertEqual(self.names(self.index.search('read', limit=1)), [
+            'src/read.py',
+        ])
+
+    def test_substring(self):
+        """ Test a substring search.
+
+        """
+        paths = self.index.search('.py', substring=True)
+        self.assertEqual(self.names(paths), ['src/read.py', 'src/setup.py'])
+        self.assertEqual(self.index.search('zz', substring=True), [])
+
+    def test_under(self):
+        """ Test that a search is restricted to a directory.
+
+        """
+        docs = os.path.join(self.tree, 'docs')
+        paths = self.index.search('read', under=docs)
+        self.assertEqual(
+            self.names(paths), ['docs/api/readme.rst', 'docs/Readme.txt'],
+        )
+        paths = self.index.search('', under=self.tree, dirs_only=True)
+        self.assertEqual(self.names(paths), ['docs/api', 'docs', 'src'])
+
+    def test_incremental(self):
+        """ Test that an update only reads the changed directories.
+
+        """
+        index = self.index
+        self.assertEqual((index.num_listed, index.num_reused), (4, 0))
+        self.touch('docs/api/readme2.rst')
+        index.update()
+        self.assertEqual((index.num_listed, index.num_reused), (1, 3))
+        self.assertEqual(len(index.search('readme2')), 1)
+
+    def test_reopen(self):
+        """ Test that the index is persistent and is not rewritten when
+        nothing has changed.
+
+        """
+        self.index.close()
+        inode = os.stat(self.filename).st_ino
+        self.index = FileIndex(self.filename, [self.tree])
+        self.assertEqual(self.index.num_entries, 8)
+        self.index.update()
+        self.assertEqual(os.stat(self.filename).st_ino, inode)
+
+    def test_background_update(self):
+        """ Test that a background update is installed through the post
+        callable.
+
+        """
+        posted = []
+        done = []
+        self.touch('src/new.py')
+        self.index.start_update(
+            lambda callback, *args: posted.append((callback, args)),
+            done.append,
+        )
+        self.index._update_thread.join(5.0)
+        self.assertEqual(self.index.search('new'), [])
+        callback, args = posted[0]
+        callback(*args)
+        self.assertEqual(done, [None])
+        self.assertFalse(self.index.is_updating())
+        self.assertEqual(self.names(self.index.search('new')), ['src/new.py'])
@@ -0,0 +1,178 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import fnmatch
+import os
+import re
+import shutil
+import tempfile
+from unittest import TestCase
+
+from enaml.stdlib.old.file_pattern import FilePattern
+from enaml.stdlib.old.flat_file_system_model import FlatFileSystemModel
+
+
+NAMES = [
+    'a.txt', 'B.TXT', 'abc', 'xabcx', 'readme', 'setup.py', 'a.b.c', '',
+    'Abc.Txt', '.hidden', 'ab', 'txt',
+]
+
+
+class TestFilePattern(TestCase):
+    """ Test the fast paths and refinements of a FilePattern.
+
+    """
+    def test_regex_kinds(self):
+        """ Test that literal regexes use the fast paths and match as
+        re.match does.
+
+        """
+        kinds = {
+            '.*': 'all', 'ab': 'prefix', 'ab.*': 'prefix',
+            '.*txt': 'substring', r'.*\.txt$': 'suffix', 'abc$': 'exact',
+            'a|b': 'regex', 'a.*$': 'regex',
+        }
+        for pattern, kind in kinds.iteritems():
+            matcher = FilePattern(pattern)
+            self.assertEqual(matcher.kind, kind)
+            for name in NAMES:
+                expected = re.match(pattern, name, re.IGNORECASE) is not None
+                self.assertEqual(matcher.match(name), expected)
+
+    def test_glob_kinds(self):
+        """ Test that star-only globs use the fast paths and match as
+        fnmatch does.
+
+        """
+        kinds = {
+            '*': 'all', '*.txt': 'suffix', 'a*': 'prefix', '*b*': 'substring',
+            'a*b*c': 'segments', 'abc': 'exact', '?bc': 'regex',
+        }
+        for pattern, kind in kinds.iteritems():
+            matcher = FilePattern(pattern, 'glob')
+            self.assertEqual(matcher.kind, kind)
+            regex = re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+            for name in NAMES:
+                expected = regex.match(name) is not None
+                self.assertEqual(matcher.match(name), expected)
+
+    def test_refines(self):
+        """ Test the refinements of typed patterns.
+
+        """
+        self.assertTrue(FilePattern('abc').refines(FilePattern('ab')))
+        self.assertTrue(FilePattern('.*abc').refines(FilePattern('.*b')))
+        self.assertTrue(FilePattern('ab').refines(FilePattern('.*b')))
+        self.assertTrue(FilePattern('a|b').refines(FilePattern('.*')))
+        self.assertFalse(FilePattern('ab').refines(FilePattern('abc')))
+        self.assertFalse(FilePattern('a|b').refines(FilePattern('a|')))
+        self.assertTrue(
+            FilePattern('a*b*c', 'glob').refines(FilePattern('*c', 'glob'))
+        )
+
+
+class TestFileSystemModelFilter(TestCase):
+    """ Test that a FlatFileSystemModel filters its listing in memory.
+
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name in ('apple', 'apricot', 'banana', 'avocado', 'cherry'):
+            open(os.path.join(self.directory, name), 'w').close()
+        self.model = FlatFileSystemModel(
+            self.directory, asynchronous=False, watch=None,
+        )
+        # Pin the order of the listing, which is the order of the rows.
+        model = self.model
+        model._records.sort()
+        model._contents[1:] = model._filter_records(model._records)
+        self.events = []
+        for name in ('rows_removed', 'rows_inserted'):
+            getattr(self.model, name).connect(
+                lambda event, name=name: self.events.append(
+                    (name,) + tuple(event[1:])
+                )
+            )
+        self.model.model_reset.connect(
+            lambda *args: self.events.append(('reset',))
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def names(self):
+        model = self.model
+        return [
+            model.data(model.index(row, 0))
+            for row in range(1, model.row_count(None))
+        ]
+
+    def test_narrow(self):
+        """ Test that a refined pattern removes ranges of rows.
+
+        """
+        self.model.file_pattern = 'a'
+        self.assertEqual(self.names(), ['apple', 'apricot', 'avocado'])
+        self.model.file_pattern = 'ap'
+        self.assertEqual(self.names(), ['apple', 'apricot'])
+        self.assertEqual(self.events, [
+            ('rows_removed', 4, 5), ('rows_removed', 3, 3),
+        ])
+
+    def test_widen(self):
+        """ Test that a wider pattern inserts rows in listing order.
+
+        """
+        self.model.file_pattern = 'ap'
+        del self.events[:]
+        self.model.file_pattern = '.*a'
+        self.assertEqual(
+            self.names(), ['apple', 'apricot', 'avocado', 'banana']
+        )
+        self.assertEqual(self.events, [('rows_inserted', 3, 4)])
+
+    def test_replace(self):
+        """ Test that the rows of a replacing pattern are placed after
+        the entries which are filtered out before and after the change.
+
+        """
+        open(os.path.join(self.directory, '.hidden'), 'w').close()
+        self.model.chdir(self.directory)
+        self.model._records.sort()
+        self.model.file_pattern = 'b'
+        del self.events[:]
+        self.model.file_pattern = 'c'
+        self.assertEqual(self.names(), ['cherry'])
+        self.assertEqual(self.events, [
+            ('rows_removed', 1, 1), ('rows_inserted', 1, 1),
+        ])
+        del self.events[:]
+        self.model.show_hidden = True
+        self.model.file_pattern = '.*'
+        self.assertEqual(self.names(), [
+            '.hidden', 'apple', 'apricot', 'avocado', 'banana', 'cherry',
+        ])
+        self.assertEqual(self.events, [
+            ('rows_inserted', 1, 5),
+        ])
+
+    def test_hidden(self):
+        """ Test that showing hidden files inserts rows.
+
+        """
+        open(os.path.join(self.directory, '.config'), 'w').close()
+        self.model.chdir(self.directory)
+        del self.events[:]
+        self.model.show_hidden = True
+        self.assertTrue('.config' in self.names())
+        self.assertEqual(self.events[0][0], 'rows_inserted')
+
+    def test_reset_limit(self):
+        """ Test that a change with many ranges resets the model.
+
+        """
+        self.model.max_filter_ranges = 1
+        self.model.file_pattern = '.*c'
+        self.assertEqual(self.names(), ['apricot', 'avocado', 'cherry'])
+        self.assertEqual(self.events, [('reset',)])
@@ -0,0 +1,51 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from unittest import TestCase
+
+from enaml.layout.frame_throttle import FrameThrottle
+
+
+class TestFrameThrottle(TestCase):
+    """ Test the coalescing of resize solves by a FrameThrottle.
+
+    """
+    def setUp(self):
+        self.now = 10.0
+        self.solves = []
+        self.scheduled = []
+        self.throttle = FrameThrottle(
+            0.02, lambda: self.solves.append(self.now),
+            lambda ms, cb: self.scheduled.append((ms, cb)),
+            clock=lambda: self.now,
+        )
+
+    def test_immediate_solve(self):
+        """ Test that a request outside of the budget is solved at once.
+
+        """
+        self.throttle.request()
+        self.assertEqual(self.solves, [10.0])
+        self.assertEqual(self.scheduled, [])
+
+    def test_coalesced_requests(self):
+        """ Test that a burst of requests results in a final solve.
+
+        """
+        self.throttle.request()
+        for i in range(5):
+            self.now += 0.001
+            self.throttle.request()
+        self.assertEqual(len(self.solves), 1)
+        self.assertEqual(len(self.scheduled), 1)
+
+        ms, callback = self.scheduled[0]
+        self.assertTrue(0 < ms <= 21)
+        self.now += 0.02
+        callback()
+        self.assertEqual(len(self.solves), 2)
+
+        stats = self.throttle.stats()
+        self.assertEqual(stats['frames'], 2)
+        self.assertEqual(stats['coalesced'], 4)
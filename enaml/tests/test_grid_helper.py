@@ -0,0 +1,181 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from unittest import TestCase
+
+from casuarius import ConstraintVariable as Variable
+
+from enaml.layout.ab_constrainable import ABConstrainable
+from enaml.layout.box_model import BoxModel
+from enaml.layout.layout_helpers import GridHelper
+from enaml.layout.layout_manager import LayoutManager
+from enaml.layout.constraint_variable import ConstraintVariable
+
+
+class Cell(BoxModel):
+    """ A constrainable box for the cells of a test grid.
+
+    """
+    __slots__ = ()
+
+
+ABConstrainable.register(Cell)
+
+
+def solve(helper, sizes, width, height):
+    """ Solve the layout of a grid helper for a given size.
+
+    Parameters
+    ----------
+    helper : GridHelper
+        The grid helper to solve.
+
+    sizes : list of (Cell, width, height)
+        The cells of the grid with their fixed sizes. A width of None
+        indicates that the cell only prefers a width of 60, so that it
+        is stretched by the grid.
+
+    width, height : int
+        The size of the grid.
+
+    Returns
+    -------
+    result : list of tuple
+        The solved (x, y, width, height) geometry of every cell.
+
+    """
+    cns = list(helper.get_constraints(None))
+    cells = []
+    for cell, cell_width, cell_height in sizes:
+        cells.append(cell)
+        if cell_width is None:
+            cns.append((cell.width == 60) | 'weak')
+        else:
+            cns.append(cell.width == cell_width)
+        cns.append(cell.height == cell_height)
+    cns.append(helper.left == 0)
+    cns.append(helper.top == 0)
+
+    variables = {}
+    def convert(symbolic):
+        if isinstance(symbolic, ConstraintVariable):
+            key = (symbolic.owner, symbolic.name)
+            var = variables.get(key)
+            if var is None:
+                var = variables[key] = Variable('%s|%s' % key)
+            return var
+        if hasattr(symbolic, 'terms'):
+            res = symbolic.constant
+            for term in symbolic.terms:
+                res = res + term.coeff * convert(term.var)
+            return res
+        return symbolic.coeff * convert(symbolic.var)
+
+    solver_cns = []
+    for cn in cns:
+        expr = convert(cn.lhs) - convert(cn.rhs)
+        if cn.op == '==':
+            scn = expr == 0
+        elif cn.op == '<=':
+            scn = expr <= 0
+        else:
+            scn = expr >= 0
+        solver_cns.append(scn | cn.strength | cn.weight)
+
+    manager = LayoutManager()
+    manager.initialize(solver_cns)
+    geometry = []
+    def update():
+        for cell in cells:
+            geometry.append(tuple(
+                int(round(convert(attr).value)) for attr in (
+                    cell.left, cell.top, cell.width, cell.height,
+                )
+            ))
+    manager.layout(
+        update, convert(helper.width), convert(helper.height),
+        (width, height),
+    )
+    return geometry
+
+
+class TestGridHelper(TestCase):
+    """ Test the geometry solved from the constraints of a GridHelper.
+
+    The cells have fixed sizes and the grids are solved at their
+    natural size, or are only stretched along a single cell, so that
+    the solution of the constraints is unique.
+
+    """
+    def make_grid(self, num_rows, num_cols):
+        cells = [
+            [Cell('cell_%d_%d' % (row, col)) for col in xrange(num_cols)]
+            for row in xrange(num_rows)
+        ]
+        flat = [cell for row in cells for cell in row]
+        return cells, flat
+
+    def test_simple_grid(self):
+        """ Test a fully populated grid with the default spacing.
+
+        """
+        rows, cells = self.make_grid(4, 3)
+        sizes = [(cell, 60, 20) for cell in cells]
+        geometry = solve(GridHelper(*rows), sizes, 200, 110)
+        expected = [
+            (col * 70, row * 30, 60, 20)
+            for row in xrange(4) for col in xrange(3)
+        ]
+        self.assertEqual(geometry, expected)
+
+    def test_stretched_column(self):
+        """ Test that the cells of a single column fill its width.
+
+        """
+        rows, cells = self.make_grid(3, 1)
+        sizes = [(cell, None, 20) for cell in cells]
+        geometry = solve(GridHelper(*rows), sizes, 300, 80)
+        expected = [(0, row * 30, 300, 20) for row in xrange(3)]
+        self.assertEqual(geometry, expected)
+
+    def test_spanning_cells(self):
+        """ Test a grid with cells which span rows and columns.
+
+        """
+        a, b, c, d = [Cell(name) for name in 'abcd']
+        rows = [[a, a, b], [c, None, b], [c, d, d]]
+        sizes = [(a, 130, 20), (b, 60, 50), (c, 60, 50), (d, 130, 20)]
+        geometry = solve(GridHelper(*rows), sizes, 200, 80)
+        expected = [
+            (0, 0, 130, 20), (140, 0, 60, 50),
+            (0, 30, 60, 50), (70, 60, 130, 20),
+        ]
+        self.assertEqual(geometry, expected)
+
+    def test_spacing_and_margins(self):
+        """ Test a grid with custom spacing and margins.
+
+        """
+        rows, cells = self.make_grid(3, 3)
+        helper = GridHelper(
+            *rows, row_spacing=4, column_spacing=20, margins=(5, 10, 15, 20)
+        )
+        sizes = [(cell, 60, 20) for cell in cells]
+        geometry = solve(helper, sizes, 250, 88)
+        expected = [
+            (20 + col * 80, 5 + row * 24, 60, 20)
+            for row in xrange(3) for col in xrange(3)
+        ]
+        self.assertEqual(geometry, expected)
+
+    def test_constraint_count(self):
+        """ Test that the number of constraints is linear in the
+        number of cells.
+
+        """
+        small_rows, _ = self.make_grid(10, 10)
+        large_rows, _ = self.make_grid(20, 20)
+        small = len(GridHelper(*small_rows).get_constraints(None))
+        large = len(GridHelper(*large_rows).get_constraints(None))
+        self.assertTrue(large < 5 * small)
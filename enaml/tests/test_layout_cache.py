@@ -0,0 +1,82 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from enaml.layout.layout_cache import LayoutCache, LayoutCacheEntry
+
+
+class TestLayoutCache(TestCase):
+    """ Test the persistence and invalidation of a LayoutCache.
+
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = LayoutCache(self.directory, max_sizes=2)
+        self.bounds = ((10, 20), (100, 50), (16777215, 16777215))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_entry(self):
+        entry = LayoutCacheEntry(2, self.bounds)
+        entry.record((200, 100), [(0, 0, 50, 20), (60, 0, 140, 20)], 2)
+        return entry
+
+    def test_round_trip(self):
+        """ Test that a stored entry is read back from disk.
+
+        """
+        key = LayoutCache.make_key(('Container', (10, 10, 10, 10)))
+        self.cache.store(key, self.make_entry())
+        entry = LayoutCache(self.directory).load(key)
+        self.assertEqual(entry.num_items, 2)
+        self.assertEqual(entry.size_bounds, self.bounds)
+        self.assertEqual(
+            entry.lookup((200, 100)), [(0, 0, 50, 20), (60, 0, 140, 20)]
+        )
+        self.assertIsNone(entry.lookup((300, 100)))
+
+    def test_key(self):
+        """ Test that keys are equal for equal signatures only.
+
+        """
+        key = LayoutCache.make_key(('a', 1, (2.0, 'b')))
+        self.assertEqual(key, LayoutCache.make_key(('a', 1, (2.0, 'b'))))
+        self.assertNotEqual(key, LayoutCache.make_key(('a', 1, (3.0, 'b'))))
+
+    def test_corrupt_file(self):
+        """ Test that an unreadable file is a miss and is removed.
+
+        """
+        key = LayoutCache.make_key(('corrupt',))
+        path = os.path.join(self.directory, key + '.layout')
+        with open(path, 'wb') as f:
+            f.write('not a layout')
+        self.assertIsNone(self.cache.load(key))
+        self.assertFalse(os.path.exists(path))
+
+    def test_max_sizes(self):
+        """ Test that the least recently stored size is dropped.
+
+        """
+        entry = self.make_entry()
+        geometries = [(0, 0, 1, 1), (1, 1, 1, 1)]
+        entry.record((300, 100), geometries, 2)
+        entry.record((400, 100), geometries, 2)
+        self.assertIsNone(entry.lookup((200, 100)))
+        self.assertEqual(entry.lookup((400, 100)), geometries)
+
+    def test_clear(self):
+        """ Test that clearing the cache removes all entries.
+
+        """
+        key = LayoutCache.make_key(('clear',))
+        self.cache.store(key, self.make_entry())
+        self.cache.clear()
+        self.assertIsNone(self.cache.load(key))
+        self.assertEqual(os.listdir(self.directory), [])
@@ -0,0 +1,75 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from unittest import TestCase
+
+from casuarius import ConstraintVariable
+
+from enaml.layout.layout_manager import LayoutManager
+
+
+class TestLayoutManager(TestCase):
+    """ Test the solves of a LayoutManager against the casuarius solver.
+
+    """
+    def setUp(self):
+        self.width = ConstraintVariable('width')
+        self.height = ConstraintVariable('height')
+        self.child = ConstraintVariable('child')
+        width, height, child = self.width, self.height, self.child
+        self.constraints = [
+            width >= 50, width <= 400, height >= 20,
+            child == width - 20, (child == 80) | 'weak',
+        ]
+        self.manager = LayoutManager()
+        self.manager.initialize(self.constraints)
+
+    def test_size_cache(self):
+        """ Test that the min and max sizes are cached until the
+        constraints change.
+
+        """
+        manager = self.manager
+        width, height = self.width, self.height
+        self.assertEqual(manager.get_min_size(width, height), (50, 20))
+        self.assertEqual(manager.get_max_size(width, height), (400, -1))
+        self.assertEqual(manager.get_min_size(width, height), (50, 20))
+        self.assertEqual(manager.get_max_size(width, height), (400, -1))
+        counts = manager.solve_counts
+        self.assertEqual((counts['min_size'], counts['max_size']), (1, 1))
+        self.assertEqual(counts['size_cache_hits'], 2)
+        manager.replace_constraints([self.constraints[0]], [width >= 60])
+        self.assertEqual(manager.get_min_size(width, height), (60, 20))
+        self.assertEqual(counts['min_size'], 2)
+
+    def test_layout(self):
+        """ Test that a layout solves for the suggested size, within the
+        bounds of the constraints.
+
+        """
+        manager = self.manager
+        width, height, child = self.width, self.height, self.child
+        values = []
+        callback = lambda: values.append((width.value, child.value))
+        for size in [(200, 100), (300, 100), (1000, 100), (10, 10)]:
+            manager.layout(callback, width, height, size)
+        self.assertEqual(
+            values, [(200, 180), (300, 280), (400, 380), (50, 30)],
+        )
+        self.assertEqual(manager.solve_counts['layout'], 4)
+
+    def test_layout_after_replace(self):
+        """ Test that a layout after a constraint replacement and a size
+        computation solves against the new constraints.
+
+        """
+        manager = self.manager
+        width, height = self.width, self.height
+        values = []
+        callback = lambda: values.append(width.value)
+        manager.layout(callback, width, height, (500, 100))
+        manager.replace_constraints([self.constraints[1]], [width <= 250])
+        manager.get_min_size(width, height)
+        manager.layout(callback, width, height, (500, 100))
+        self.assertEqual(values, [400, 250])
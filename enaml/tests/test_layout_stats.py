@@ -0,0 +1,99 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from unittest import TestCase
+
+from enaml.layout.layout_stats import (
+    LayoutStats, LayoutStatsLogger, format_stats,
+)
+
+
+class FakeWidget(object):
+    """ A stand-in for a client widget which handles a relayout.
+
+    """
+    def object_id(self):
+        return 'widget_id'
+
+
+class FakeLogger(object):
+
+    def __init__(self):
+        self.messages = []
+
+    def info(self, msg):
+        self.messages.append(msg)
+
+
+def container_stats(constraints, layouts):
+    return {
+        'object_id': 'container_id',
+        'items': 4,
+        'constraints': constraints,
+        'counts': {'layout': layouts, 'replace': 1},
+        'times': {'layout': 0.5, 'replace': 0.25},
+        'geometry_applied': 8,
+        'geometry_skipped': 2,
+        'frames': None,
+    }
+
+
+class TestLayoutStats(TestCase):
+    """ Test the collection of the layout instrumentation.
+
+    """
+    def setUp(self):
+        self.stats = LayoutStats(max_events=2)
+
+    def test_relayout_causes(self):
+        """ Test that relayout causes are counted per widget class.
+
+        """
+        widget = FakeWidget()
+        self.stats.record_relayout(widget, ['hug_width'], 0.1)
+        self.stats.record_relayout(widget, ['hug_width', 'padding'], 0.1)
+        self.stats.record_relayout(widget, [], 0.1)
+        snap = self.stats.snapshot([])
+        self.assertEqual(snap['relayouts'], 3)
+        self.assertEqual(snap['relayout_causes'], {
+            ('FakeWidget', 'hug_width'): 2,
+            ('FakeWidget', 'padding'): 1,
+            ('FakeWidget', 'unknown'): 1,
+        })
+        self.assertEqual(len(snap['recent']), 2)
+
+    def test_totals(self):
+        """ Test that the container stats are aggregated.
+
+        """
+        snap = self.stats.snapshot(
+            [container_stats(10, 3), container_stats(5, 2)]
+        )
+        totals = snap['totals']
+        self.assertEqual(totals['solvers'], 2)
+        self.assertEqual(totals['constraints'], 15)
+        self.assertEqual(totals['counts']['layout'], 5)
+        self.assertEqual(totals['counts']['min_size'], 0)
+        self.assertEqual(totals['times']['replace'], 0.5)
+        self.assertEqual(totals['geometry_applied'], 16)
+        self.assertIn('2 solvers, 15 constraints', format_stats(snap))
+
+    def test_periodic_log(self):
+        """ Test that the logger reschedules itself until stopped.
+
+        """
+        scheduled = []
+        logger = FakeLogger()
+        log = LayoutStatsLogger(
+            lambda: self.stats.snapshot([]), 1.0,
+            lambda ms, cb: scheduled.append((ms, cb)), logger,
+        )
+        log.start()
+        self.assertEqual(scheduled[0][0], 1000)
+        scheduled[0][1]()
+        self.assertEqual(len(logger.messages), 1)
+        self.assertEqual(len(scheduled), 2)
+        log.stop()
+        scheduled[1][1]()
+        self.assertEqual(len(logger.messages), 1)
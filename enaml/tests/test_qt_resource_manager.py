@@ -0,0 +1,141 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from unittest import TestCase
+
+from enaml.qt.qt.QtCore import QBuffer, QByteArray, QIODevice
+from enaml.qt.qt.QtGui import QImage
+from enaml.qt.qt_resource import decode_images
+from enaml.qt.qt_resource_manager import QtResourceManager, QtResourceStore
+
+
+def image_resource(width, height):
+    """ Create the dict of an Enaml Image holding a blank PNG.
+
+    """
+    image = QImage(width, height, QImage.Format_ARGB32)
+    image.fill(0)
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.WriteOnly)
+    image.save(buf, 'PNG')
+    buf.close()
+    return {
+        'class': 'Image', 'bases': ['Resource'], 'format': 'png',
+        'size': (-1, -1), 'data': str(data),
+    }
+
+
+class FakeDecoder(object):
+
+    def __init__(self):
+        self.pending = []
+
+    def decode(self, resource, callback):
+        self.pending.append((resource, callback))
+
+
+class TestQtResourceManager(TestCase):
+    """ Test the byte budget and the pins of the client resource cache.
+
+    """
+    def setUp(self):
+        # A 10x10 image at 32 bits per pixel is 400 bytes.
+        self.store = QtResourceStore()
+        self.manager = QtResourceManager(max_bytes=1000, store=self.store)
+        self.requests = []
+
+    def request(self, req_id, url, metadata, etag=None):
+        self.requests.append((req_id, url, etag))
+
+    def load(self, url, owner=None):
+        self.manager.load(url, {}, self.request, owner)
+        if self.requests:
+            req_id, url, etag = self.requests.pop()
+            self.manager.on_load(req_id, url, image_resource(10, 10))
+
+    def test_lru_eviction(self):
+        """ Test that the least recently used handles are evicted.
+
+        """
+        manager = self.manager
+        self.load('image://test/a')
+        self.load('image://test/b')
+        self.load('image://test/a')
+        self.load('image://test/c')
+        stats = manager.stats()
+        self.assertEqual(stats['handles'], 2)
+        self.assertEqual(stats['num_bytes'], 800)
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual((stats['hits'], stats['misses']), (1, 3))
+        self.load('image://test/b')
+        self.assertEqual(manager.stats()['misses'], 4)
+
+    def test_pins(self):
+        """ Test that pinned handles are kept until they are released.
+
+        """
+        manager = self.manager
+        self.load('image://test/a', ('w1', 'icon'))
+        self.load('image://test/b', ('w2', 'icon'))
+        self.load('image://test/c', ('w3', 'icon'))
+        stats = manager.stats()
+        self.assertEqual(stats['handles'], 3)
+        self.assertEqual(stats['pinned_bytes'], 1200)
+        manager.release('w1')
+        self.assertEqual(manager.stats()['handles'], 2)
+        self.load('image://test/d', ('w2', 'icon'))
+        stats = manager.stats()
+        self.assertEqual(stats['handles'], 2)
+        self.assertEqual(stats['pinned_bytes'], 800)
+
+    def test_budget(self):
+        """ Test that a smaller budget evicts immediately.
+
+        """
+        manager = self.manager
+        self.load('image://test/a')
+        self.load('image://test/b')
+        manager.set_max_bytes(400)
+        self.assertEqual(manager.stats()['handles'], 1)
+
+    def test_revalidation(self):
+        """ Test that a stored handle is revalidated by its entity tag.
+
+        """
+        first = QtResourceManager(store=self.store)
+        first.load('image://test/a', {}, self.request)
+        req_id, url, etag = self.requests.pop()
+        self.assertEqual(etag, None)
+        first.on_load(req_id, url, image_resource(10, 10), 'tag')
+        second = QtResourceManager(store=self.store)
+        second.load('image://test/a', {}, self.request)
+        req_id, url, etag = self.requests.pop()
+        self.assertEqual(etag, 'tag')
+        second.on_not_modified(req_id, url)
+        stats = second.stats()
+        self.assertEqual((stats['handles'], stats['revalidated']), (1, 1))
+
+    def test_async_decode(self):
+        """ Test that a large payload is decoded by the decoder and that
+        the loads made meanwhile share the result.
+
+        """
+        decoder = FakeDecoder()
+        manager = QtResourceManager(
+            store=self.store, decoder=decoder, decode_threshold=1,
+        )
+        loaded = []
+        manager.load('image://test/a', {}, self.request).on_load(loaded.append)
+        req_id, url, etag = self.requests.pop()
+        manager.on_load(req_id, url, image_resource(10, 10))
+        manager.load('image://test/a', {}, self.request).on_load(loaded.append)
+        self.assertEqual(self.requests, [])
+        self.assertEqual(loaded, [])
+        resource, callback = decoder.pending.pop()
+        callback(decode_images(resource))
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual(loaded[0].size().width(), 10)
+        stats = manager.stats()
+        self.assertEqual((stats['handles'], stats['decoded_async']), (1, 1))
@@ -0,0 +1,183 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from unittest import TestCase
+
+from enaml.image_provider import Image, ImageProvider
+from enaml.resource_cache import (
+    ResourceCache, freeze_metadata, snapshot_etag,
+)
+from enaml.resource_manager import ResourceManager
+
+
+class FakeResource(object):
+
+    def __init__(self, data):
+        self.data = data
+
+    def snapshot(self):
+        return {'class': 'Image', 'format': 'png', 'data': self.data}
+
+
+class FakeImageProvider(ImageProvider):
+
+    def __init__(self, shared=False):
+        self.shared = shared
+        self.pending = []
+
+    def request_image(self, path, size, callback):
+        self.pending.append((path, callback))
+
+
+class FakeReply(object):
+
+    def __init__(self, replies):
+        self.replies = replies
+
+    def send_snapshot(self, snapshot, etag):
+        self.replies.append(snapshot)
+
+
+class TestResourceCache(TestCase):
+    """ Test the sharing, expiry and eviction of a ResourceCache.
+
+    """
+    def setUp(self):
+        self.now = 100.0
+        self.cache = ResourceCache(
+            max_entries=2, max_bytes=100, ttl=10.0, clock=lambda: self.now,
+        )
+        self.loads = []
+        self.replies = []
+
+    def load(self, reply):
+        self.loads.append(reply)
+
+    def request(self, url, metadata=None):
+        key = (url, freeze_metadata(metadata or {}))
+        self.cache.request(
+            key, lambda *args: self.replies.append(args), self.load,
+        )
+
+    def test_coalesce(self):
+        """ Test that concurrent requests share a single load.
+
+        """
+        self.request('image://a', {'size': [16, 16]})
+        self.request('image://a', {'size': (16, 16)})
+        self.assertEqual(len(self.loads), 1)
+        self.loads[0](FakeResource('abc'))
+        self.assertEqual(len(self.replies), 2)
+        snapshot, etag = self.replies[0]
+        self.assertEqual(etag, snapshot_etag(snapshot))
+        self.request('image://a', {'size': (16, 16)})
+        self.assertEqual(len(self.loads), 1)
+        self.assertEqual(self.replies[2], self.replies[0])
+
+    def test_failure(self):
+        """ Test that a failed load is reported and not cached.
+
+        """
+        self.request('image://a')
+        self.loads.pop()(None)
+        self.assertEqual(self.replies, [(None, None)])
+        self.request('image://a')
+        self.assertEqual(len(self.loads), 1)
+
+    def test_ttl(self):
+        """ Test that an expired entry is loaded again with the same tag
+        for the same content.
+
+        """
+        self.request('image://a')
+        self.loads.pop()(FakeResource('abc'))
+        self.now += 11.0
+        self.request('image://a')
+        self.assertEqual(len(self.loads), 1)
+        self.loads.pop()(FakeResource('abc'))
+        self.assertEqual(self.replies[0][1], self.replies[1][1])
+
+    def test_limits(self):
+        """ Test that the least recently used entries are evicted.
+
+        """
+        cache = self.cache
+        for url in ('image://a', 'image://b', 'image://a', 'image://c'):
+            self.request(url)
+            if self.loads:
+                self.loads.pop()(FakeResource('x' * 10))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.request('image://b')
+        self.assertEqual(len(self.loads), 1)
+        self.loads.pop()(FakeResource('x' * 200))
+        self.assertEqual(len(cache), 2)
+
+    def test_etag(self):
+        """ Test that the tag depends on the content only.
+
+        """
+        a = {'data': 'abc', 'format': 'png', 'images': [{'data': u'x'}]}
+        b = {'images': [{'data': u'x'}], 'format': 'png', 'data': 'abc'}
+        self.assertEqual(snapshot_etag(a), snapshot_etag(b))
+        b['data'] = 'abd'
+        self.assertNotEqual(snapshot_etag(a), snapshot_etag(b))
+
+
+class TestResourceManagerCache(TestCase):
+    """ Test the sharing of the resources of the providers of several
+    resource managers through a cache.
+
+    """
+    def setUp(self):
+        self.cache = ResourceCache()
+        self.replies = []
+
+    def manager(self, provider):
+        manager = ResourceManager(cache=self.cache)
+        manager.image_providers['test'] = provider
+        return manager
+
+    def load(self, manager, url='image://test/a'):
+        manager.load(url, {}, FakeReply(self.replies))
+
+    def test_provider_identity(self):
+        """ Test that the managers only share the resources of a
+        provider which is not shared if they share the provider object.
+
+        """
+        provider = FakeImageProvider()
+        other = FakeImageProvider()
+        self.load(self.manager(provider))
+        provider.pending.pop()[1](Image(format='png', data='a'))
+        self.load(self.manager(other))
+        self.assertEqual(len(other.pending), 1)
+        self.load(self.manager(provider))
+        self.assertEqual(provider.pending, [])
+        self.assertEqual(len(self.replies), 2)
+
+    def test_shared_provider(self):
+        """ Test that the resources of shared providers are loaded once
+        for all the managers.
+
+        """
+        provider = FakeImageProvider(shared=True)
+        other = FakeImageProvider(shared=True)
+        self.load(self.manager(provider))
+        provider.pending.pop()[1](Image(format='png', data='a'))
+        self.load(self.manager(other))
+        self.assertEqual(other.pending, [])
+        self.assertEqual(len(self.replies), 2)
+
+    def test_invalidate(self):
+        """ Test that an invalidated resource is loaded again.
+
+        """
+        provider = FakeImageProvider()
+        manager = self.manager(provider)
+        self.load(manager)
+        provider.pending.pop()[1](Image(format='png', data='a'))
+        manager.invalidate('image://test/a')
+        self.load(manager)
+        self.assertEqual(len(provider.pending), 1)
@@ -0,0 +1,152 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+import os
+from Queue import Queue
+import shutil
+import tempfile
+from unittest import TestCase
+
+from enaml.stdlib.old.thumbnail_service import (
+    ThumbnailService, cache_path, thumbnail_key,
+)
+
+
+def fake_scale(path, size):
+    """ A picklable scale function which 'decodes' a text file.
+
+    """
+    with open(path) as handle:
+        data = handle.read()
+    if data == 'bad':
+        return None
+    return '%s@%dx%d' % (data, size[0], size[1])
+
+
+class FakeModel(object):
+
+    def __init__(self):
+        self.batches = []
+
+    def extend(self, thumbs):
+        self.batches.append(thumbs)
+
+
+class TestThumbnailService(TestCase):
+    """ Test the batching and on-disk caching of a ThumbnailService.
+
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.directory, 'cache')
+        self.paths = []
+        for index, text in enumerate(['a', 'b', 'bad', 'c', 'd', 'e']):
+            path = os.path.join(self.directory, '%d.img' % index)
+            with open(path, 'w') as handle:
+                handle.write(text)
+            self.paths.append(path)
+        self.queue = Queue()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def post(self, callback, *args):
+        self.queue.put((callback, args))
+
+    def create_service(self, **kwargs):
+        kwargs.setdefault('processes', 0)
+        kwargs.setdefault('cache_dir', self.cache_dir)
+        service = ThumbnailService(
+            (16, 8), scale=fake_scale, batch_size=2, batch_interval=60.0,
+            post=self.post, **kwargs
+        )
+        self.addCleanup(service.close)
+        return service
+
+    def load(self, service):
+        """ Run a load to completion and return the model batches.
+
+        """
+        model = FakeModel()
+        done = []
+        service.load(model, self.paths, done.append)
+        while not done:
+            callback, args = self.queue.get(timeout=10.0)
+            callback(*args)
+        return model.batches
+
+    def test_batches(self):
+        """ Test that thumbnails are delivered in order and in batches.
+
+        """
+        batches = self.load(self.create_service())
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        thumbs = sum(batches, [])
+        self.assertEqual(
+            [thumb.image.data for thumb in thumbs],
+            ['a@16x8', 'b@16x8', 'c@16x8', 'd@16x8', 'e@16x8'],
+        )
+        self.assertEqual(thumbs[2].name, '3.img')
+        self.assertEqual(thumbs[2].metadata, {'path': self.paths[3]})
+
+    def test_process_pool(self):
+        """ Test that the worker processes produce the same results.
+
+        """
+        batches = self.load(self.create_service(processes=2))
+        thumbs = sum(batches, [])
+        self.assertEqual(
+            [thumb.image.data for thumb in thumbs],
+            ['a@16x8', 'b@16x8', 'c@16x8', 'd@16x8', 'e@16x8'],
+        )
+
+    def test_cache(self):
+        """ Test that a thumbnail is served from the cache until its file
+        changes.
+
+        """
+        service = self.create_service()
+        self.load(service)
+        self.assertEqual(len(service.cache), 5)
+        path = self.paths[0]
+        st = os.stat(path)
+        key = thumbnail_key(path, st.st_mtime, st.st_size, (16, 8))
+        with open(cache_path(self.cache_dir, key), 'w') as handle:
+            handle.write('cached')
+        thumbs = sum(self.load(service), [])
+        self.assertEqual(thumbs[0].image.data, 'cached')
+        os.utime(path, (st.st_atime, st.st_mtime + 10))
+        thumbs = sum(self.load(service), [])
+        self.assertEqual(thumbs[0].image.data, 'a@16x8')
+        self.assertEqual(len(service.cache), 6)
+
+    def test_cache_limits(self):
+        """ Test that the cache evicts the least recently used files.
+
+        """
+        service = self.create_service(max_cache_entries=3)
+        self.load(service)
+        self.assertEqual(len(service.cache), 3)
+        names = os.listdir(self.cache_dir)
+        files = sum(
+            [os.listdir(os.path.join(self.cache_dir, name)) for name in names],
+            [],
+        )
+        self.assertEqual(len(files), 3)
+        service = self.create_service(max_cache_bytes=12)
+        self.assertEqual(len(service.cache), 2)
+        self.assertEqual(service.cache.num_bytes, 12)
+
+    def test_cancel(self):
+        """ Test that a cancelled load delivers nothing.
+
+        """
+        service = self.create_service()
+        model = FakeModel()
+        request = service.load(model, self.paths)
+        callback, args = self.queue.get(timeout=10.0)
+        request.cancel()
+        callback(*args)
+        self.assertEqual(model.batches, [])
+        self.assertFalse(request.done())
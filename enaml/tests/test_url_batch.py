@@ -0,0 +1,99 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from unittest import TestCase
+
+from enaml.image_provider import Image, ImageProvider
+from enaml.resource_cache import ResourceCache
+from enaml.resource_manager import ResourceManager
+from enaml.session import URLReplyBatch
+
+
+class BulkImageProvider(ImageProvider):
+
+    def __init__(self):
+        self.batches = []
+        self.pending = []
+
+    def request_image(self, path, size, callback):
+        self.pending.append((path, callback))
+
+    def request_images(self, requests):
+        self.batches.append([path for path, size, callback in requests])
+        super(BulkImageProvider, self).request_images(requests)
+
+
+class FakeSession(object):
+
+    session_id = 's_0'
+
+    def __init__(self):
+        self.messages = []
+
+    def send(self, object_id, action, content):
+        self.messages.append((action, content))
+
+
+class TestURLBatch(TestCase):
+    """ Test the bulk loading and the streamed replies of a batched url
+    request.
+
+    """
+    def setUp(self):
+        self.provider = BulkImageProvider()
+        self.manager = ResourceManager(cache=ResourceCache())
+        self.manager.image_providers['test'] = self.provider
+        self.session = FakeSession()
+        self.posted = []
+        self.batch = URLReplyBatch(self.session, self.posted.append)
+
+    def request(self, urls):
+        items = []
+        for index, url in enumerate(urls):
+            reply = self.batch.create_reply('r_%d' % index, url)
+            items.append((url, {}, reply))
+        self.manager.load_batch(items)
+
+    def flush(self):
+        while self.posted:
+            self.posted.pop(0)()
+        messages = self.session.messages
+        self.session.messages = []
+        return [
+            [(reply['id'], reply['status']) for reply in content['replies']]
+            for action, content in messages
+        ]
+
+    def test_bulk_load(self):
+        """ Test that a provider is handed its requests at once.
+
+        """
+        self.request(['image://test/a', 'image://test/b', 'icon://x/c'])
+        self.assertEqual(self.provider.batches, [['/a', '/b']])
+        self.assertEqual(self.flush(), [[('r_2', 'fail')]])
+
+    def test_streamed_order(self):
+        """ Test that the ready replies are sent together in request
+        order and the later ones in later messages.
+
+        """
+        self.request(['image://test/a', 'image://test/b', 'image://test/c'])
+        pending = dict(self.provider.pending)
+        pending['/c'](Image(format='png', data='c'))
+        pending['/a'](Image(format='png', data='a'))
+        self.assertEqual(len(self.posted), 1)
+        self.assertEqual(self.flush(), [[('r_0', 'ok'), ('r_2', 'ok')]])
+        pending['/b'](None)
+        self.assertEqual(self.flush(), [[('r_1', 'fail')]])
+
+    def test_cached(self):
+        """ Test that cached resources are replied without a load.
+
+        """
+        self.request(['image://test/a'])
+        self.provider.pending.pop()[1](Image(format='png', data='a'))
+        self.flush()
+        self.request(['image://test/b', 'image://test/a'])
+        self.assertEqual(self.provider.batches[-1], ['/b'])
+        self.assertEqual(self.flush(), [[('r_1', 'ok')]])
@@ -77,6 +77,21 @@ class EnamlTestCase(unittest.TestCase):
 
         return None
 
+    def find_client_object(self, root, type_name):
+        """ A simple function that recursively walks a client object tree
+        until it finds an object of a particular type.
+
+        """
+        if type_name in [cls.__name__ for cls in type(root).__mro__]:
+            return root
+
+        for child in root.children():
+            found = self.find_client_object(child, type_name)
+            if found is not None:
+                return found
+
+        return None
+
     def find_server_widget(self, root, type_name):
         """ A simple function that recursively walks a widget tree until it
         finds a widget of a particular type.
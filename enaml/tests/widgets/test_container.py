@@ -39,6 +39,59 @@ enamldef MainView(Window):
         self.assertTrue(initial_size[0] < no_padding_size[0])
         self.assertTrue(initial_size[1] < no_padding_size[1])
 
+    def test_incremental_relayout(self):
+        """ Test that a relayout with an unchanged widget structure
+        updates the existing layout manager in place.
+        """
+        client_container = self.find_client_object(self.client_view, "QtContainer")
+        manager = client_container._layout_manager
+
+        with self.app.process_events():
+            self.server_widget.hug_height = 'weak'
+
+        self.assertIs(client_container._layout_manager, manager)
+        self.assertEqual(client_container._hug, ('strong', 'weak'))
+
+    def test_cached_size_computation(self):
+        """ Test that refreshing the sizes of a container with unchanged
+        constraints is served from the layout manager's cache.
+        """
+        client_container = self.find_client_object(self.client_view, "QtContainer")
+        manager = client_container._layout_manager
+        counts = dict(manager.solve_counts)
+
+        client_container.refresh_sizes()
+
+        for key in ('min_size', 'max_size'):
+            self.assertEqual(manager.solve_counts[key], counts[key])
+        self.assertTrue(
+            manager.solve_counts['size_cache_hits'] > counts['size_cache_hits']
+        )
+
+    def test_deferred_constraint_replacement(self):
+        """ Test that deferred constraint replacements are coalesced
+        into a single replacement which is flushed by the event loop.
+        """
+        client_container = self.find_client_object(self.client_view, "QtContainer")
+        calls = []
+        original = client_container.replace_constraints
+        def replace_constraints(old_cns, new_cns):
+            calls.append((list(old_cns), list(new_cns)))
+            original(old_cns, new_cns)
+        client_container.replace_constraints = replace_constraints
+
+        width = client_container.layout_box.primitive('width')
+        first = [width >= 0]
+        second = [width >= 1]
+        with self.app.process_events():
+            client_container.defer_replace_constraints([], first)
+            client_container.defer_replace_constraints(first, second)
+        del client_container.replace_constraints
+
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(client_container._pending_cns)
+        client_container.clear_constraints(second)
+
 if __name__ == '__main__':
     import unittest
     unittest.main()
@@ -0,0 +1,95 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from .enaml_test_case import EnamlTestCase
+
+
+class TestFlowArea(EnamlTestCase):
+    """ Unit tests for the FlowArea widget.
+
+    """
+
+    def setUp(self):
+        enaml_source = """
+from enaml.widgets.api import Window, FlowArea, FlowItem, Include
+
+enamldef MainView(Window):
+    initial_size = (400, 300)
+    FlowArea:
+        virtualized = True
+        Include:
+            objects = [
+                FlowItem(preferred_size=(50, 50)) for i in range(500)
+            ]
+"""
+        self.parse_and_create(enaml_source)
+        self.server_area = self.find_server_widget(self.view, "FlowArea")
+        self.client_area = self.find_client_widget(
+            self.client_view, "QtFlowArea"
+        )
+        with self.app.process_events():
+            self.client_view.widget().show()
+
+    def shown_items(self):
+        """ Get the number of flow items with a visible widget.
+
+        """
+        layout = self.client_area.layout()
+        count = 0
+        for idx in xrange(layout.count()):
+            if layout.itemAt(idx).widget().isVisibleTo(self.client_area):
+                count += 1
+        return count
+
+    def test_virtualized(self):
+        """ Test that a virtualized area only shows the visible items.
+        """
+        layout = self.client_area.layout()
+        self.assertTrue(layout.isVirtualized())
+        shown = self.shown_items()
+        self.assertTrue(0 < shown < layout.count())
+
+    def test_set_virtualized(self):
+        """ Test that all items are shown when virtualization is disabled.
+        """
+        with self.app.process_events():
+            self.server_area.virtualized = False
+
+        layout = self.client_area.layout()
+        self.assertFalse(layout.isVirtualized())
+        self.assertEqual(self.shown_items(), layout.count())
+
+    def test_height_for_width_cache(self):
+        """ Test that the height for width results of several widths are
+        cached.
+        """
+        layout = self.client_area.layout()
+        h200 = layout.heightForWidth(200)
+        h400 = layout.heightForWidth(400)
+        self.assertIn(200, layout._hfw_cache)
+        self.assertIn(400, layout._hfw_cache)
+        self.assertEqual(layout.heightForWidth(200), h200)
+        self.assertTrue(h200 > h400)
+
+    def test_incremental_append(self):
+        """ Test that appending an item only reflows the last line.
+        """
+        from enaml.widgets.api import FlowItem
+        with self.app.process_events():
+            self.server_area.virtualized = False
+
+        layout = self.client_area.layout()
+        lines = list(layout._lines)
+        include = self.find_server_widget(self.view, "Include")
+        with self.app.process_events():
+            include.objects = include.objects + [FlowItem()]
+
+        self.assertEqual(layout.count(), 501)
+        for old, new in zip(lines[:-1], layout._lines):
+            self.assertIs(old, new)
+
+
+if __name__ == '__main__':
+    import unittest
+    unittest.main()
@@ -0,0 +1,75 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from enaml.qt.qt_container import QtContainer
+
+from .enaml_test_case import EnamlTestCase
+
+
+class TestLayoutPartition(EnamlTestCase):
+    """ Unit tests for the partitioning of shared container layouts.
+
+    """
+
+    def setUp(self):
+        QtContainer.partition_layout = True
+        self.addCleanup(setattr, QtContainer, 'partition_layout', False)
+        enaml_source = """
+from enaml.widgets.api import Container, Window, Field, Label
+from enaml.layout.api import vbox, hbox, align
+
+enamldef MainView(Window):
+    attr aligned = False
+    Container:
+        constraints << [vbox(inner, field)] + (
+            [align('left', inner_label, field)] if aligned else []
+        )
+        Container:
+            id: inner
+            share_layout = True
+            constraints = [hbox(inner_label, inner_field)]
+            Label:
+                id: inner_label
+                text = 'Inner'
+            Field:
+                id: inner_field
+        Field:
+            id: field
+"""
+        self.parse_and_create(enaml_source)
+        outer = self.find_client_object(self.client_view, "QtContainer")
+        self.outer = outer
+        self.inner = outer.children()[0]
+
+    def test_decoupled_partition(self):
+        """ Test that a shared layout which is only coupled through the
+        outer box of the container is solved by its own layout manager.
+        """
+        self.assertTrue(self.inner._owns_layout)
+        self.assertIsNotNone(self.inner._layout_manager)
+        items = [updater.item for _, updater in self.outer._layout_table]
+        self.assertNotIn(self.inner.children()[0], items)
+
+    def test_coupled_partition(self):
+        """ Test that a constraint which crosses the container boundary
+        merges the shared layout into the system of the owner.
+        """
+        with self.app.process_events():
+            self.view.aligned = True
+
+        self.assertFalse(self.inner._owns_layout)
+        self.assertIs(self.inner._layout_owner, self.outer)
+        items = [updater.item for _, updater in self.outer._layout_table]
+        self.assertIn(self.inner.children()[0], items)
+
+    def test_disabled_partition(self):
+        """ Test that partitioning can be disabled for a container.
+        """
+        self.inner.partition_layout = False
+        self.assertTrue(self.inner.will_transfer())
+
+
+if __name__ == '__main__':
+    import unittest
+    unittest.main()
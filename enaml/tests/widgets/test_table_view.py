@@ -0,0 +1,131 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from .enaml_test_case import EnamlTestCase
+
+
+class TestTableView(EnamlTestCase):
+    """ Unit tests for the TableView widget.
+
+    """
+
+    def setUp(self):
+        enaml_source = """
+from enaml.widgets.api import Window, TableView
+from enaml.stdlib.old.item_model import AbstractTableModel
+
+
+class BigModel(AbstractTableModel):
+
+    def __init__(self):
+        self.rows = 10000000
+        self.overrides = {}
+
+    def row_count(self, parent=None):
+        return self.rows
+
+    def column_count(self, parent=None):
+        return 4
+
+    def data(self, index):
+        key = (index.row, index.column)
+        return self.overrides.get(key, u'%d:%d' % key)
+
+
+enamldef MainView(Window):
+    initial_size = (400, 300)
+    TableView:
+        item_model = BigModel()
+"""
+        self.parse_and_create(enaml_source)
+        self.server_view = self.find_server_widget(self.view, "TableView")
+        self.client_view_widget = self.find_client_object(
+            self.client_view, "QtTableView"
+        )
+        self.model = self.server_view.item_model
+        self.client_model = self.client_view_widget.widget().model()
+        with self.app.process_events():
+            self.client_view.widget().show()
+        self.sync()
+
+    def sync(self):
+        """ Run the fetch and reply cycle between client and server.
+
+        """
+        for _ in range(3):
+            with self.app.process_events():
+                pass
+
+    def test_row_count(self):
+        """ Test that the client knows the size of the model.
+        """
+        self.assertEqual(self.client_model.rowCount(), 10000000)
+        self.assertEqual(self.client_model.columnCount(), 4)
+
+    def test_bounded_fetch(self):
+        """ Test that only a window of a large model is transferred.
+        """
+        cached = len(self.client_model._values)
+        self.assertTrue(0 < cached <= 4 * 200)
+        self.assertEqual(self.client_model.data(self.client_model.index(0, 1)),
+                         u'0:1')
+
+    def test_data_changed(self):
+        """ Test that a change in the client window is pushed.
+        """
+        model = self.model
+        model.overrides[(1, 2)] = u'changed'
+        with self.app.process_events():
+            model.notify_data_changed(model.index(1, 2), model.index(1, 2))
+
+        index = self.client_model.index(1, 2)
+        self.assertEqual(self.client_model.data(index), u'changed')
+
+    def test_rows_inserted(self):
+        """ Test that an insertion shifts the cached data.
+        """
+        model = self.model
+        model.begin_insert_rows(None, 0, 1)
+        model.rows += 2
+        with self.app.process_events():
+            model.end_insert_rows(None, 0, 1)
+
+        self.assertEqual(self.client_model.rowCount(), 10000002)
+        index = self.client_model.index(2, 0)
+        self.assertEqual(self.client_model.data(index), u'0:0')
+
+    def test_data_changed_after_insert(self):
+        """ Test that a change to the shifted data is still pushed
+        before the client requests data again.
+        """
+        model = self.model
+        model.begin_insert_rows(None, 0, 1)
+        model.rows += 2
+        model.end_insert_rows(None, 0, 1)
+        model.overrides[(3, 1)] = u'changed'
+        with self.app.process_events():
+            model.notify_data_changed(model.index(3, 1), model.index(3, 1))
+
+        index = self.client_model.index(3, 1)
+        self.assertEqual(self.client_model.data(index), u'changed')
+
+    def test_data_changed_after_remove(self):
+        """ Test that a change to the data after a removed range is
+        still pushed before the client requests data again.
+        """
+        model = self.model
+        model.begin_remove_rows(None, 0, 1)
+        model.rows -= 2
+        model.end_remove_rows(None, 0, 1)
+        model.overrides[(1, 1)] = u'changed'
+        with self.app.process_events():
+            model.notify_data_changed(model.index(1, 1), model.index(1, 1))
+
+        index = self.client_model.index(1, 1)
+        self.assertEqual(self.client_model.data(index), u'changed')
+
+
+if __name__ == '__main__':
+    import unittest
+    unittest.main()
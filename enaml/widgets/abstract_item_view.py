@@ -0,0 +1,395 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from traits.api import Any, Instance, Range
+
+from enaml.stdlib.old.item_model import AbstractItemModel
+
+from .control import Control
+
+
+#: The signals of an AbstractItemModel which are forwarded to the
+#: client as a reset of the model.
+_RESET_SIGNALS = (
+    'rows_moved', 'columns_moved', 'layout_changed', 'model_reset',
+)
+
+
+class AbstractItemView(Control):
+    """ A base class for widgets which view the data of an item model.
+
+    The client of an item view does not receive the data of the model
+    up front. It requests the window of rows and columns which it is
+    showing, plus a prefetch margin, with a 'request_data' action, and
+    the view replies with a 'data' action. The change notifications of
+    the model are forwarded to the client as range messages, and the
+    changed data is only sent for the part of the client window which
+    it covers. This makes the cost of showing a model proportional to
+    the size of the view rather than the size of the model.
+
+    Only the top-level rows and columns of the model are shown. The
+    data is sent as the unicode display value of each item.
+
+    """
+    #: The item model which provides the data for the view.
+    item_model = Instance(AbstractItemModel)
+
+    #: The number of rows beyond the visible rows which the client
+    #: fetches ahead of time, on either side of the visible rows.
+    prefetch_rows = Range(low=0, value=50)
+
+    #: The number of columns beyond the visible columns which the
+    #: client fetches ahead of time, on either side of the visible
+    #: columns.
+    prefetch_columns = Range(low=0, value=5)
+
+    #: An item view expands freely in width and height by default.
+    hug_width = 'ignore'
+    hug_height = 'ignore'
+
+    #: The (first_row, last_row, first_column, last_column) window of
+    #: the model which is cached by the client, or None.
+    _window = Any
+
+    #--------------------------------------------------------------------------
+    # Initialization
+    #--------------------------------------------------------------------------
+    def snapshot(self):
+        """ Returns the snapshot dict for the item view.
+
+        """
+        snap = super(AbstractItemView, self).snapshot()
+        snap['row_count'], snap['column_count'] = self._model_counts()
+        snap['prefetch_rows'] = self.prefetch_rows
+        snap['prefetch_columns'] = self.prefetch_columns
+        return snap
+
+    def bind(self):
+        """ Bind the change handlers for the item view.
+
+        """
+        super(AbstractItemView, self).bind()
+        self.publish_attributes('prefetch_rows', 'prefetch_columns')
+        self.on_trait_change(self._update_item_model, 'item_model')
+        self._connect_model(self.item_model)
+
+    #--------------------------------------------------------------------------
+    # Message Handling
+    #--------------------------------------------------------------------------
+    def on_action_request_data(self, content):
+        """ Handle the 'request_data' action from the client widget.
+
+        The content contains the 'window' which is cached by the client
+        and the list of 'ranges' of the window which are missing, each
+        as a (first_row, last_row, first_column, last_column) tuple.
+
+        """
+        self._window = tuple(content['window'])
+        blocks = []
+        for rng in content['ranges']:
+            block = self._data_block(*rng)
+            if block is not None:
+                blocks.append(block)
+        if blocks:
+            self.send_action('data', {'blocks': blocks})
+
+    #--------------------------------------------------------------------------
+    # Model Handlers
+    #--------------------------------------------------------------------------
+    def _on_rows_inserted(self, event):
+        """ Handle the 'rows_inserted' signal of the model.
+
+        """
+        self._send_range('rows_inserted', event)
+
+    def _on_rows_removed(self, event):
+        """ Handle the 'rows_removed' signal of the model.
+
+        """
+        self._send_range('rows_removed', event)
+
+    def _on_columns_inserted(self, event):
+        """ Handle the 'columns_inserted' signal of the model.
+
+        """
+        self._send_range('columns_inserted', event)
+
+    def _on_columns_removed(self, event):
+        """ Handle the 'columns_removed' signal of the model.
+
+        """
+        self._send_range('columns_removed', event)
+
+    def _on_reset(self, *args):
+        """ Handle the signals of the model which invalidate all of the
+        data which is cached by the client.
+
+        """
+        self._send_reset()
+
+    def _on_data_changed(self, event):
+        """ Handle the 'data_changed' signal of the model.
+
+        Only the part of the changed range which is cached by the client
+        is sent, since the rest is fetched when it becomes visible.
+
+        """
+        top_left, bottom_right = event
+        rows = (top_left.row, bottom_right.row)
+        columns = (top_left.column, bottom_right.column)
+        self._send_changed(rows, columns)
+
+    def _on_horizontal_header_data_changed(self, event):
+        """ Handle the 'horizontal_header_data_changed' signal.
+
+        """
+        window = self._window
+        if window is not None:
+            self._send_changed(window[:2], event)
+
+    def _on_vertical_header_data_changed(self, event):
+        """ Handle the 'vertical_header_data_changed' signal.
+
+        """
+        window = self._window
+        if window is not None:
+            self._send_changed(event, window[2:])
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _model_counts(self):
+        """ Get the number of rows and columns of the item model.
+
+        Returns
+        -------
+        result : (int, int)
+            The number of rows and columns of the model, or (0, 0) if
+            there is no model.
+
+        """
+        model = self.item_model
+        if model is None:
+            return (0, 0)
+        return (model.row_count(), model.column_count())
+
+    def _connect_model(self, model):
+        """ Connect the handlers of the view to the signals of a model.
+
+        """
+        if model is None:
+            return
+        model.rows_inserted.connect(self._on_rows_inserted)
+        model.rows_removed.connect(self._on_rows_removed)
+        model.columns_inserted.connect(self._on_columns_inserted)
+        model.columns_removed.connect(self._on_columns_removed)
+        model.data_changed.connect(self._on_data_changed)
+        model.horizontal_header_data_changed.connect(
+            self._on_horizontal_header_data_changed
+        )
+        model.vertical_header_data_changed.connect(
+            self._on_vertical_header_data_changed
+        )
+        for name in _RESET_SIGNALS:
+            getattr(model, name).connect(self._on_reset)
+
+    def _disconnect_model(self, model):
+        """ Disconnect the handlers of the view from a model.
+
+        """
+        if model is None:
+            return
+        model.rows_inserted.disconnect(self._on_rows_inserted)
+        model.rows_removed.disconnect(self._on_rows_removed)
+        model.columns_inserted.disconnect(self._on_columns_inserted)
+        model.columns_removed.disconnect(self._on_columns_removed)
+        model.data_changed.disconnect(self._on_data_changed)
+        model.horizontal_header_data_changed.disconnect(
+            self._on_horizontal_header_data_changed
+        )
+        model.vertical_header_data_changed.disconnect(
+            self._on_vertical_header_data_changed
+        )
+        for name in _RESET_SIGNALS:
+            getattr(model, name).disconnect(self._on_reset)
+
+    def _update_item_model(self, obj, name, old, new):
+        """ Handle a change of the item model.
+
+        """
+        self._disconnect_model(old)
+        self._connect_model(new)
+        self._send_reset()
+
+    def _send_reset(self):
+        """ Send the 'reset' action to the client widget.
+
+        """
+        self._window = None
+        content = {}
+        content['row_count'], content['column_count'] = self._model_counts()
+        self.send_action('reset', content)
+
+    def _send_range(self, action, event):
+        """ Send a structural change of the model to the client widget.
+
+        Parameters
+        ----------
+        action : str
+            The name of the action to send.
+
+        event : tuple
+            The (parent, first, last) tuple emitted by the model. A
+            change to the children of a non-root item is ignored.
+
+        """
+        parent, first, last = event
+        if parent is not None:
+            return
+        index = 0 if action.startswith('rows') else 2
+        self._shift_window(index, first, last, action.endswith('inserted'))
+        content = {'first': first, 'last': last}
+        content['row_count'], content['column_count'] = self._model_counts()
+        self.send_action(action, content)
+
+    def _shift_window(self, index, first, last, inserted):
+        """ Update the cached window for a structural change of the
+        model.
+
+        The client shifts the data it has cached past an inserted or
+        removed range and drops the data of a removed range, so the
+        bounds of the window are shifted the same way. Changes to the
+        shifted data are then still pushed to the client.
+
+        Parameters
+        ----------
+        index : int
+            The index of the first bound of the changed axis in the
+            window: 0 for the rows, 2 for the columns.
+
+        first, last : int
+            The first and last index of the inserted or removed range.
+
+        inserted : bool
+            True if the range was inserted, False if it was removed.
+
+        """
+        window = self._window
+        if window is None:
+            return
+        count = last - first + 1
+        start, end = window[index:index + 2]
+        if inserted:
+            if start >= first:
+                start += count
+            if end >= first:
+                end += count
+        else:
+            if start > last:
+                start -= count
+            elif start >= first:
+                start = first
+            if end > last:
+                end -= count
+            elif end >= first:
+                end = first - 1
+            if end < start:
+                self._window = None
+                return
+        window = list(window)
+        window[index:index + 2] = [start, end]
+        self._window = tuple(window)
+
+    def _send_changed(self, rows, columns):
+        """ Send the part of a changed range which is cached by the
+        client widget.
+
+        Parameters
+        ----------
+        rows : (int, int)
+            The first and last changed rows.
+
+        columns : (int, int)
+            The first and last changed columns.
+
+        """
+        window = self._window
+        if window is None:
+            return
+        first_row = max(rows[0], window[0])
+        last_row = min(rows[1], window[1])
+        first_col = max(columns[0], window[2])
+        last_col = min(columns[1], window[3])
+        block = self._data_block(first_row, last_row, first_col, last_col)
+        if block is not None:
+            self.send_action('data', {'blocks': [block]})
+
+    def _data_block(self, first_row, last_row, first_col, last_col):
+        """ Create a block of data for the client widget.
+
+        Parameters
+        ----------
+        first_row, last_row, first_col, last_col : int
+            The inclusive bounds of the block. They are clipped to the
+            bounds of the model.
+
+        Returns
+        -------
+        result : dict or None
+            A dict with the 'rows' and 'columns' bounds of the block,
+            the list of row lists of unicode 'values', and the lists of
+            'row_headers' and 'column_headers'. None is returned if the
+            block is empty.
+
+        """
+        model = self.item_model
+        if model is None:
+            return None
+        row_count, col_count = self._model_counts()
+        first_row = max(first_row, 0)
+        last_row = min(last_row, row_count - 1)
+        first_col = max(first_col, 0)
+        last_col = min(last_col, col_count - 1)
+        if first_row > last_row or first_col > last_col:
+            return None
+        columns = xrange(first_col, last_col + 1)
+        rows = xrange(first_row, last_row + 1)
+        values = model.block_data(first_row, last_row, first_col, last_col)
+        values = [
+            [u'' if value is None else unicode(value) for value in row_values]
+            for row_values in values
+        ]
+        block = {
+            'rows': (first_row, last_row),
+            'columns': (first_col, last_col),
+            'values': values,
+        }
+        block['row_headers'], block['column_headers'] = self._headers(
+            rows, columns
+        )
+        return block
+
+    def _headers(self, rows, columns):
+        """ Get the header data for the rows and columns of a block.
+
+        Parameters
+        ----------
+        rows : xrange
+            The rows of the block.
+
+        columns : xrange
+            The columns of the block.
+
+        Returns
+        -------
+        result : (list, list)
+            The unicode headers of the rows and of the columns.
+
+        """
+        model = self.item_model
+        vdata = model.vertical_header_data
+        hdata = model.horizontal_header_data
+        row_headers = [unicode(vdata(row)) for row in rows]
+        column_headers = [unicode(hdata(col)) for col in columns]
+        return row_headers, column_headers
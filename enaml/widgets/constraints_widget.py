@@ -2,11 +2,12 @@
 #  Copyright (c) 2011, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-from traits.api import Property, Enum, Instance, List
+from traits.api import Property, Enum, Instance, List, Str
 
 from enaml.application import Application, ScheduledTask
 from enaml.layout.ab_constrainable import ABConstrainable
 from enaml.layout.box_model import BoxModel
+from enaml.layout.constraint_variable import flatten_constraints
 from enaml.layout.layout_helpers import expand_constraints
 
 from .widget import Widget
@@ -105,6 +106,10 @@ class ConstraintsWidget(Widget):
     #: The private application task used to collapse layout messages.
     _layout_task = Instance(ScheduledTask)
 
+    #: The names of the traits which caused the pending relayout. They
+    #: are sent with the relayout action for layout instrumentation.
+    _layout_causes = List(Str)
+
     #: The private storage the box model instance for this component.
     _box_model = Instance(BoxModel)
     def __box_model_default(self):
@@ -120,7 +125,8 @@ class ConstraintsWidget(Widget):
         attributes dict. The value is a dict with the following keys.
 
         'constraints'
-            A list of dictionaries representing linear constraints.
+            A dict of flattened linear constraints. See the function
+            `flatten_constraints` for details on the format.
 
         'resist_clip'
             A tuple containing width and height clip policies.
@@ -170,7 +176,7 @@ class ConstraintsWidget(Widget):
     #--------------------------------------------------------------------------
     # Message Handling
     #--------------------------------------------------------------------------
-    def _send_relayout(self):
+    def _send_relayout(self, obj=None, name='children', new=None):
         """ Send the 'relayout' action to the client widget.
 
         If an Enaml Application instance exists, then multiple `relayout`
@@ -178,7 +184,25 @@ class ConstraintsWidget(Widget):
         on the next cycle of the event loop. If no application exists,
         then the action is sent immediately.
 
+        Parameters
+        ----------
+        obj : object, optional
+            The object on which a trait changed. This is provided by
+            the trait change notifier and is ignored.
+
+        name : str, optional
+            The name of the trait which caused the relayout. It is
+            recorded as a cause of the relayout. The default is
+            'children'.
+
+        new : object, optional
+            The new value of the trait. This is provided by the trait
+            change notifier and is ignored.
+
         """
+        causes = self._layout_causes
+        if name not in causes:
+            causes.append(name)
         # The relayout action is deferred until the next cycle of the
         # event loop for two reasons: 1) So that multiple relayout
         # requests can be collapsed into a single action. 2) So that
@@ -193,7 +217,10 @@ class ConstraintsWidget(Widget):
                 def notifier(ignored):
                     self._layout_task = None
                 def layout_task():
-                    self.batch_action('relayout', self._layout_info())
+                    info = self._layout_info()
+                    info['causes'] = list(self._layout_causes)
+                    self._layout_causes = []
+                    self.batch_action('relayout', info)
                 task = app.schedule(layout_task)
                 task.notify(notifier)
                 self._layout_task = task
@@ -222,22 +249,21 @@ class ConstraintsWidget(Widget):
         return info
 
     def _generate_constraints(self):
-        """ Creates a list of constraint info dictionaries.
+        """ Creates the flattened constraint info for the widget.
 
         This method converts the list of symbolic constraints returned
-        by the call to '_collect_constraints' into a list of constraint
-        info dictionaries which can be serialized and sent to clients.
+        by the call to '_collect_constraints' into a flat constraint
+        info dictionary which can be serialized and sent to clients.
 
         Returns
         -------
-        result : list of dicts
-            A list of dictionaries which are serializable versions of
-            the symbolic constraints defined for the widget.
+        result : dict
+            A dictionary with a shared 'variables' table and a list of
+            flat 'constraints' as created by `flatten_constraints`.
 
         """
         cns = self._collect_constraints()
-        cns = [cn.as_dict() for cn in expand_constraints(self, cns)]
-        return cns
+        return flatten_constraints(expand_constraints(self, cns))
 
     def _collect_constraints(self):
         """ Creates a list of symbolic constraints for the component.
@@ -2,7 +2,9 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-from traits.api import Enum, Bool, Callable, List, Unicode
+import os
+
+from traits.api import Any, Enum, Bool, Callable, Int, List, Unicode
 
 from enaml.application import deferred_call
 from enaml.core.messenger import Messenger
@@ -57,6 +59,21 @@ class FileDialog(Messenger):
     #: be updated before this event is fired.
     closed = EnamlEvent
 
+    #: An optional index of the file names below a set of roots. When
+    #: an index is given, the non-native dialog completes the typed
+    #: file name with the matching paths below the dialog directory.
+    #: The index is any object with a `search(text, substring, limit,
+    #: under, dirs_only)` method which returns a list of paths, such
+    #: as a `FileIndex` from `enaml.stdlib.old.file_index`. An index
+    #: is typically shared by the dialogs of an application.
+    index = Any
+
+    #: How the typed text is matched against the indexed names.
+    search_mode = Enum('prefix', 'substring')
+
+    #: The maximum number of paths returned by a search.
+    search_limit = Int(100)
+
     #: Whether to destroy the dialog widget on close. The default is
     #: True since dialogs are typically used in a transitory fashion.
     #: If this value is set to True, the dialog will be destroyed on
@@ -79,6 +96,7 @@ class FileDialog(Messenger):
         content['filters'] = self.filters
         content['selected_filter'] = self.selected_filter
         content['native_dialog'] = self.native_dialog
+        content['search'] = self.index is not None
         # A common dialog idiom is as follows:
         #
         #    dlg = FileDialog(foo, ...)
@@ -95,6 +113,35 @@ class FileDialog(Messenger):
         else:
             deferred_call(self.send_action, 'open', content)
 
+    def search(self, text):
+        """ Search the index for the names below the dialog directory.
+
+        Parameters
+        ----------
+        text : unicode
+            The text to match against the indexed names, according to
+            the search mode.
+
+        Returns
+        -------
+        result : list of unicode
+            The full paths of the matching names, or an empty list if
+            the dialog has no index. Only directories are returned in
+            'directory' mode.
+
+        """
+        index = self.index
+        if index is None:
+            return []
+        path = self.path
+        if path and not os.path.isdir(path):
+            path = os.path.dirname(path)
+        return index.search(
+            text, substring=self.search_mode == 'substring',
+            limit=self.search_limit, under=path or None,
+            dirs_only=self.mode == 'directory',
+        )
+
     #--------------------------------------------------------------------------
     # Message Handling
     #--------------------------------------------------------------------------
@@ -114,3 +161,11 @@ class FileDialog(Messenger):
         if self.destroy_on_close:
             self.destroy()
 
+    def on_action_search(self, content):
+        """ Handle the 'search' action from the client widget.
+
+        """
+        text = content['text']
+        content = {'text': text, 'paths': self.search(text)}
+        self.send_action('search_results', content)
+
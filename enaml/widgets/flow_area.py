@@ -2,7 +2,7 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-from traits.api import Enum, Range, Property, cached_property
+from traits.api import Bool, Enum, Range, Property, cached_property
 
 from enaml.core.trait_types import CoercingInstance
 from enaml.layout.geometry import Box
@@ -33,6 +33,15 @@ class FlowArea(ConstraintsWidget):
     #: The margins to use around the outside of the flow area.
     margins = CoercingInstance(Box, (10, 10, 10, 10))
 
+    #: Whether the flow area is virtualized. A virtualized flow area
+    #: only shows the widgets of the items which are near its visible
+    #: area. The other items are laid out using their preferred size,
+    #: their last measured size, or an estimate of the average item
+    #: size, which makes scrolling through thousands of items cheap.
+    #: Items which set a `preferred_size` are placed exactly before
+    #: they are first shown.
+    virtualized = Bool(False)
+
     #: A read only property which returns the area's flow items.
     flow_items = Property(depends_on='children')
 
@@ -53,6 +62,7 @@ class FlowArea(ConstraintsWidget):
         snap['horizontal_spacing'] = self.horizontal_spacing
         snap['vertical_spacing'] = self.vertical_spacing
         snap['margins'] = self.margins
+        snap['virtualized'] = self.virtualized
         return snap
 
     def bind(self):
@@ -62,7 +72,7 @@ class FlowArea(ConstraintsWidget):
         super(FlowArea, self).bind()
         attrs = (
             'direction', 'align', 'horizontal_spacing','vertical_spacing',
-            'margins',
+            'margins', 'virtualized',
         )
         self.publish_attributes(*attrs)
 
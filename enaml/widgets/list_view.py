@@ -0,0 +1,26 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from .abstract_item_view import AbstractItemView
+
+
+class ListView(AbstractItemView):
+    """ A widget which shows the first column of an item model as a
+    scrollable list.
+
+    """
+    #: A list view does not need horizontal prefetching.
+    prefetch_columns = 0
+
+    #--------------------------------------------------------------------------
+    # Private API
+    #--------------------------------------------------------------------------
+    def _headers(self, rows, columns):
+        """ A reimplemented parent class method.
+
+        A list view does not show headers, so none are sent.
+
+        """
+        return [], []
+
@@ -0,0 +1,40 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2012, Enthought, Inc.
+#  All rights reserved.
+#------------------------------------------------------------------------------
+from traits.api import Bool
+
+from .abstract_item_view import AbstractItemView
+
+
+class TableView(AbstractItemView):
+    """ A widget which shows the data of an item model as a scrollable
+    table with row and column headers.
+
+    """
+    #: Whether the horizontal (column) header is visible.
+    show_horizontal_header = Bool(True)
+
+    #: Whether the vertical (row) header is visible.
+    show_vertical_header = Bool(True)
+
+    #--------------------------------------------------------------------------
+    # Initialization
+    #--------------------------------------------------------------------------
+    def snapshot(self):
+        """ Returns the snapshot dict for the TableView.
+
+        """
+        snap = super(TableView, self).snapshot()
+        snap['show_horizontal_header'] = self.show_horizontal_header
+        snap['show_vertical_header'] = self.show_vertical_header
+        return snap
+
+    def bind(self):
+        """ Bind the change handlers for the TableView.
+
+        """
+        super(TableView, self).bind()
+        attrs = ('show_horizontal_header', 'show_vertical_header')
+        self.publish_attributes(*attrs)
+
@@ -2,6 +2,8 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
+from time import time
+
 from casuarius import ConstraintVariable
 
 from .wx_widget import WxWidget
@@ -75,9 +77,9 @@ class WxConstraintsWidget(WxWidget):
     #: be called to trigger an appropriate relayout of the widget.
     _size_hint_cns = []
 
-    #: The list of constraint dictionaries defined by the user on
-    #: the server side Enaml widget.
-    _user_cns = []
+    #: The flat constraint info dict defined by the user on the
+    #: server side Enaml widget.
+    _user_cns = {}
 
     #--------------------------------------------------------------------------
     # Setup Methods
@@ -105,8 +107,11 @@ class WxConstraintsWidget(WxWidget):
         self._hug = content['hug']
         self._resist_clip = content['resist']
         self._user_cns = content['constraints']
+        start = time()
         self.clear_size_hint_constraints()
         self.relayout()
+        causes = content.get('causes', ())
+        self._session.record_relayout(self, causes, time() - start)
 
     #--------------------------------------------------------------------------
     # Layout Handling
@@ -149,6 +154,31 @@ class WxConstraintsWidget(WxWidget):
         if isinstance(parent, WxConstraintsWidget):
             parent.replace_constraints(old_cns, new_cns)
 
+    def defer_replace_constraints(self, old_cns, new_cns):
+        """ Replace constraints in the current layout system at the end
+        of the current event loop tick.
+
+        The default behavior of this method is to proxy the call up the
+        tree of ancestors until it is either handled by a subclass which
+        has reimplemented this method (see WxContainer), or the ancestor
+        is not an instance of WxConstraintsWidget, at which point the
+        request is dropped.
+
+        Parameters
+        ----------
+        old_cns : list
+            The list of casuarius constraints to remove from the
+            current layout system.
+
+        new_cns : list
+            The list of casuarius constraints to add to the
+            current layout system.
+
+        """
+        parent = self.parent()
+        if isinstance(parent, WxConstraintsWidget):
+            parent.defer_replace_constraints(old_cns, new_cns)
+
     def clear_constraints(self, cns):
         """ Clear the given constraints from the current layout system.
 
@@ -228,7 +258,7 @@ class WxConstraintsWidget(WxWidget):
             old_cns = self._size_hint_cns
             self._size_hint_cns = []
             new_cns = self.size_hint_constraints()
-            parent.replace_constraints(old_cns, new_cns)
+            parent.defer_replace_constraints(old_cns, new_cns)
         self.update_geometry()
 
     def clear_size_hint_constraints(self):
@@ -269,16 +299,17 @@ class WxConstraintsWidget(WxWidget):
         return cns
 
     def user_constraints(self):
-        """ Get the list of user constraints defined for this widget.
+        """ Get the user constraints defined for this widget.
 
-        The default implementation returns the list of constraint
-        information sent by the server.
+        The default implementation returns the flat constraint info
+        sent by the server.
 
         Returns
         -------
-        result : list
-            The list of dictionaries which represent the user defined
-            linear constraints.
+        result : dict
+            A dictionary with a 'variables' table and a list of flat
+            'constraints' which represent the user defined linear
+            constraints.
 
         """
         return self._user_cns
@@ -315,20 +346,41 @@ class WxConstraintsWidget(WxWidget):
         # that will is called on every resize to update the geometry of
         # the widget. This is explicitly not idiomatic Python code. It
         # exists purely for the sake of efficiency and was justified
-        # with profiling.
+        # with profiling. The last applied integer geometry is cached
+        # and the call to SetDimensions is skipped if it is unchanged.
         primitive = self.layout_box.primitive
         x = primitive('left')
         y = primitive('top')
         width = primitive('width')
         height = primitive('height')
         setdims = self.widget().SetDimensions
+        last = [None]
+        applied = [0]
+        skipped = [0]
         def update_geometry(dx, dy):
             nx = x.value
             ny = y.value
-            setdims(nx - dx, ny - dy, width.value, height.value)
+            geo = (int(nx - dx), int(ny - dy), int(width.value),
+                   int(height.value))
+            if geo != last[0]:
+                last[0] = geo
+                setdims(*geo)
+                applied[0] += 1
+            else:
+                skipped[0] += 1
             return nx, ny
+        def apply_geometry(geo):
+            last[0] = geo
+            setdims(*geo)
         # Store a reference to self on the updater, so that the layout
         # container can know the object on which the updater operates.
+        # The one element lists of applied and skipped updates and of
+        # the last applied geometry are stored as well, along with a
+        # function which applies a known geometry without a solve.
         update_geometry.item = self
+        update_geometry.applied = applied
+        update_geometry.skipped = skipped
+        update_geometry.last = last
+        update_geometry.apply = apply_geometry
         return update_geometry
 
@@ -2,85 +2,121 @@
 #  Copyright (c) 2012, Enthought, Inc.
 #  All rights reserved.
 #------------------------------------------------------------------------------
-from collections import deque
+from collections import OrderedDict, deque
 
 from casuarius import weak
+from enaml.layout.frame_throttle import FrameThrottle
+from enaml.layout.layout_cache import LayoutCacheEntry
 from enaml.layout.layout_manager import LayoutManager
 
 import wx
 
 from .wx_constraints_widget import WxConstraintsWidget, LayoutBox
+from .wx_deferred_caller import DeferredCall, TimedCall
 
 
-def _convert_cn_info(info, owners):
-    """ Converts the lhs or rhs of a linear constraint info dict into
-    its corresponding casuarius object.
+def as_constraint_variables(variables, owners):
+    """ Converts the variable table of a flat constraint info dict into
+    a list of casuarius constraint variables.
+
+    For variables in the table which do not have a corresponding owner
+    (e.g. those created by box helpers) a layout box will be created.
+
+    Parameters
+    ----------
+    variables : list
+        The list of (owner id, name) pairs from a flat constraint info
+        dict sent from an Enaml widget.
+
+    owners : dict
+        A mapping from constraint id to an owner object which holds
+        the actual casuarius constraint variables as attributes.
+
+    Returns
+    -------
+    result : list
+        The list of casuarius constraint variables, in the order of the
+        variable table.
 
     """
-    cn_type = info['type']
-    if cn_type == 'linear_expression':
-        const = info['constant']
-        terms = info['terms']
-        convert = _convert_cn_info
-        res = sum(convert(t, owners) for t in terms) + const
-    elif cn_type == 'term':
-        coeff = info['coeff']
-        var = info['var']
-        res = coeff * _convert_cn_info(var, owners)
-    elif cn_type == 'linear_symbolic':
-        sym_name = info['name']
-        owner_id = info['owner']
-        owner = owners.get(owner_id, None)
+    res = []
+    push = res.append
+    get_owner = owners.get
+    for owner_id, name in variables:
+        owner = get_owner(owner_id)
         if owner is None:
             owner = owners[owner_id] = LayoutBox('_virtual', owner_id)
-        res = owner.primitive(sym_name)
-    else:
-        msg = 'Unhandled constraint info type `%s`' % cn_type
-        raise ValueError(msg)
+        push(owner.primitive(name))
     return res
 
 
-def as_linear_constraint(info, owners):
-    """ Converts a constraint info dict into a casuarius linear
+def as_linear_constraint(item, cn_vars):
+    """ Converts a flat constraint item into a casuarius linear
     constraint.
 
-    For constraints specified in the info dict which do not have a
-    corresponding owner (e.g. those created by box helpers) a
-    constraint variable will be synthesized.
-
     Parameters
     ----------
-    info : dict
-        A dictionary sent from an Enaml widget which specifies the
-        information for a linear constraint.
+    item : tuple
+        An (op, strength, weight, constant, pairs) item from the list
+        of constraints of a flat constraint info dict.
 
-    owners : dict
-        A mapping from constraint id to an owner object which holds
-        the actual casuarius constraint variables as attributes.
+    cn_vars : list
+        The list of casuarius constraint variables for the variable
+        table of the constraint info, as created by a call to
+        `as_constraint_variables`.
 
     Returns
     -------
     result : LinearConstraint
-        A casuarius linear constraint for the given dict.
+        A casuarius linear constraint for the given item.
 
     """
-    if info['type'] != 'linear_constraint':
-        msg = 'The info dict does not specify a linear constraint.'
-        raise ValueError(msg)
-    convert = _convert_cn_info
-    lhs = convert(info['lhs'], owners)
-    rhs = convert(info['rhs'], owners)
-    op = info['op']
+    op, strength, weight, constant, pairs = item
+    expr = constant
+    for idx in xrange(0, len(pairs), 2):
+        expr = expr + pairs[idx + 1] * cn_vars[pairs[idx]]
     if op == '==':
-        cn = lhs == rhs
+        cn = expr == 0
     elif op == '<=':
-        cn = lhs <= rhs
+        cn = expr <= 0
     elif op == '>=':
-        cn = lhs >= rhs
+        cn = expr >= 0
     else:
         msg = 'Unhandled constraint operator `%s`' % op
         raise ValueError(msg)
-    return cn | info['strength'] | info['weight']
+    return cn | strength | weight
+
+
+def constraint_key(item, variables):
+    """ Creates a hashable key for a flat constraint item.
+
+    The key is equal for any two constraint items with equal content,
+    regardless of the variable table in which they were sent. It is
+    used to match the constraints sent by the server on a relayout
+    against the constraints which are already held by the layout
+    manager.
+
+    Parameters
+    ----------
+    item : tuple
+        An (op, strength, weight, constant, pairs) item from the list
+        of constraints of a flat constraint info dict.
+
+    variables : list
+        The variable table of the flat constraint info dict.
+
+    Returns
+    -------
+    result : tuple
+        A hashable key for the given constraint item.
+
+    """
+    op, strength, weight, constant, pairs = item
+    terms = tuple(
+        (tuple(variables[pairs[idx]]), pairs[idx + 1])
+        for idx in xrange(0, len(pairs), 2)
+    )
+    return (op, strength, weight, constant, terms)
 
 
 class wxContainer(wx.PyPanel):
@@ -150,6 +186,56 @@ class WxContainer(WxConstraintsWidget):
     #: A dict mapping constraint owner id to associated LayoutBox
     _cn_owners = {}
 
+    #: An ordered dict mapping a constraint key to the casuarius
+    #: constraint which is currently held by the layout manager. Raw
+    #: constraints are keyed by id, constraints created from info
+    #: dicts are keyed by the content of the dict.
+    _cn_table = {}
+
+    #: The tuple of (offset index, item) pairs for which the current
+    #: layout table was built. A relayout with an equal structure will
+    #: update the constraints of the existing layout manager in place.
+    _layout_items = ()
+
+    #: The frame budget, in seconds, which bounds the rate of layout
+    #: solves during an interactive resize. If resize events arrive
+    #: faster than the budget allows, the intermediate solves are
+    #: coalesced and a final solve is run at the end of the frame. A
+    #: budget of zero solves on every resize event. The value is read
+    #: when the widget is created.
+    resize_frame_budget = 0.0
+
+    #: The FrameThrottle which bounds the resize solves, or None if
+    #: the resize frame budget is zero.
+    _frame_throttle = None
+
+    #: Whether a container which shares its layout should instead be
+    #: laid out by a layout manager of its own if its constraints are
+    #: decoupled from the rest of the system of the layout owner. Such
+    #: a partition is coupled to its ancestors only through its size
+    #: hint, and is solved bottom-up like a container which does not
+    #: share its layout. This keeps the individual systems small, but
+    #: the hug and resist constraints of the partition then apply to
+    #: its size hint, which can change the solved geometry. For this
+    #: reason partitioning is disabled by default.
+    partition_layout = False
+
+    #: The LayoutCache which persists the solved layout results of
+    #: the container, or None if the results are not cached. A cached
+    #: layout is applied at once when the container is created, and is
+    #: verified by a deferred solve. The value is read when the layout
+    #: is initialized.
+    layout_cache = None
+
+    #: The (key, entry) pair of the layout cache which is waiting to be
+    #: verified by a deferred solve, or None.
+    _cache_entry = None
+
+    #: The pair of (removed, added) ordered dicts of constraints which
+    #: are waiting to be applied at the end of the current event loop
+    #: tick, or None if there are no pending replacements.
+    _pending_cns = None
+
     #: A list of the current contents constraints for the widget.
     _contents_cns = []
 
@@ -157,6 +243,11 @@ class WxContainer(WxConstraintsWidget):
     #: by the EVT_SHOW handler.
     _is_shown = True
 
+    #: A dict mapping the object id of the shared containers in the
+    #: system of this layout owner to whether they are partitions, or
+    #: None if it must be recomputed. See `_layout_partitions`.
+    _partitions = None
+
     #--------------------------------------------------------------------------
     # Setup Methods
     #--------------------------------------------------------------------------
@@ -177,6 +268,11 @@ class WxContainer(WxConstraintsWidget):
         widget = self.widget()
         widget.Bind(wx.EVT_SIZE, self.on_resize)
         widget.Bind(wx.EVT_SHOW, self.on_show)
+        budget = self.resize_frame_budget
+        if budget > 0:
+            self._frame_throttle = FrameThrottle(
+                budget, self._frame_refresh, TimedCall
+            )
 
     def init_layout(self):
         """ Initializes the layout for the container.
@@ -189,17 +285,10 @@ class WxContainer(WxConstraintsWidget):
         # transfer ownership at some point.
         if not self.will_transfer():
             offset_table, layout_table = self._build_layout_table()
-            cns = self._generate_constraints(layout_table)
-            # Initializing the layout manager can fail if the objective
-            # function is unbounded. We let that failure occur so it can
-            # be logged. Nothing is stored until it succeeds.
-            manager = LayoutManager()
-            manager.initialize(cns)
-            self._offset_table = offset_table
-            self._layout_table = layout_table
-            self._layout_manager = manager
-            self._refresh = self._build_refresher(manager)
-            self.refresh_sizes()
+            if self.layout_cache is not None:
+                if self._init_cached_layout(offset_table, layout_table):
+                    return
+            self._init_layout_manager(offset_table, layout_table)
 
     #--------------------------------------------------------------------------
     # Event Handlers
@@ -208,10 +297,15 @@ class WxContainer(WxConstraintsWidget):
         """ The event handler for the EVT_SIZE event.
 
         This handler triggers a layout pass when the container widget
-        is resized.
+        is resized. If a resize frame budget is set, the layout pass
+        may be deferred to the end of the current frame.
 
         """
-        self.refresh()
+        throttle = self._frame_throttle
+        if throttle is not None:
+            throttle.request()
+        else:
+            self.refresh()
 
     def on_show(self, event):
         """ The event handler for the EVT_SHOW event.
@@ -238,10 +332,15 @@ class WxContainer(WxConstraintsWidget):
         the responsibility for laying out its descendents.
 
         """
-        if self._owns_layout:
+        self._layout_top()._partitions = None
+        if self._owns_layout and self.will_transfer():
+            # The layout of the container has become coupled with the
+            # layout of its parent, which will take the ownership.
+            self.parent().relayout()
+        elif self._owns_layout:
             widget = self.widget()
             old_hint = widget.GetBestSize()
-            self.init_layout()
+            self._update_layout()
             self.refresh()
             new_hint = widget.GetBestSize()
             # If the size hint constraints are empty, it indicates that
@@ -267,6 +366,49 @@ class WxContainer(WxConstraintsWidget):
         if self._is_shown:
             self._refresh()
 
+    def frame_stats(self):
+        """ Get the solve time statistics for resize driven layouts.
+
+        Returns
+        -------
+        result : dict or None
+            The statistics dict of the FrameThrottle for the container,
+            or None if the resize frame budget is zero.
+
+        """
+        throttle = self._frame_throttle
+        if throttle is not None:
+            return throttle.stats()
+
+    def layout_stats(self):
+        """ Get the layout instrumentation counters of the container.
+
+        Returns
+        -------
+        result : dict or None
+            None if the container does not own a layout manager. Else,
+            a dict with the 'object_id' of the container, the number
+            of layout 'items', the 'constraints', 'counts' and 'times'
+            of the layout manager, the number of 'geometry_applied'
+            and 'geometry_skipped' updates, and the resize 'frames'
+            statistics as returned by `frame_stats`.
+
+        """
+        manager = self._layout_manager
+        if not self._owns_layout or manager is None:
+            return None
+        applied = skipped = 0
+        for _, updater in self._layout_table:
+            applied += updater.applied[0]
+            skipped += updater.skipped[0]
+        stats = manager.stats()
+        stats['object_id'] = self.object_id()
+        stats['items'] = len(self._layout_table)
+        stats['geometry_applied'] = applied
+        stats['geometry_skipped'] = skipped
+        stats['frames'] = self.frame_stats()
+        return stats
+
     def refresh_sizes(self):
         """ Refresh the min/max/best sizes for the underlying widget.
 
@@ -300,9 +442,13 @@ class WxContainer(WxConstraintsWidget):
         if self._owns_layout:
             manager = self._layout_manager
             if manager is not None:
+                old_cns, new_cns = self._merge_pending_constraints(
+                    old_cns, new_cns
+                )
                 widget = self.widget()
                 old_hint = widget.GetBestSize()
                 manager.replace_constraints(old_cns, new_cns)
+                self._update_cn_table(old_cns, new_cns)
                 self.refresh_sizes()
                 self.refresh()
                 new_hint = widget.GetBestSize()
@@ -324,10 +470,42 @@ class WxContainer(WxConstraintsWidget):
         if self._owns_layout:
             manager = self._layout_manager
             if manager is not None:
-                manager.replace_constraints(cns, [])
+                old_cns, new_cns = self._merge_pending_constraints(cns, [])
+                manager.replace_constraints(old_cns, new_cns)
+                self._update_cn_table(old_cns, new_cns)
         else:
             self._layout_owner.clear_constraints(cns)
 
+    def defer_replace_constraints(self, old_cns, new_cns):
+        """ Replace constraints in the given layout at the end of the
+        current event loop tick.
+
+        All replacements which are deferred during the same tick are
+        combined into a single call to `replace_constraints`, so that
+        a batch of size hint changes results in a single update of the
+        solver and a single refresh of the layout.
+
+        Parameters
+        ----------
+        old_cns : list
+            The list of casuarius constraints to remove from the
+            the current layout system.
+
+        new_cns : list
+            The list of casuarius constraints to add to the
+            current layout system.
+
+        """
+        if self._owns_layout:
+            if self._layout_manager is not None:
+                pending = self._pending_cns
+                if pending is None:
+                    pending = self._pending_cns = (OrderedDict(), OrderedDict())
+                    DeferredCall(self._flush_pending_constraints)
+                self._net_constraints(pending, old_cns, new_cns)
+        else:
+            self._layout_owner.defer_replace_constraints(old_cns, new_cns)
+
     def layout(self):
         """ The callback invoked by the layout manager when there are
         new layout values available.
@@ -415,6 +593,16 @@ class WxContainer(WxConstraintsWidget):
     #--------------------------------------------------------------------------
     # Constraints Computation
     #--------------------------------------------------------------------------
+    def _frame_refresh(self):
+        """ Refresh the layout at the end of a resize frame.
+
+        This is the callback of the frame throttle. The container may
+        have been destroyed by the time a deferred frame is run.
+
+        """
+        if self._widget is not None:
+            self.refresh()
+
     def _build_refresher(self, manager):
         """ A private method which will build a function which, when
         called, will refresh the layout for the container.
@@ -507,36 +695,49 @@ class WxContainer(WxConstraintsWidget):
 
         return offset_table, layout_table
 
-    def _generate_constraints(self, layout_table):
-        """ Creates the list of casuarius LinearConstraint objects for
+    def _generate_constraints(self, layout_table, cn_table=None):
+        """ Creates the table of casuarius LinearConstraint objects for
         the widgets for which this container owns the layout.
 
         This method walks over the items in the given layout table and
-        aggregates their constraints into a single list of casuarius
-        LinearConstraint objects which can be given to the layout
-        manager.
+        aggregates their constraints into a single ordered table of
+        casuarius LinearConstraint objects which can be given to the
+        layout manager.
 
         Parameters
         ----------
         layout_table : list
             The layout table created by a call to _build_layout_table.
 
+        cn_table : dict, optional
+            The current constraint table of the container. If given,
+            constraint items which have a matching key in this table
+            will reuse the existing casuarius constraint instead of
+            being converted anew.
+
         Returns
         -------
-        result : list
-            The list of casuarius LinearConstraints instances to pass to
-            the layout manager.
+        result : OrderedDict
+            An ordered dict mapping constraint key to the casuarius
+            LinearConstraint instance to pass to the layout manager.
 
         """
-        # The mapping of constraint owners and the list of constraint
-        # info dictionaries provided by the Enaml widgets.
+        # The mapping of constraint owners and the list of flat
+        # constraint info dicts provided by the Enaml widgets. The virtual
+        # owners of the current layout are retained when updating, so
+        # that reused and new constraints share the same variables.
         box = self.layout_box
-        cn_owners = {self.object_id(): box}
-        cn_dicts = list(self.user_constraints())
-        cn_dicts_extend = cn_dicts.extend
-
-        # The list of raw casuarius constraints which will be returned
-        # from this method to be added to the casuarius solver.
+        if cn_table is not None:
+            cn_owners = dict(self._cn_owners)
+        else:
+            cn_owners = {}
+            cn_table = {}
+        cn_owners[self.object_id()] = box
+        cn_infos = [self.user_constraints()]
+        add_info = cn_infos.append
+
+        # The list of raw casuarius constraints which will be added to
+        # the table returned from this method.
         raw_cns = self.hard_constraints() + self.contents_constraints()
         raw_cns_extend = raw_cns.extend
 
@@ -550,20 +751,43 @@ class WxContainer(WxConstraintsWidget):
             raw_cns_extend(child.hard_constraints())
             if isinst(child, WxContainer_):
                 if child.transfer_layout_ownership(self):
-                    cn_dicts_extend(child.user_constraints())
+                    add_info(child.user_constraints())
                     raw_cns_extend(child.contents_constraints())
                 else:
                     raw_cns_extend(child.size_hint_constraints())
             else:
                 raw_cns_extend(child.size_hint_constraints())
-                cn_dicts_extend(child.user_constraints())
-
-        # Convert the list of Enaml constraints info dicts to actual
-        # casuarius LinearConstraint objects for the solver.
-        add_cn = raw_cns.append
+                add_info(child.user_constraints())
+
+        # Raw constraints are cached by the widgets which create them,
+        # so they are keyed by identity.
+        table = OrderedDict((id(cn), cn) for cn in raw_cns)
+
+        # Convert the flat Enaml constraint items to actual casuarius
+        # LinearConstraint objects for the solver, unless an equal item
+        # was already converted. The variable table of an info dict is
+        # only converted if one of its items needs to be converted. The
+        # key includes a running count so duplicates are not collapsed.
+        counts = {}
+        as_vars = as_constraint_variables
         as_cn = as_linear_constraint
-        for info in cn_dicts:
-            add_cn(as_cn(info, cn_owners))
+        cn_key = constraint_key
+        for info in cn_infos:
+            if not info:
+                continue
+            variables = info['variables']
+            cn_vars = None
+            for item in info['constraints']:
+                ikey = cn_key(item, variables)
+                count = counts.get(ikey, 0)
+                counts[ikey] = count + 1
+                key = (ikey, count)
+                cn = cn_table.get(key)
+                if cn is None:
+                    if cn_vars is None:
+                        cn_vars = as_vars(variables, cn_owners)
+                    cn = as_cn(item, cn_vars)
+                table[key] = cn
 
         # We keep a strong reference to the constraint owners dict,
         # since it may include instances of LayoutBox which were
@@ -571,7 +795,347 @@ class WxContainer(WxConstraintsWidget):
         # should not be deleted.
         self._cn_owners = cn_owners
 
-        return raw_cns
+        return table
+
+    def _init_layout_manager(self, offset_table, layout_table):
+        """ Create a new layout manager for the given layout tables.
+
+        Parameters
+        ----------
+        offset_table : list
+            The offset table created by a call to _build_layout_table.
+
+        layout_table : list
+            The layout table created by a call to _build_layout_table.
+
+        """
+        cn_table = self._generate_constraints(layout_table)
+        # Initializing the layout manager can fail if the objective
+        # function is unbounded. We let that failure occur so it can
+        # be logged. Nothing is stored until it succeeds.
+        manager = LayoutManager()
+        manager.initialize(cn_table.itervalues())
+        self._pending_cns = None
+        self._offset_table = offset_table
+        self._layout_table = layout_table
+        self._layout_items = self._layout_structure(layout_table)
+        self._cn_table = cn_table
+        self._layout_manager = manager
+        self._refresh = self._build_refresher(manager)
+        self.refresh_sizes()
+
+    def _update_layout(self):
+        """ Update the layout manager for a relayout of the container.
+
+        If the structure of the layout table is unchanged, only the
+        difference between the current and the new constraints is
+        applied to the existing layout manager. Otherwise, a new
+        layout manager is created from scratch.
+
+        """
+        manager = self._layout_manager
+        if manager is None:
+            self.init_layout()
+            return
+        # Any deferred replacements are applied first, so that the
+        # constraint table reflects the contents of the solver.
+        if self._pending_cns is not None:
+            old_cns, new_cns = self._merge_pending_constraints([], [])
+            manager.replace_constraints(old_cns, new_cns)
+            self._update_cn_table(old_cns, new_cns)
+        offset_table, layout_table = self._build_layout_table()
+        if self._layout_structure(layout_table) != self._layout_items:
+            self._init_layout_manager(offset_table, layout_table)
+            return
+        old_table = self._cn_table
+        new_table = self._generate_constraints(layout_table, old_table)
+        old_cns = [cn for k, cn in old_table.iteritems() if k not in new_table]
+        new_cns = [cn for k, cn in new_table.iteritems() if k not in old_table]
+        if old_cns or new_cns:
+            manager.replace_constraints(old_cns, new_cns)
+        # The geometry updaters of the new layout table are used since
+        # the child widgets may have been recreated by the toolkit.
+        self._offset_table = offset_table
+        self._layout_table = layout_table
+        self._cn_table = new_table
+        self.refresh_sizes()
+
+    def _layout_signature(self, layout_table):
+        """ Compute the signature of the constraint system for the given
+        layout table.
+
+        The signature is independent of the object ids of the session,
+        so that it is equal for every instance of a recurring view. It
+        is used as the key of the layout cache.
+
+        Parameters
+        ----------
+        layout_table : list
+            The layout table created by a call to _build_layout_table.
+
+        Returns
+        -------
+        result : tuple
+            A tuple of primitive values which describes the system.
+
+        """
+        ids = {self.object_id(): 0}
+        items = []
+        infos = [self.user_constraints()]
+        isinst = isinstance
+        WxContainer_ = WxContainer
+        for index, (offset_index, updater) in enumerate(layout_table):
+            child = updater.item
+            ids[child.object_id()] = index + 1
+            size = child.widget().GetBestSize()
+            hint = (size.GetWidth(), size.GetHeight())
+            item = (
+                offset_index, type(child).__name__, hint, child._hug,
+                child._resist,
+            )
+            if isinst(child, WxContainer_):
+                item += (child._padding, tuple(child.contents_margins()))
+            items.append(item)
+            infos.append(child.user_constraints())
+
+        # The owner ids of the user constraints are replaced by the
+        # index of the item in the layout table. Virtual owners are
+        # numbered negatively in the order of their first use.
+        virtual = {}
+        cns = []
+        for info in infos:
+            if not info:
+                cns.append(None)
+                continue
+            names = []
+            for owner, name in info['variables']:
+                idx = ids.get(owner)
+                if idx is None:
+                    idx = virtual.get(owner)
+                    if idx is None:
+                        idx = virtual[owner] = -len(virtual) - 1
+                names.append((idx, name))
+            for op, strength, weight, constant, pairs in info['constraints']:
+                terms = tuple(
+                    (names[pairs[idx]], pairs[idx + 1])
+                    for idx in xrange(0, len(pairs), 2)
+                )
+                cns.append((op, strength, weight, constant, terms))
+
+        return (
+            type(self).__name__, self._padding,
+            tuple(self.contents_margins()), self._hug, self._resist,
+            tuple(items), tuple(cns),
+        )
+
+    def _init_cached_layout(self, offset_table, layout_table):
+        """ Initialize the layout of the container from the layout cache.
+
+        A deferred verification of the layout is scheduled whether or
+        not the cache holds an entry for the container, so that the
+        solved results are stored in the cache.
+
+        Parameters
+        ----------
+        offset_table : list
+            The offset table created by a call to _build_layout_table.
+
+        layout_table : list
+            The layout table created by a call to _build_layout_table.
+
+        Returns
+        -------
+        result : bool
+            True if the layout was initialized from the cache, False
+            if a layout manager must be initialized.
+
+        """
+        cache = self.layout_cache
+        key = cache.make_key(self._layout_signature(layout_table))
+        entry = cache.load(key)
+        self._cache_entry = (key, entry)
+        DeferredCall(self._sync_layout_cache)
+        if entry is None or entry.num_items != len(layout_table):
+            return False
+        self._offset_table = offset_table
+        self._layout_table = layout_table
+        self._layout_items = self._layout_structure(layout_table)
+        min_size, best_size, max_size = entry.size_bounds
+        widget = self.widget()
+        widget.SetBestSize(wx.Size(*best_size))
+        widget.SetMinSize(wx.Size(*min_size))
+        widget.SetMaxSize(wx.Size(*max_size))
+        self._refresh = self._cached_refresh
+        return True
+
+    def _cached_refresh(self):
+        """ Apply the cached geometry of the layout items for the current
+        size of the container.
+
+        This is the refresh function of the container until the cached
+        layout is verified by a solve.
+
+        """
+        key, entry = self._cache_entry
+        size = self._widget.GetSizeTuple()
+        geometries = entry.lookup(size)
+        if geometries is not None:
+            for (_, updater), geo in zip(self._layout_table, geometries):
+                updater.apply(geo)
+
+    def _sync_layout_cache(self):
+        """ Verify the cached layout against a solve, and store the
+        solved results in the layout cache.
+
+        This is invoked in a deferred fashion after the layout of the
+        container was initialized, so a cached layout is displayed
+        before the constraint system is solved.
+
+        """
+        pair = self._cache_entry
+        if pair is None or self._widget is None or not self._owns_layout:
+            return
+        self._cache_entry = None
+        key, entry = pair
+        if self._layout_manager is None:
+            old_hint = self.widget().GetBestSize()
+            offset_table, layout_table = self._build_layout_table()
+            self._init_layout_manager(offset_table, layout_table)
+            self.refresh()
+            if self.widget().GetBestSize() != old_hint:
+                self.size_hint_updated()
+        else:
+            self.refresh()
+        geometries = []
+        for _, updater in self._layout_table:
+            geo = updater.last[0]
+            if geo is None:
+                return
+            geometries.append(geo)
+        widget = self.widget()
+        size = widget.GetSizeTuple()
+        bounds = tuple(
+            (wxsize.GetWidth(), wxsize.GetHeight()) for wxsize in (
+                widget.GetMinSize(), widget.GetBestSize(),
+                widget.GetMaxSize(),
+            )
+        )
+        if entry is None or entry.size_bounds != bounds:
+            entry = LayoutCacheEntry(len(geometries), bounds)
+        elif entry.lookup(size) == geometries:
+            return
+        cache = self.layout_cache
+        entry.record(size, geometries, cache.max_sizes)
+        cache.store(key, entry)
+
+    def _flush_pending_constraints(self):
+        """ Apply the deferred constraint replacements, if any.
+
+        This is called at the end of the event loop tick in which the
+        first replacement was deferred. The replacements may already
+        have been applied by an intervening synchronous update.
+
+        """
+        if self._pending_cns is not None and self._widget is not None:
+            self.replace_constraints([], [])
+
+    def _merge_pending_constraints(self, old_cns, new_cns):
+        """ Merge the given constraint replacement with the pending
+        deferred replacements.
+
+        The pending replacements are cleared by this method, so the
+        returned lists must be applied to the layout manager.
+
+        Parameters
+        ----------
+        old_cns : list
+            The list of casuarius constraints to remove.
+
+        new_cns : list
+            The list of casuarius constraints to add.
+
+        Returns
+        -------
+        result : (list, list)
+            The combined lists of constraints to remove and to add.
+
+        """
+        pending = self._pending_cns
+        if pending is None:
+            return old_cns, new_cns
+        self._pending_cns = None
+        self._net_constraints(pending, old_cns, new_cns)
+        removed, added = pending
+        return removed.values(), added.values()
+
+    @staticmethod
+    def _net_constraints(pending, old_cns, new_cns):
+        """ Add a constraint replacement to a pending replacement.
+
+        A constraint which is removed after it was added by a pending
+        replacement is dropped from the added constraints, since it
+        was never given to the layout manager.
+
+        Parameters
+        ----------
+        pending : tuple
+            The (removed, added) pair of ordered dicts which map the
+            id of a constraint to the constraint.
+
+        old_cns : list
+            The list of casuarius constraints to remove.
+
+        new_cns : list
+            The list of casuarius constraints to add.
+
+        """
+        removed, added = pending
+        for cn in old_cns:
+            key = id(cn)
+            if key in added:
+                del added[key]
+            else:
+                removed[key] = cn
+        for cn in new_cns:
+            added[id(cn)] = cn
+
+    def _update_cn_table(self, old_cns, new_cns):
+        """ Update the constraint table after a constraint replacement.
+
+        Parameters
+        ----------
+        old_cns : list
+            The list of casuarius constraints which were removed from
+            the layout manager.
+
+        new_cns : list
+            The list of casuarius constraints which were added to the
+            layout manager.
+
+        """
+        table = self._cn_table
+        for cn in old_cns:
+            table.pop(id(cn), None)
+        for cn in new_cns:
+            table[id(cn)] = cn
+
+    @staticmethod
+    def _layout_structure(layout_table):
+        """ Compute the structure key for the given layout table.
+
+        Parameters
+        ----------
+        layout_table : list
+            The layout table created by a call to _build_layout_table.
+
+        Returns
+        -------
+        result : tuple
+            A tuple of (offset index, item) pairs which compares equal
+            for layout tables with the same structure.
+
+        """
+        return tuple((idx, updater.item) for idx, updater in layout_table)
 
     #--------------------------------------------------------------------------
     # Auxiliary Methods
@@ -598,7 +1162,9 @@ class WxContainer(WxConstraintsWidget):
             True if the transfer was allowed, False otherwise.
 
         """
-        if not self._share_layout:
+        if not self._share_layout or self._is_layout_partition():
+            if not self._owns_layout:
+                self._reclaim_layout_ownership()
             return False
         self._owns_layout = False
         self._layout_owner = owner
@@ -606,7 +1172,10 @@ class WxContainer(WxConstraintsWidget):
         self._refresh = owner.refresh
         self._offset_table = []
         self._layout_table = []
+        self._layout_items = ()
         self._cn_owners = {}
+        self._cn_table = {}
+        self._pending_cns = None
         return True
 
     def will_transfer(self):
@@ -621,9 +1190,129 @@ class WxContainer(WxConstraintsWidget):
         """
         if self._share_layout:
             if isinstance(self.parent(), WxContainer):
-                return True
+                return not self._is_layout_partition()
         return False
 
+    def _reclaim_layout_ownership(self):
+        """ Take back the ownership of the layout of the children of
+        this container from its current layout owner.
+
+        """
+        self._owns_layout = True
+        self._layout_owner = None
+        self._size_hint_cns = []
+        offset_table, layout_table = self._build_layout_table()
+        self._init_layout_manager(offset_table, layout_table)
+
+    def _layout_top(self):
+        """ Get the container at the top of the shared layout chain of
+        this container.
+
+        Returns
+        -------
+        result : WxContainer
+            The closest ancestor which does not share its layout with
+            its parent, or this container if it does not.
+
+        """
+        top = self
+        parent = self.parent()
+        while top._share_layout and isinstance(parent, WxContainer):
+            top = parent
+            parent = top.parent()
+        return top
+
+    def _layout_partitions(self):
+        """ Compute which shared containers of the system of this
+        container are decoupled from the rest of the system.
+
+        The system is walked once, recording for every widget the chain
+        of shared containers which enclose it. A user constraint only
+        couples the containers on the chains of the widget which owns
+        it and of the widget it refers to, so the whole system is
+        checked in a single pass instead of once per container.
+
+        Returns
+        -------
+        result : dict
+            A dict mapping the object id of every shared container in
+            the system to whether it is decoupled.
+
+        """
+        chains = {self.object_id(): ()}
+        widgets = [self]
+        partitions = {}
+        queue = deque((child, ()) for child in self.children())
+        pop = queue.popleft
+        extend = queue.extend
+        isinst = isinstance
+        WxConstraintsWidget_ = WxConstraintsWidget
+        WxContainer_ = WxContainer
+        while queue:
+            item, chain = pop()
+            if not isinst(item, WxConstraintsWidget_):
+                continue
+            item_id = item.object_id()
+            if isinst(item, WxContainer_) and item._share_layout:
+                chain = chain + (item_id,)
+                partitions[item_id] = True
+                extend((child, chain) for child in item.children())
+            chains[item_id] = chain
+            widgets.append(item)
+
+        # A container is coupled if a widget inside of it refers to a
+        # widget outside of it, or if a widget outside of it refers to
+        # a widget inside of it other than the container itself.
+        for widget in widgets:
+            chain = chains[widget.object_id()]
+            variables = widget.user_constraints().get('variables', ())
+            for owner_id, _ in variables:
+                other = chains.get(owner_id)
+                if other is None:
+                    # The variables of a layout helper, such as the
+                    # spacers of an hbox, have a virtual owner which is
+                    # not a widget. They belong to the widget which
+                    # declares the helper, and so couple nothing.
+                    continue
+                for container_id in chain:
+                    if container_id not in other:
+                        partitions[container_id] = False
+                if owner_id in partitions:
+                    other = other[:-1]
+                for container_id in other:
+                    if container_id not in chain:
+                        partitions[container_id] = False
+        return partitions
+
+    def _is_layout_partition(self):
+        """ Whether the shared layout of this container is decoupled
+        from the system of its layout owner.
+
+        The layout is decoupled if the user constraints of the widgets
+        in the shared system of this container only refer to widgets
+        in that system, and if the user constraints of the rest of the
+        owner's system only refer to the outer box of this container.
+        The result is computed for the whole system of the owner at
+        once and cached until the next relayout.
+
+        Returns
+        -------
+        result : bool
+            True if the container can be laid out by a layout manager
+            of its own, False otherwise.
+
+        """
+        if not self.partition_layout:
+            return False
+        top = self._layout_top()
+        if top is self:
+            return False
+        object_id = self.object_id()
+        partitions = top._partitions
+        if partitions is None or object_id not in partitions:
+            partitions = top._partitions = top._layout_partitions()
+        return partitions.get(object_id, False)
+
     def compute_min_size(self):
         """ Calculates the minimum size of the container which would
         allow all constraints to be satisfied.
@@ -5,8 +5,10 @@
 from collections import defaultdict
 import logging
 
+from enaml.layout.layout_stats import LayoutStats, LayoutStatsLogger
 from enaml.utils import make_dispatcher
 
+from .wx_deferred_caller import TimedCall
 from .wx_widget_registry import WxWidgetRegistry
 
 
@@ -38,6 +40,8 @@ class WxSession(object):
         self._registered_objects = {}
         self._windows = []
         self._socket = None
+        self._layout_stats = LayoutStats()
+        self._layout_log = None
 
     #--------------------------------------------------------------------------
     # Public API
@@ -156,6 +160,65 @@ class WxSession(object):
         """
         return self._registered_objects.get(object_id)
 
+    def layout_stats(self):
+        """ Get a snapshot of the layout instrumentation of the session.
+
+        Returns
+        -------
+        result : dict
+            The snapshot of the layout stats of the session. See the
+            method `LayoutStats.snapshot` for the format.
+
+        """
+        containers = []
+        for obj in self._registered_objects.itervalues():
+            get_stats = getattr(obj, 'layout_stats', None)
+            if get_stats is not None:
+                stats = get_stats()
+                if stats is not None:
+                    containers.append(stats)
+        return self._layout_stats.snapshot(containers)
+
+    def record_relayout(self, widget, causes, elapsed):
+        """ Record a relayout request handled by a widget of the session.
+
+        Parameters
+        ----------
+        widget : WxConstraintsWidget
+            The widget which handled the relayout action.
+
+        causes : sequence
+            The names of the traits which caused the relayout.
+
+        elapsed : float
+            The time spent handling the relayout, in seconds.
+
+        """
+        self._layout_stats.record_relayout(widget, causes, elapsed)
+
+    def start_layout_log(self, interval=10.0):
+        """ Periodically log a summary of the layout instrumentation.
+
+        Parameters
+        ----------
+        interval : float, optional
+            The logging interval, in seconds. The default is 10.0.
+
+        """
+        self.stop_layout_log()
+        log = LayoutStatsLogger(self.layout_stats, interval, TimedCall, logger)
+        self._layout_log = log
+        log.start()
+
+    def stop_layout_log(self):
+        """ Stop logging the layout instrumentation.
+
+        """
+        log = self._layout_log
+        if log is not None:
+            log.stop()
+            self._layout_log = None
+
     #--------------------------------------------------------------------------
     # Messaging API
     #--------------------------------------------------------------------------
@@ -255,6 +318,7 @@ class WxSession(object):
         """ Handle the 'close' action sent by the Enaml session.
 
         """
+        self.stop_layout_log()
         for window in self._windows:
             window.destroy()
         self._windows = []
@@ -20,6 +20,10 @@ class MyIconProvider(IconProvider):
     """ A custom icon provider for the icon example.
 
     """
+    #: The icons are read from files, so they are the same in every
+    #: session.
+    shared = True
+
     path_map = {
         '/seek-forward': 'media-seek-forward.png',
         '/seek-backward': 'media-seek-backward.png',
@@ -24,6 +24,10 @@ class MyImageProvider(ImageProvider):
     """ A custom image provider for the image example.
 
     """
+    #: The images are read from files, so they are the same in every
+    #: session.
+    shared = True
+
     def request_image(self, path, size, callback):
         """ Request an image from this provider.
 